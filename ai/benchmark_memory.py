@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Stella Nurse - Patient Memory Benchmark
+Fills a PatientMemoryStore with synthetic notes and measures lookup latency
+(p50/p99) with and without a patient_id filter. Exits non-zero when the
+--max-p99-ms gate fails.
+
+    python3 ai/benchmark_memory.py
+    python3 ai/benchmark_memory.py --entries 100000 --quantize --max-p99-ms 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.patient_memory import PatientMemoryStore
+
+SUBJECTS = ["heart rate", "blood pressure", "temperature", "blood sugar", "sleep", "appetite",
+            "dizziness", "headache", "knee pain", "breathing", "mood", "walking"]
+EVENTS = ["was higher than usual", "improved after rest", "was reported in the morning",
+          "worsened during the night", "stayed stable all day", "was discussed with the doctor"]
+PREFERENCES = ["likes tea with honey", "prefers being called by first name", "enjoys classical music",
+               "dislikes cold rooms", "wants reminders before meals", "calls daughter on sundays"]
+MEDICINES = ["aspirin", "metformin", "vitamin d", "lisinopril", "insulin", "paracetamol"]
+
+
+def synthetic_note(rng):
+    kind = rng.choice(["note", "incident", "preference", "medication"])
+    if kind == "preference":
+        text = f"Patient {rng.choice(PREFERENCES)}"
+    elif kind == "medication":
+        text = f"{rng.choice(MEDICINES).title()} dose {rng.choice(['taken', 'missed', 'delayed'])} at {rng.randint(6, 22)}:00"
+    else:
+        text = f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(EVENTS)} on day {rng.randint(1, 180)}"
+    return kind, text
+
+
+def timed_queries(store, queries, patients, k):
+    times = []
+    for query, patient in zip(queries, patients):
+        start = time.perf_counter()
+        store.search(query, patient_id=patient, k=k)
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PatientMemoryStore lookups")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--patients", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--quantize", action="store_true", help="int8 embeddings")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if filtered p99 lookup exceeds this")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    patients = [f"patient_{i:03d}" for i in range(args.patients)]
+    store = PatientMemoryStore(path=None, dim=args.dim, quantize=args.quantize)
+
+    start = time.perf_counter()
+    batch = []
+    for _ in range(args.entries):
+        kind, text = synthetic_note(rng)
+        batch.append((rng.choice(patients), text, kind))
+        if len(batch) == 10_000:
+            store.add_many(batch)
+            batch = []
+    if batch:
+        store.add_many(batch)
+    build_s = time.perf_counter() - start
+
+    queries = [synthetic_note(rng)[1].split(" on day")[0] for _ in range(args.queries)]
+    timed_queries(store, queries[:20], [None] * 20, args.k)  # warm-up
+    unfiltered = timed_queries(store, queries, [None] * len(queries), args.k)
+    filtered = timed_queries(store, queries, [rng.choice(patients) for _ in queries], args.k)
+
+    start = time.perf_counter()
+    store.add(patients[0], "Reported mild chest tightness after climbing stairs", "incident")
+    insert_ms = (time.perf_counter() - start) * 1000.0
+
+    results = {
+        "entries": len(store),
+        "dim": args.dim,
+        "quantized": args.quantize,
+        "index_mb": store.stats()["index_bytes"] / 1e6,
+        "build_s": build_s,
+        "insert_ms": insert_ms,
+        "p50_ms": float(np.percentile(unfiltered, 50)),
+        "p99_ms": float(np.percentile(unfiltered, 99)),
+        "filtered_p50_ms": float(np.percentile(filtered, 50)),
+        "filtered_p99_ms": float(np.percentile(filtered, 99)),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("🧠 Patient memory benchmark")
+        print("=" * 50)
+        print(f"Entries:            {results['entries']} ({args.patients} patients, dim {args.dim}"
+              f"{', int8' if args.quantize else ''})")
+        print(f"Index size:         {results['index_mb']:.1f} MB")
+        print(f"Build time:         {results['build_s']:.1f} s")
+        print(f"Single insert:      {results['insert_ms']:.3f} ms")
+        print(f"Lookup p50/p99:     {results['p50_ms']:.3f} / {results['p99_ms']:.3f} ms")
+        print(f"Filtered p50/p99:   {results['filtered_p50_ms']:.3f} / {results['filtered_p99_ms']:.3f} ms")
+
+    if args.max_p99_ms is not None and results["filtered_p99_ms"] > args.max_p99_ms:
+        print(f"❌ p99 {results['filtered_p99_ms']:.3f} ms above gate {args.max_p99_ms}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
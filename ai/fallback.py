@@ -0,0 +1,55 @@
+import logging
+import re
+import time
+
+try:
+    from ai.intent_router import EMERGENCY, TEMPLATES, urgency
+    from ai.tools import trigger_emergency_alert
+except ImportError:
+    from intent_router import EMERGENCY, TEMPLATES, urgency
+    from tools import trigger_emergency_alert
+
+logger = logging.getLogger(__name__)
+
+# (pattern, reply) checked in order; the last reply is the default
+RESPONSES = [
+    (re.compile(r"\b(hi|hello|hey|good (morning|afternoon|evening))\b"),
+     "Hello! I'm just waking up. Give me a few seconds and I'll be right with you."),
+    (re.compile(r"\b(thanks?|thank you)\b"),
+     "You're very welcome."),
+    (re.compile(r"\bhow are you\b"),
+     "I'm doing well, thank you. I'm almost ready to chat."),
+    (re.compile(r"\bwhat time is it\b|\bwhat'?s the time\b"),
+     None),  # Filled in by respond()
+]
+DEFAULT_REPLY = ("I'm still starting up, so please ask me again in a moment. "
+                 "If you're hurt or unwell, tell me and I'll alert your care team.")
+
+
+class FallbackResponder:
+    """
+    Local answers while the LLM agent is still loading.
+
+    Handles a few pleasantries from patterns and otherwise asks the patient
+    to repeat the request shortly. Clear emergencies and routine requests
+    never get here (the IntentRouter answers those without the agent), but
+    calls for help, falls and symptom reports the router leaves to the agent
+    do: with no agent to judge them yet, they raise an alert right away.
+    """
+    def __init__(self):
+        self.answered = 0
+        self.alerts = 0
+
+    def respond(self, text: str) -> str:
+        self.answered += 1
+        level = urgency(text)
+        if level:
+            self.alerts += 1
+            trigger_emergency_alert.invoke({"reason": f"{text} (assistant still starting up)", "level": level})
+            return TEMPLATES[EMERGENCY]
+        lowered = text.lower()
+        for pattern, reply in RESPONSES:
+            if pattern.search(lowered):
+                return reply or time.strftime("It's %I:%M %p.").replace(" 0", " ")
+        logger.info(f"Agent not ready, deferring: {text}")
+        return DEFAULT_REPLY
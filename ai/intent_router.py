@@ -0,0 +1,244 @@
+import logging
+import re
+import time
+from typing import Optional
+
+import numpy as np
+
+try:
+    from ai.embeddings import HashingEmbedder, tokenize
+    from ai.tools import check_vitals, get_medicine_schedule, trigger_emergency_alert
+except ImportError:
+    from embeddings import HashingEmbedder, tokenize
+    from tools import check_vitals, get_medicine_schedule, trigger_emergency_alert
+
+logger = logging.getLogger(__name__)
+
+EMERGENCY = "emergency"
+VITALS = "vitals"
+MEDICINE = "medicine"
+
+# High-precision patterns, checked before the similarity model
+RULES = {
+    EMERGENCY: re.compile(
+        r"\b(chest pain|pain in my chest|chest (is )?(tight|hurts)|can'?t breathe|cannot breathe|(hard|difficult|trouble) breathing|"
+        r"short(ness)? of breath|i (have )?(fell|fallen) (down|over|off (the|my) \w+|out of (the |my )?(bed|chair)|"
+        r"on the (floor|ground|stairs))|i'?ve had a fall|i'?m bleeding|(having|had) a heart attack|"
+        r"(i'?m|i am|i think i'?m|i might be) having a stroke|call (an )?ambulance|call 911|"
+        r"(this|it) is an emergency|it'?s an emergency|medical emergency)\b"
+    ),
+    # A request for the current reading: "what's my pulse", "check my vitals", "do I have a fever"
+    VITALS: re.compile(
+        r"\b(what'?s|what is|what are|how'?s|how is|how are|check|measure|read|take|tell me|show me|give me)"
+        r"(\W+\w+){0,2}\W+(heart ?rate|pulse|bpm|vitals|vital signs|temperature)\b|"
+        r"\b(do i have|have i got|am i running) (a )?(fever|temperature)\b"
+    ),
+    MEDICINE: re.compile(
+        r"\b(medicines?|medications?|meds|pills?|tablets?|dose)\b.*\b(next|when|what time|today|schedule|"
+        r"take|due|missed)\b|\b(next|when|what time|schedule)\b.*\b(medicines?|medications?|meds|pills?|tablets?|dose)\b"
+    ),
+}
+
+# Broader than the EMERGENCY rule: turns that mention distress or a symptom
+# (negated or not) are never answered from a cache, the agent must see them;
+# while the agent is loading, they raise an alert instead (see urgency())
+DISTRESS = re.compile(
+    r"\b(emergency|help|ambulance|911|(fell|fallen|fall|falling)(?! (asleep|in love|for|behind|apart))|"
+    r"slipped|tripped|collapsed?|can'?t get up|faint(ed|ing)?|passed out|black(ed)? out|bleeding|"
+    r"heart attack|stroke(?! of)|chest|breath(e|ing)?)\b"
+)
+SYMPTOMS = re.compile(
+    r"\b(pain|painful|hurts?|hurting|aches?|aching|sore|dizzy|dizziness|light-?headed|nause(a|ous)|"
+    r"vomit(ing|ed)?|throwing up|sick|unwell|ill|fever|feverish|chills|cough(ing)?|headache|migraine|"
+    r"numb(ness)?|tingling|swollen|swelling|rash|itchy|weak(ness)?|confused|blurry|palpitations?|"
+    r"(feel|feeling) (bad|awful|terrible|funny|strange|weird|off|worse))\b"
+)
+
+
+def mentions_symptoms(text: str) -> bool:
+    """True for emergency-, distress- or symptom-like speech, negated or not"""
+    lowered = text.lower()
+    return any(p.search(lowered) for p in (RULES[EMERGENCY], DISTRESS, SYMPTOMS))
+
+
+# Questions about earlier readings or what a reading means ("what was my pulse
+# yesterday", "my heart rate was high, should I worry?") need the agent, not
+# today's numbers
+NOT_CURRENT_READING = re.compile(
+    r"\b(was|were|been|had|yesterday|last (night|week|time)|earlier|this morning|ago|before|"
+    r"should i|worr(y|ied|ying)|normal|okay|ok|too|high|low|why|mean)\b"
+)
+
+# "I don't have chest pain anymore", "no chest pain, it's gone": negation in
+# the same clause, shortly before or after the matched phrase
+CLAUSE_BREAK = re.compile(r"[.,;!?]|\b(but|and then|although|though)\b")
+NEGATION_BEFORE = re.compile(
+    r"\b(no|not|never|without|nor|don'?t|doesn'?t|didn'?t|isn'?t|wasn'?t|ain'?t|no longer)\b(\W+\w+){0,3}\W*$"
+)
+NEGATION_AFTER = re.compile(r"^\W*(\w+\W+){0,3}(anymore|any more|(is|has) gone|went away|(has )?passed|stopped)\b")
+
+
+def _negated(text: str, match: re.Match) -> bool:
+    before = CLAUSE_BREAK.split(text[:match.start()])[-1]
+    after = CLAUSE_BREAK.split(text[match.end():])[0]
+    return bool(NEGATION_BEFORE.search(before) or NEGATION_AFTER.search(after))
+
+
+def is_emergency(text: str) -> bool:
+    """True when the utterance matches an emergency rule that isn't negated"""
+    lowered = text.lower()
+    return any(not _negated(lowered, m) for m in RULES[EMERGENCY].finditer(lowered))
+
+
+def urgency(text: str) -> Optional[str]:
+    """
+    Alert level for an utterance from the rules alone (negation-aware):
+    "high" for emergencies, calls for help and falls, "medium" for other
+    symptom reports, None otherwise. For when the agent can't judge it.
+    """
+    lowered = text.lower()
+    for level, pattern in (("high", RULES[EMERGENCY]), ("high", DISTRESS), ("medium", SYMPTOMS)):
+        if any(not _negated(lowered, m) for m in pattern.finditer(lowered)):
+            return level
+    return None
+
+
+# Example phrasings for the similarity model (matched on content words).
+# EMERGENCY examples only keep emergency-like speech away from the routine intents.
+EXEMPLARS = {
+    EMERGENCY: [
+        "my chest hurts badly", "i can't breathe", "i fell and can't get up", "help me please it hurts",
+        "i'm having a heart attack", "i feel like i'm going to faint", "severe pain in my chest",
+    ],
+    VITALS: [
+        "what's my heart rate", "how is my pulse", "check my vitals", "what's my temperature",
+        "am i running a fever", "how are my vital signs", "measure my heart rate",
+    ],
+    MEDICINE: [
+        "when is my next medicine", "what medicine do i take now", "did i take my pills",
+        "what's my medication schedule", "which tablets are due",
+    ],
+}
+
+TEMPLATES = {
+    EMERGENCY: "I've alerted your care team right away. Please stay where you are and keep calm, help is on the way.",
+    VITALS: "Your heart rate is {hr} beats per minute and your temperature is {temp} degrees.",
+    VITALS + "_raw": "Here are your latest vitals: {raw}.",
+    VITALS + "_error": "I couldn't read your vital signs just now. Let me try again in a moment.",
+    MEDICINE: "Your next medicine is {name} at {time}.",
+    MEDICINE + "_done": "You've taken all of today's medicines. Well done!",
+}
+
+VITALS_PATTERN = re.compile(r"Heart Rate:\s*([\d.]+).*?Temperature:\s*([\d.]+)", re.S)
+SCHEDULE_LINE = re.compile(r"-\s*([\d:]+\s*[AP]M):\s*(.+?)\s*-\s*(Taken|Pending)", re.I)
+
+
+class IntentRouter:
+    """
+    Answers routine requests locally, before the LLM agent.
+
+    Regex rules catch unambiguous phrasings; everything else is embedded and
+    compared with a few example phrasings per intent in one matrix product.
+    Matched intents call the tool directly and fill a response template.
+    Emergencies route only on an explicit rule match that isn't negated;
+    utterances that merely resemble an emergency go to the agent, which can
+    still raise the alert. Routine intents route only for short utterances,
+    so compound questions still reach the agent, and vitals only for the
+    current reading (past readings and "should I worry?" go to the agent).
+    """
+    def __init__(self, threshold: float = 0.55, max_words: int = 12, embedder=None):
+        """
+        Args:
+            threshold: Minimum cosine similarity to an example phrasing
+            max_words: Longest utterance routed for non-emergency intents
+            embedder: Object with embed()/embed_many() (default HashingEmbedder)
+        """
+        self.threshold = threshold
+        self.max_words = max_words
+        self.embedder = embedder or HashingEmbedder()
+
+        self._labels = []
+        texts = []
+        for intent, examples in EXEMPLARS.items():
+            self._labels += [intent] * len(examples)
+            texts += examples
+        self._matrix = self.embedder.embed_many(texts)
+        self.stats = {"routed": 0, "passed": 0}
+
+    def classify(self, text: str) -> tuple[Optional[str], float]:
+        """(intent or None, confidence) for an utterance"""
+        lowered = text.lower()
+        if RULES[EMERGENCY].search(lowered):
+            # A negated emergency phrase ("no chest pain anymore") is left to the agent
+            return (EMERGENCY, 1.0) if is_emergency(lowered) else (None, 0.0)
+        for intent in (VITALS, MEDICINE):
+            if RULES[intent].search(lowered) and self._routable(intent, lowered):
+                return intent, 1.0
+
+        intent, score = self._closest(text)
+        if score < self.threshold:
+            return None, score
+        # Never raise an alert on similarity alone: the agent decides (and can still alert)
+        if intent == EMERGENCY or not self._routable(intent, lowered):
+            return None, score
+        return intent, score
+
+    def _closest(self, text: str) -> tuple[Optional[str], float]:
+        """Intent of the most similar example phrasing and its similarity"""
+        if not tokenize(text):
+            return None, 0.0
+        scores = self._matrix @ self.embedder.embed(text)
+        best = int(np.argmax(scores))
+        return self._labels[best], float(scores[best])
+
+    def needs_agent(self, text: str) -> bool:
+        """
+        True for turns no cache may answer: distress or symptom mentions, and
+        anything closest to an emergency example phrasing (which classify()
+        leaves to the agent)
+        """
+        if mentions_symptoms(text):
+            return True
+        intent, score = self._closest(text)
+        return intent == EMERGENCY and score >= self.threshold
+
+    def _routable(self, intent: str, lowered: str) -> bool:
+        if len(lowered.split()) > self.max_words:
+            return False
+        return intent != VITALS or not NOT_CURRENT_READING.search(lowered)
+
+    async def route(self, text: str) -> Optional[tuple[str, str]]:
+        """Handle the utterance locally if possible; returns (intent, reply) or None"""
+        start = time.perf_counter()
+        intent, score = self.classify(text)
+        if intent is None:
+            self.stats["passed"] += 1
+            return None
+
+        if intent == EMERGENCY:
+            trigger_emergency_alert.invoke({"reason": text, "level": "high"})
+            reply = TEMPLATES[EMERGENCY]
+        elif intent == VITALS:
+            reply = self._vitals_reply(await check_vitals.ainvoke({}))
+        else:
+            reply = self._medicine_reply(get_medicine_schedule.invoke({}))
+
+        self.stats["routed"] += 1
+        logger.info(f"Routed '{text}' -> {intent} ({score:.2f}) in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return intent, reply
+
+    @staticmethod
+    def _vitals_reply(raw: str) -> str:
+        if raw.startswith("Error"):
+            return TEMPLATES[VITALS + "_error"]
+        m = VITALS_PATTERN.search(raw)
+        if not m:
+            return TEMPLATES[VITALS + "_raw"].format(raw=raw.strip())
+        return TEMPLATES[VITALS].format(hr=m.group(1), temp=m.group(2))
+
+    @staticmethod
+    def _medicine_reply(schedule: str) -> str:
+        for time_str, name, status in SCHEDULE_LINE.findall(schedule):
+            if status.lower() == "pending":
+                return TEMPLATES[MEDICINE].format(name=name, time=time_str)
+        return TEMPLATES[MEDICINE + "_done"]
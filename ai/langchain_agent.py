@@ -1,24 +1,33 @@
+import asyncio
 import os
 import logging
-from typing import AsyncGenerator
-from langchain_google_genai import ChatGoogleGenerativeAI
+import time
+from typing import AsyncGenerator, Optional
 from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-try:
-    from langchain.agents import AgentExecutor, create_tool_calling_agent
-except ImportError:
-    from langchain.agents.agent import AgentExecutor
-    from langchain.agents import create_tool_calling_agent
-from langchain_core.runnables import RunnableConfig
+# langchain (agents) and the model integrations are imported in _build(), off the startup path
 
 # Import tools
 try:
     from ai.tools import check_vitals, get_medicine_schedule, recall_patient_memory, trigger_emergency_alert
+    from ai.tools import TOOL_SOURCES, data_versions
+    from ai.memory import ConversationMemory
+    from ai.intent_router import IntentRouter
+    from ai.response_cache import ResponseCache
+    from ai.tool_runner import ToolRunner
+    from ai.fallback import FallbackResponder
+    from ai.model_backends import BackendPolicy, ModelBackend, default_backends
 except ImportError:
     # Handle case where run from subfolder
     import sys
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from ai.tools import check_vitals, get_medicine_schedule, recall_patient_memory, trigger_emergency_alert
+    from ai.tools import TOOL_SOURCES, data_versions
+    from ai.memory import ConversationMemory
+    from ai.intent_router import IntentRouter
+    from ai.response_cache import ResponseCache
+    from ai.tool_runner import ToolRunner
+    from ai.fallback import FallbackResponder
+    from ai.model_backends import BackendPolicy, ModelBackend, default_backends
 
 logger = logging.getLogger(__name__)
 
@@ -32,26 +41,71 @@ CORE RULES:
 4. **Tools**: Use the provided tools to check vitals, memories, or schedules when relevant. check_vitals is useful when the user complains of feeling unwell.
 """
 
+SUMMARY_PROMPT = """You maintain the running memory of a nurse robot's conversation with its patient.
+Merge the current summary and the new conversation into one short summary (at most 120 words).
+Keep symptoms, vitals, medication events, requests, emotional state and anything promised to the patient. Drop small talk."""
+
+APOLOGY = "I apologize, I am having trouble processing that right now."
+
 class NurseAgent:
-    def __init__(self, model_name: str = "gemini-1.5-flash"):
+    def __init__(
+        self,
+        model_name: str = "gemini-1.5-flash",
+        memory: Optional[ConversationMemory] = None,
+        router: Optional[IntentRouter] = None,
+        cache: Optional[ResponseCache] = None,
+        tool_runner: Optional[ToolRunner] = None,
+        fallback: Optional[FallbackResponder] = None,
+        backends: Optional[list[ModelBackend]] = None,
+        policy: Optional[BackendPolicy] = None,
+    ):
         self.model_name = model_name
+        # Chat models the agent can run on (remote Gemini, local Ollama by default)
+        self.backends = backends if backends is not None else default_backends(model_name)
+        # Picks the backend per turn and demotes slow/failing ones
+        self.policy = policy or BackendPolicy()
+        self.executors = {}
         self.agent_executor = None
+        self.llm = None
+        # Conversation history used when process_stream gets none explicitly
+        self.memory = memory
+        # Answers routine requests / emergencies locally, before the LLM
+        self.router = router
+        # Semantic cache of full answers, checked before the LLM
+        self.cache = cache
+        # Runs each step's tool calls concurrently, sync tools in a bounded pool, with timeouts
+        self.tool_runner = tool_runner or ToolRunner()
+        # Answers turns that arrive while the agent loads in the background
+        self.fallback = fallback or FallbackResponder()
+        self.ready = asyncio.Event()
+        self.init_timings = {}
+        self._init_task = None
+        self.last_turn_metrics = None
         logger.info(f"Nurse AI agent initialized with model {model_name}")
 
     async def initialize(self):
-        """Initialize LangChain agent with tools and LLM"""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            logger.warning("GOOGLE_API_KEY not found. Agent capabilities will be limited.")
-        
-        # specific for Gemini which handles tool calling well
-        llm = ChatGoogleGenerativeAI(
-            model=self.model_name, 
-            temperature=0, 
-            convert_system_message_to_human=True
-        )
-        
-        tools = [check_vitals, get_medicine_schedule, recall_patient_memory, trigger_emergency_alert]
+        """Initialize LangChain agent with tools and LLM (imports run in a worker thread)"""
+        if self.ready.is_set():
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._build)
+        if self.memory and self.memory.summarizer is None:
+            self.memory.summarizer = self._summarize_history
+        self.ready.set()
+        logger.info("LangChain agent executor created "
+                    f"({', '.join(f'{k} {v * 1000.0:.0f} ms' for k, v in self.init_timings.items())}).")
+
+    def _build(self):
+        """Import the LangChain stack and create an LLM client and executor per backend"""
+        start = time.perf_counter()
+        from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+        try:
+            from langchain.agents import AgentExecutor, create_tool_calling_agent
+        except ImportError:
+            from langchain.agents.agent import AgentExecutor
+            from langchain.agents import create_tool_calling_agent
+        self.init_timings["imports"] = time.perf_counter() - start
+
+        tools = self.tool_runner.wrap([check_vitals, get_medicine_schedule, recall_patient_memory, trigger_emergency_alert])
         
         # Bind tools to LLM
         prompt = ChatPromptTemplate.from_messages([
@@ -60,52 +114,241 @@ class NurseAgent:
             ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad"),
         ])
-        
-        agent = create_tool_calling_agent(llm, tools, prompt)
-        
-        self.agent_executor = AgentExecutor(
-            agent=agent, 
-            tools=tools, 
-            verbose=True,
-            return_intermediate_steps=False
-        )
-        logger.info("LangChain agent executor created.")
-
-    async def process_stream(self, user_input: str, chat_history: list[BaseMessage] = []) -> AsyncGenerator[str, None]:
+
+        for backend in self.backends:
+            start = time.perf_counter()
+            try:
+                llm = backend.create()
+                agent = create_tool_calling_agent(llm, tools, prompt)
+            except Exception as e:
+                logger.warning(f"Model backend {backend.name} unavailable: {e}")
+                continue
+            if not backend.available():
+                logger.warning(f"Model backend {backend.name} is not configured; it will be tried last.")
+            if self.llm is None:
+                self.llm = llm  # Also writes the conversation summaries
+            self.executors[backend.name] = AgentExecutor(
+                agent=agent, 
+                tools=tools, 
+                verbose=True,
+                return_intermediate_steps=False
+            )
+            self.init_timings[backend.name] = time.perf_counter() - start
+
+        if not self.executors:
+            raise RuntimeError("No model backend could be created")
+        self.agent_executor = next(iter(self.executors.values()))
+
+    def start_background_init(self) -> asyncio.Task:
+        """Load the agent without blocking startup; `ready` is set when done"""
+        if self._init_task is None:
+            self._init_task = asyncio.ensure_future(self.initialize())
+        return self._init_task
+
+    @property
+    def loading(self) -> bool:
+        return self._init_task is not None and not self._init_task.done()
+
+    def stats(self) -> dict:
+        """Last turn's latency plus router, response-cache and per-tool counters"""
+        return {
+            "last_turn": self.last_turn_metrics,
+            "router": dict(self.router.stats) if self.router else None,
+            "cache": self.cache.stats() if self.cache else None,
+            "tools": self.tool_runner.stats(),
+            "ready": self.ready.is_set(),
+            "init": self.init_timings,
+            "fallback_answers": self.fallback.answered,
+            "fallback_alerts": self.fallback.alerts,
+            "backends": {"latency_ms": dict(self.policy.latency_ms), **self.policy.stats},
+        }
+
+    @staticmethod
+    def _answer_text(chunk) -> str:
+        """Spoken text of a streamed model chunk ("" for tool-call chunks)"""
+        if getattr(chunk, "tool_call_chunks", None):
+            return ""
+        content = chunk.content
+        if isinstance(content, list):
+            # Multi-part content (e.g. Gemini): keep the text parts only
+            return "".join(
+                part if isinstance(part, str) else part.get("text", "")
+                for part in content
+                if isinstance(part, str) or part.get("type") == "text"
+            )
+        return content or ""
+
+    async def _summarize_history(self, summary: str, turns: list) -> str:
+        """Fold old turns into the rolling conversation summary (runs off the hot path)"""
+        transcript = "\n".join(f"Patient: {user}\nStella: {answer}" for user, answer in turns)
+        result = await self.llm.ainvoke([
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(content=f"Current summary:\n{summary or '(none)'}\n\nNew conversation:\n{transcript}"),
+        ])
+        return self._answer_text(result)
+
+    async def _events(self, backend: ModelBackend, inputs: dict):
+        """astream_events of one backend; TimeoutError if the model produces nothing within backend.timeout"""
+        stream = self.executors[backend.name].astream_events(inputs, version="v2")
+        deadline = time.perf_counter() + backend.timeout
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(stream.__anext__(), max(deadline - time.perf_counter(), 0.0))
+                except StopAsyncIteration:
+                    return
+                yield event
+                if event["event"] in ("on_chat_model_stream", "on_tool_start"):
+                    break
+            async for event in stream:
+                yield event
+        finally:
+            await stream.aclose()
+
+    async def process_stream(self, user_input: str, chat_history: Optional[list[BaseMessage]] = None) -> AsyncGenerator[str, None]:
         """
-        Process user input and yield chunks of text for TTS.
-        This allows for lower latency responses.
+        Process user input and yield answer tokens for TTS as the model
+        produces them.
+
+        Without an explicit chat_history the agent's ConversationMemory (if
+        any) supplies it, and the finished turn is recorded there.
+
+        Runs the agent once through astream_events: the AgentExecutor runs
+        the tool calls of each model step concurrently (see ToolRunner),
+        model chunks that carry tool calls are skipped, and text chunks are
+        yielded immediately. Time to first token, total latency and the
+        model backend used end up in self.last_turn_metrics.
+
+        The BackendPolicy orders the model backends for the turn; when one
+        fails or produces nothing within its timeout (and no text or tool
+        call has happened yet), the next backend answers instead.
+
+        Requests the IntentRouter recognizes are answered from a template
+        without touching the LLM (or waiting for it to initialize); after
+        that, the ResponseCache may answer from an earlier turn. While
+        start_background_init() is still loading the agent, the
+        FallbackResponder answers.
         """
-        if not self.agent_executor:
+        use_memory = chat_history is None and self.memory is not None
+
+        if self.router:
+            start = time.perf_counter()
+            routed = await self.router.route(user_input)
+            if routed:
+                intent, reply = routed
+                total_ms = (time.perf_counter() - start) * 1000.0
+                self.last_turn_metrics = {"ttft_ms": total_ms, "total_ms": total_ms, "chunks": 1,
+                                          "tool_calls": 1, "intent": intent}
+                if use_memory:
+                    self.memory.add_turn(user_input, reply)
+                yield reply
+                return
+
+        if self.cache:
+            start = time.perf_counter()
+            cached = self.cache.lookup(user_input, data_versions())
+            if cached:
+                total_ms = (time.perf_counter() - start) * 1000.0
+                self.last_turn_metrics = {"ttft_ms": total_ms, "total_ms": total_ms, "chunks": 1,
+                                          "tool_calls": 0, "cached": True}
+                logger.info(f"Cache hit for '{user_input}' ({self.cache.stats()['hit_rate'] * 100:.0f}% hit rate)")
+                if use_memory:
+                    self.memory.add_turn(user_input, cached)
+                yield cached
+                return
+
+        if not self.ready.is_set():
+            if self.loading:
+                # Still loading in the background: answer locally instead of waiting
+                reply = self.fallback.respond(user_input)
+                self.last_turn_metrics = {"ttft_ms": 0.0, "total_ms": 0.0, "chunks": 1,
+                                          "tool_calls": 0, "fallback": True}
+                yield reply
+                return
             await self.initialize()
-            
+
         logger.info(f"Processing input: {user_input}")
-        
-        # Streaming response from the agent
-        # Note: AgentExecutor streaming is a bit complex, strictly getting token-by-token from the final answer 
-        # requires parsing the stream events. For simplicity in this demo, we might await the final response 
-        # or implement a custom stream handler. 
-        # Here we use .astream_events or .astream if supported, but standard AgentExecutor 
-        # is often better handled by awaiting result for tools, then streaming final answer.
-        # Alternatively, we can just yield the final string for now if tool use is involved.
-        
+
+        if chat_history is None:
+            chat_history = self.memory.messages() if self.memory else []
+        inputs = {"input": user_input, "chat_history": chat_history}
+        order = [b for b in self.policy.order(user_input, self.backends) if b.name in self.executors]
+        answer = []
+
+        start = time.perf_counter()
+        first_token = None
+        chunks = 0
+        tool_calls = 0
+        tools_used = set()
+        final_output = None
+        completed = False
+        backend = None
         try:
-             # Using invoke for reliability with tools, then we can simulate streaming or just return
-             # True streaming with tools requires iterating over the iterator
-             async for event in self.agent_executor.astream(
-                {"input": user_input, "chat_history": chat_history}
-            ):
-                # We are looking for the 'output' key in the final chunk or intermediate tokens
-                if "output" in event:
-                    # yield event["output"] # This is usually the final result in default executor
-                    pass
-            
-             # Fallback to standard invoke to ensure tools run correctly, then yield result
-             # Ideally we hook into the LLM stream.
-             result = await self.agent_executor.ainvoke({"input": user_input, "chat_history": chat_history})
-             yield result["output"]
+            for attempt, backend in enumerate(order):
+                attempt_start = time.perf_counter()
+                responded = False
+                try:
+                    async for event in self._events(backend, inputs):
+                        kind = event["event"]
+                        if not responded and kind in ("on_chat_model_stream", "on_tool_start"):
+                            responded = True
+                            self.policy.record(backend, (time.perf_counter() - attempt_start) * 1000.0)
+                        if kind == "on_chat_model_stream":
+                            text = self._answer_text(event["data"]["chunk"])
+                            if not text:
+                                continue
+                            if first_token is None:
+                                first_token = time.perf_counter() - start
+                            chunks += 1
+                            answer.append(text)
+                            yield text
+                        elif kind == "on_tool_start":
+                            tool_calls += 1
+                            tools_used.add(event["name"])
+                            logger.info(f"Tool call: {event['name']}")
+                        elif kind == "on_chain_end" and not event.get("parent_ids"):
+                            # Top-level executor finished
+                            output = event["data"].get("output")
+                            if isinstance(output, dict):
+                                final_output = output.get("output")
+                except Exception as e:
+                    self.policy.record_failure(backend)
+                    # Only retry while nothing was said or done on the patient's behalf
+                    if chunks or tool_calls or attempt == len(order) - 1:
+                        raise
+                    logger.warning(f"Model backend {backend.name} failed ({e!r}), falling back to {order[attempt + 1].name}")
+                    continue
+                break
+
+            # Model didn't stream (or the executor stopped early): speak the final output
+            if chunks == 0 and final_output:
+                first_token = time.perf_counter() - start
+                chunks = 1
+                answer.append(final_output)
+                yield final_output
+            completed = True
 
         except Exception as e:
             logger.error(f"Error in agent processing: {e}")
-            yield "I apologize, I am having trouble processing that right now."
+            if chunks == 0:
+                yield APOLOGY
 
+        finally:
+            # Also records answers cut short by an interruption
+            if use_memory and answer:
+                self.memory.add_turn(user_input, "".join(answer).strip())
+            total = time.perf_counter() - start
+            if self.cache and completed and answer and "trigger_emergency_alert" not in tools_used:
+                versions = data_versions()
+                deps = {TOOL_SOURCES[t]: versions[TOOL_SOURCES[t]] for t in tools_used if t in TOOL_SOURCES}
+                self.cache.store(user_input, "".join(answer).strip(), deps, total * 1000.0)
+            self.last_turn_metrics = {
+                "ttft_ms": first_token * 1000.0 if first_token is not None else None,
+                "total_ms": total * 1000.0,
+                "chunks": chunks,
+                "tool_calls": tool_calls,
+                "backend": backend.name if backend else None,
+            }
+            ttft = f"{first_token * 1000.0:.0f} ms" if first_token is not None else "n/a"
+            logger.info(f"Turn latency: first token {ttft}, total {total * 1000.0:.0f} ms "
+                        f"({chunks} chunks, {tool_calls} tool calls, {backend.name if backend else 'no'} backend)")
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "conversation_memory.json")
+
+# summarizer(previous_summary, [(user, assistant), ...]) -> new summary
+Summarizer = Callable[[str, list], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting"""
+    return len(text) // 4 + 1
+
+
+class ConversationMemory:
+    """
+    Bounded chat history for NurseAgent.
+
+    The newest turns are kept verbatim. Once the history exceeds
+    max_tokens, the older turns are folded into a rolling summary by a
+    background task, so the prompt stays roughly the same size over a long
+    shift. Everything is persisted to a JSON file after each change.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_PATH,
+        max_tokens: int = 1200,
+        keep_turns: int = 4,
+        summary_tokens: int = 250,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        """
+        Args:
+            path: JSON file to persist to (None keeps memory in RAM only)
+            max_tokens: Budget for summary + verbatim turns in the prompt
+            keep_turns: Most recent turns that are never summarized
+            summary_tokens: Target length of the rolling summary
+            summarizer: Async function producing the new summary; without
+                        one, older turns are compacted into a truncated digest
+        """
+        self.path = path
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+
+        self.summary = ""
+        self.turns: list[tuple[str, str]] = []
+        self._summary_task: Optional[asyncio.Task] = None
+        self.load()
+
+    # ================= PERSISTENCE ================= #
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.summary = data.get("summary", "")
+            self.turns = [tuple(t) for t in data.get("turns", [])]
+            logger.info(f"Loaded conversation memory: {len(self.turns)} turns")
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load conversation memory from {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"summary": self.summary, "turns": self.turns, "saved_at": time.time()}, f)
+            os.replace(tmp, self.path)  # Atomic: a crash never leaves half a file
+        except OSError as e:
+            logger.error(f"Could not save conversation memory to {self.path}: {e}")
+
+    def clear(self):
+        self.summary = ""
+        self.turns = []
+        self.save()
+
+    # ================= PROMPT ================= #
+
+    def _turn_tokens(self, turn: tuple[str, str]) -> int:
+        return estimate_tokens(turn[0]) + estimate_tokens(turn[1])
+
+    def token_count(self) -> int:
+        """Estimated prompt tokens of the full stored history"""
+        return estimate_tokens(self.summary) + sum(self._turn_tokens(t) for t in self.turns)
+
+    def messages(self) -> list[BaseMessage]:
+        """
+        History for the prompt: summary first, then verbatim turns. Turns
+        that don't fit the budget (summary still pending) are left out.
+        """
+        budget = self.max_tokens - estimate_tokens(self.summary)
+        recent = []
+        for turn in reversed(self.turns):
+            budget -= self._turn_tokens(turn)
+            if budget < 0 and recent:
+                break
+            recent.append(turn)
+
+        messages: list[BaseMessage] = []
+        if self.summary:
+            messages.append(SystemMessage(content=f"Summary of the earlier conversation: {self.summary}"))
+        for user, assistant in reversed(recent):
+            messages.append(HumanMessage(content=user))
+            messages.append(AIMessage(content=assistant))
+        return messages
+
+    # ================= UPDATES ================= #
+
+    def add_turn(self, user: str, assistant: str):
+        """Record a finished turn; summarizes in the background when over budget"""
+        self.turns.append((user, assistant))
+        self.save()
+        if self.token_count() > self.max_tokens and len(self.turns) > self.keep_turns:
+            self._schedule_summary()
+
+    def _schedule_summary(self):
+        if self._summary_task and not self._summary_task.done():
+            return  # One fold at a time; the next turn re-checks the budget
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (e.g. used from a script): fold synchronously
+            self._fold(len(self.turns) - self.keep_turns, self._digest(self.summary, self.turns[:-self.keep_turns]))
+            return
+        self._summary_task = loop.create_task(self._summarize())
+
+    async def _summarize(self):
+        count = len(self.turns) - self.keep_turns
+        old = self.turns[:count]
+        start = time.perf_counter()
+        try:
+            if self.summarizer:
+                summary = await self.summarizer(self.summary, old)
+            else:
+                summary = self._digest(self.summary, old)
+        except Exception as e:
+            logger.error(f"Summarization failed, using digest: {e}")
+            summary = self._digest(self.summary, old)
+        # Only appends happened meanwhile, so the folded turns are still first
+        self._fold(count, summary)
+        logger.info(f"Folded {count} turns into summary in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def _fold(self, count: int, summary: str):
+        self.summary = summary.strip()
+        self.turns = self.turns[count:]
+        self.save()
+
+    def _digest(self, summary: str, turns: list) -> str:
+        """Summarizer-free fallback: newest facts win, oldest text is dropped"""
+        lines = [summary] if summary else []
+        lines += [f"Patient: {u} / Stella: {a}" for u, a in turns]
+        text = " ".join(lines)
+        limit = self.summary_tokens * 4
+        return text[-limit:] if len(text) > limit else text
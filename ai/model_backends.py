@@ -0,0 +1,177 @@
+import abc
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LOCAL = "local"
+REMOTE = "remote"
+
+
+class ModelBackend(abc.ABC):
+    """
+    One chat model the agent can run on.
+
+    create() imports the integration and returns a LangChain chat model;
+    imports happen there so unused backends cost nothing at startup.
+    `timeout` bounds the wait for the model's first output (a text chunk or
+    a tool call) before the agent falls back to another backend.
+    """
+    name = ""
+    kind = REMOTE
+
+    def __init__(self, model: str, timeout: float):
+        self.model = model
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def create(self):
+        """LangChain chat model for this backend"""
+
+
+class GeminiBackend(ModelBackend):
+    name = "gemini"
+    kind = REMOTE
+
+    def __init__(self, model: str = "gemini-1.5-flash", timeout: float = 8.0):
+        super().__init__(model, timeout)
+
+    def available(self) -> bool:
+        return bool(os.getenv("GOOGLE_API_KEY"))
+
+    def create(self):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        # specific for Gemini which handles tool calling well
+        return ChatGoogleGenerativeAI(
+            model=self.model,
+            temperature=0,
+            convert_system_message_to_human=True
+        )
+
+
+class OllamaBackend(ModelBackend):
+    """Quantized small model served on the robot by a local Ollama runtime (CPU only)"""
+    name = "ollama"
+    kind = LOCAL
+
+    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None, timeout: float = 4.0):
+        super().__init__(model or os.getenv("STELLA_LOCAL_MODEL", "qwen2.5:1.5b-instruct-q4_K_M"), timeout)
+        self.base_url = base_url or os.getenv("OLLAMA_HOST", "http://localhost:11434")
+
+    def create(self):
+        try:
+            from langchain_ollama import ChatOllama
+        except ImportError:
+            # Older integration (no tool calling on some versions)
+            from langchain_community.chat_models import ChatOllama
+        return ChatOllama(model=self.model, base_url=self.base_url, temperature=0, keep_alive="30m")
+
+
+def default_backends(model_name: str = "gemini-1.5-flash") -> list[ModelBackend]:
+    return [GeminiBackend(model_name), OllamaBackend()]
+
+
+# Phrasings that usually need the larger remote model
+COMPLEX = re.compile(
+    r"\b(why|explain|compare|difference|should i|what does .+ mean|side effects?|interact(ion)?s?|"
+    r"summari[sz]e|history|plan|advice|worried|worry)\b"
+)
+
+
+class BackendPolicy:
+    """
+    Orders backends for a turn.
+
+    Short, simple turns go to the local model first and complex ones
+    (long, several questions, explanation requests) to the remote model
+    first; the other backend is the fallback. Measured time to first output
+    is tracked per backend: when the local model's average exceeds
+    `local_budget_ms` it loses its preference, and a backend that just
+    timed out or failed is tried last until `cooldown` expires.
+
+    The first `warmup` samples of a backend (cold model load, connection
+    setup) are not counted. A demoted local model would never run again to
+    bring its average down, so every `probe_interval` seconds one simple
+    turn goes to it anyway; a fresh sample replaces the stale average.
+    """
+    def __init__(self, max_local_words: int = 16, local_budget_ms: float = 2500.0,
+                 cooldown: float = 60.0, smoothing: float = 0.3, probe_interval: float = 300.0,
+                 warmup: int = 1):
+        """
+        Args:
+            max_local_words: Longest utterance treated as simple
+            local_budget_ms: Average first-output latency above which the
+                             local model is no longer preferred
+            cooldown: Seconds a failed backend is demoted
+            smoothing: Weight of the newest sample in the latency average
+            probe_interval: Seconds between turns given to a demoted local model
+            warmup: Samples ignored per backend
+        """
+        self.max_local_words = max_local_words
+        self.local_budget_ms = local_budget_ms
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.probe_interval = probe_interval
+        self.warmup = warmup
+        self.latency_ms: dict[str, float] = {}
+        self._failed_at: dict[str, float] = {}
+        self._demoted_at: dict[str, float] = {}
+        self._samples: dict[str, int] = {}
+        self.stats = {"local_first": 0, "remote_first": 0, "fallbacks": 0, "probes": 0}
+
+    def is_simple(self, text: str) -> bool:
+        lowered = text.lower()
+        return (len(lowered.split()) <= self.max_local_words
+                and lowered.count("?") <= 1
+                and not COMPLEX.search(lowered))
+
+    def order(self, text: str, backends: list[ModelBackend]) -> list[ModelBackend]:
+        """Backends to try for this turn, best first"""
+        now = time.monotonic()
+        prefer = LOCAL if self.is_simple(text) and self._local_ok(backends, now) else REMOTE
+
+        def rank(backend):
+            cooling = now - self._failed_at.get(backend.name, -self.cooldown) < self.cooldown
+            return (cooling, not backend.available(), backend.kind != prefer)
+
+        ordered = sorted(backends, key=rank)
+        self.stats["local_first" if ordered and ordered[0].kind == LOCAL else "remote_first"] += 1
+        return ordered
+
+    def _local_ok(self, backends: list[ModelBackend], now: float) -> bool:
+        """False while a local backend is over budget, except for a periodic probe turn"""
+        ok = True
+        for backend in backends:
+            if backend.kind != LOCAL or self.latency_ms.get(backend.name, 0.0) <= self.local_budget_ms:
+                continue
+            demoted_at = self._demoted_at.setdefault(backend.name, now)
+            if now - demoted_at >= self.probe_interval:
+                self._demoted_at[backend.name] = now
+                self.stats["probes"] += 1
+            else:
+                ok = False
+        return ok
+
+    def record(self, backend: ModelBackend, first_output_ms: float):
+        self._failed_at.pop(backend.name, None)
+        samples = self._samples.get(backend.name, 0)
+        self._samples[backend.name] = samples + 1
+        if samples < self.warmup:
+            return
+        previous = self.latency_ms.get(backend.name)
+        if previous is None or backend.name in self._demoted_at:
+            self.latency_ms[backend.name] = first_output_ms
+        else:
+            self.latency_ms[backend.name] = self.smoothing * first_output_ms + (1 - self.smoothing) * previous
+        if self.latency_ms[backend.name] <= self.local_budget_ms:
+            self._demoted_at.pop(backend.name, None)
+
+    def record_failure(self, backend: ModelBackend):
+        self._failed_at[backend.name] = time.monotonic()
+        self.stats["fallbacks"] += 1
@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+try:
+    from ai.embeddings import HashingEmbedder, tokenize
+except ImportError:
+    from embeddings import HashingEmbedder, tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "patient_memory")
+
+ENTRIES_FILE = "entries.jsonl"
+INDEX_FILE = "index.npy"
+SCALE_FILE = "index_scale.npy"
+
+
+class PatientMemoryStore:
+    """
+    Local long-term memory of notes, incidents and preferences per patient.
+
+    Every entry is embedded once into a column of a (dim, entries) NumPy
+    matrix. Query embeddings are sparse (a handful of hashed words), so a
+    lookup only reads the matrix rows of the query's non-zero dimensions:
+    one small matrix-vector product gives the exact cosine similarity of
+    every entry, then a partial sort picks the top-k, optionally restricted
+    to one patient_id. With quantize=True entries are stored as int8 with a
+    per-entry scale (4x smaller). When nothing is similar enough, a keyword
+    index is used as a fallback.
+
+    On disk (directory `path`), entries.jsonl is appended to on every insert
+    and index.npy holds a snapshot of the embedding matrix, rewritten once
+    `snapshot_every` rows have been added since the last one (and after a
+    load that had to re-embed); rows added after the last snapshot are
+    re-embedded on load. Call save_index() on shutdown to persist the rest.
+    """
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, dim: int = 256, quantize: bool = False, embedder=None,
+                 snapshot_every: int = 256):
+        """
+        Args:
+            path: Storage directory (None keeps the store in RAM only)
+            dim: Embedding dimensions
+            quantize: Store embeddings as int8 instead of float32
+            embedder: Object with embed()/embed_many() (default HashingEmbedder)
+            snapshot_every: Rows added before index.npy is rewritten
+        """
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self._indexed = 0  # Rows covered by the on-disk snapshot
+        self.embedder = embedder or HashingEmbedder(dim)
+        self.dim = self.embedder.dim
+        self.quantize = quantize
+
+        self.entries: list[dict] = []
+        self._count = 0
+        self._vectors = np.zeros((self.dim, 0), dtype=np.int8 if quantize else np.float32)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._patients = np.zeros(0, dtype=np.int32)
+        self._patient_codes: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+        if path:
+            self.load()
+
+    def __len__(self):
+        return self._count
+
+    # ================= INSERTS ================= #
+
+    def _reserve(self, extra: int):
+        """Grow the arrays geometrically so inserts are amortized O(1)"""
+        needed = self._count + extra
+        if needed <= len(self._patients):
+            return
+        capacity = max(needed, 2 * len(self._patients), 1024)
+        n = self._count
+        vectors = np.zeros((self.dim, capacity), dtype=self._vectors.dtype)
+        vectors[:, :n] = self._vectors[:, :n]
+        self._vectors = vectors
+        for name in ("_scales", "_patients"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+    def _store_rows(self, vectors: np.ndarray, patient_ids: list[str]):
+        n = len(vectors)
+        self._reserve(n)
+        rows = slice(self._count, self._count + n)
+        if self.quantize:
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._vectors[:, rows] = np.round(vectors / scales[:, None]).astype(np.int8).T
+            self._scales[rows] = scales
+        else:
+            self._vectors[:, rows] = vectors.T
+        self._patients[rows] = [self._patient_codes.setdefault(p, len(self._patient_codes)) for p in patient_ids]
+
+    def _index_entries(self, entries: list[dict]):
+        for i, entry in enumerate(entries, start=self._count):
+            for token in set(tokenize(entry["text"])):
+                self._postings.setdefault(token, []).append(i)
+
+    def _append(self, entries: list[dict], vectors: np.ndarray):
+        self._store_rows(vectors, [e["patient_id"] for e in entries])
+        self._index_entries(entries)
+        self.entries.extend(entries)
+        self._count += len(entries)
+
+    def add(self, patient_id: str, text: str, kind: str = "note", timestamp: Optional[float] = None) -> int:
+        """Insert one memory; returns its row id"""
+        return self.add_many([(patient_id, text, kind, timestamp)])[0]
+
+    def add_many(self, items) -> list[int]:
+        """Insert (patient_id, text[, kind[, timestamp]]) tuples in one batch"""
+        now = time.time()
+        entries = []
+        for item in items:
+            patient_id, text = item[0], item[1]
+            kind = item[2] if len(item) > 2 else "note"
+            timestamp = item[3] if len(item) > 3 else None
+            entries.append({
+                "patient_id": patient_id,
+                "text": text,
+                "kind": kind or "note",
+                "timestamp": timestamp if timestamp is not None else now,
+            })
+        vectors = self.embedder.embed_many([e["text"] for e in entries])
+
+        with self._lock:
+            first = self._count
+            self._append(entries, vectors)
+            if self.path:
+                os.makedirs(self.path, exist_ok=True)
+                with open(os.path.join(self.path, ENTRIES_FILE), "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(e) + "\n" for e in entries))
+            stale = self._count - self._indexed
+        if self.path and stale >= self.snapshot_every:
+            self.save_index()
+        return list(range(first, first + len(entries)))
+
+    # ================= LOOKUP ================= #
+
+    def _scores(self, q: np.ndarray, n: int) -> np.ndarray:
+        """Cosine similarity of q with the first n entries"""
+        dims = np.flatnonzero(q)
+        scores = q[dims] @ self._vectors[dims, :n]
+        if self.quantize:
+            scores *= self._scales[:n]
+        return scores
+
+    def search(self, query: str, patient_id: Optional[str] = None, k: int = 5, min_score: float = 0.2) -> list[tuple[float, dict]]:
+        """
+        Top-k memories for a query as (score, entry), best first.
+
+        Falls back to keyword overlap when no entry reaches min_score.
+        """
+        q = self.embedder.embed(query)
+        with self._lock:
+            n = self._count
+            if n == 0:
+                return []
+            code = None
+            if patient_id is not None:
+                code = self._patient_codes.get(patient_id)
+                if code is None:
+                    return []
+
+            results = []
+            if q.any():
+                scores = self._scores(q, n)
+                if code is not None:
+                    scores[self._patients[:n] != code] = -1.0
+                k_eff = min(k, n)
+                top = np.argpartition(-scores, k_eff - 1)[:k_eff]
+                top = top[np.argsort(-scores[top])]
+                results = [(float(scores[i]), self.entries[i]) for i in top if scores[i] >= min_score]
+            if results:
+                return results
+            return self._keyword_search(query, code, k)
+
+    def _keyword_search(self, query: str, code: Optional[int], k: int) -> list[tuple[float, dict]]:
+        """Entries sharing the most query words, newest first on ties (lock held)"""
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        hits = Counter()
+        for token in tokens:
+            hits.update(self._postings.get(token, ()))
+        if code is not None:
+            hits = Counter({i: c for i, c in hits.items() if self._patients[i] == code})
+        ranked = sorted(hits.items(), key=lambda item: (item[1], self.entries[item[0]]["timestamp"]), reverse=True)
+        return [(count / len(tokens), self.entries[i]) for i, count in ranked[:k]]
+
+    # ================= PERSISTENCE ================= #
+
+    def save_index(self):
+        """Snapshot the embedding matrix so the next load doesn't re-embed"""
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock:
+            n = self._count
+            arrays = [(INDEX_FILE, self._vectors[:, :n])]
+            if self.quantize:
+                arrays.append((SCALE_FILE, self._scales[:n]))
+            for name, array in arrays:
+                tmp = os.path.join(self.path, f"{name}.tmp")
+                with open(tmp, "wb") as f:
+                    np.save(f, array)
+                os.replace(tmp, os.path.join(self.path, name))
+            self._indexed = n
+
+    def load(self):
+        entries_path = os.path.join(self.path, ENTRIES_FILE)
+        if not os.path.exists(entries_path):
+            return
+        entries = []
+        with open(entries_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Skipping corrupt patient memory entry")
+
+        # Reuse the snapshot rows when their format matches this store
+        snapshot = np.zeros((0, self.dim), dtype=np.float32)
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if os.path.exists(index_path):
+            stored = np.load(index_path, mmap_mode="r")
+            dtype = np.int8 if self.quantize else np.float32
+            if stored.dtype == dtype and stored.shape[0] == self.dim:
+                snapshot = stored[:, :len(entries)].T
+                if self.quantize:
+                    snapshot = snapshot * np.load(os.path.join(self.path, SCALE_FILE))[:len(snapshot), None]
+
+        fresh = self.embedder.embed_many([e["text"] for e in entries[len(snapshot):]])
+        vectors = np.concatenate([np.asarray(snapshot, dtype=np.float32), fresh]) if len(snapshot) else fresh
+        with self._lock:
+            self._append(entries, vectors)
+            self._indexed = len(snapshot)
+        logger.info(f"Loaded {len(entries)} patient memories ({len(snapshot)} from index)")
+        if len(fresh):
+            # Don't embed the same rows again on the next start
+            self.save_index()
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self._count
+            return {
+                "entries": n,
+                "patients": len(self._patient_codes),
+                "index_bytes": int(self._vectors[:, :n].nbytes + (self._scales[:n].nbytes if self.quantize else 0)),
+                "quantized": self.quantize,
+            }
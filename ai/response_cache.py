@@ -0,0 +1,207 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    from ai.embeddings import HashingEmbedder, tokenize
+    from ai.intent_router import mentions_symptoms
+except ImportError:
+    from embeddings import HashingEmbedder, tokenize
+    from intent_router import mentions_symptoms
+
+logger = logging.getLogger(__name__)
+
+PUNCTUATION = re.compile(r"[^\w\s']+")
+
+# Follow-ups whose meaning comes from earlier turns ("what about tomorrow",
+# "and is that normal"): the same words can need a different answer
+CONTEXTUAL = re.compile(
+    r"^(and|but|so|also|then|what about|how about|what if)\b|"
+    r"\b(it|its|it's|that|this|those|these|them|they|he|she|him|her|there|again|instead|else|same|"
+    r"another|tomorrow|yesterday|before|after that|earlier)\b"
+)
+
+
+def depends_on_context(text: str) -> bool:
+    """True when an utterance likely refers back to the conversation"""
+    return bool(CONTEXTUAL.search(normalize(text)))
+
+
+def normalize(text: str) -> str:
+    """Lower-case, drop punctuation, collapse whitespace"""
+    return " ".join(PUNCTUATION.sub(" ", text.lower()).split())
+
+
+class CacheEntry:
+    __slots__ = ("key", "response", "deps", "expires", "latency_ms", "slot")
+
+    def __init__(self, key, response, deps, expires, latency_ms, slot):
+        self.key = key
+        self.response = response
+        self.deps = deps            # data source -> version the answer was based on
+        self.expires = expires
+        self.latency_ms = latency_ms
+        self.slot = slot
+
+
+class ResponseCache:
+    """
+    Semantic cache of agent answers.
+
+    Utterances are normalized and embedded; a lookup compares the query with
+    every cached utterance in one matrix product and accepts the best match
+    above `threshold`. An entry is only served while it is within its TTL
+    and every tool data source it was built from (vitals bucket, schedule
+    version, ...) still has the version it had when the answer was stored.
+    Least recently used entries are evicted first. Anything `bypass` flags
+    (symptom and distress reports by default; IntentRouter.needs_agent also
+    catches emergency-like phrasings) and follow-ups that depend on earlier
+    turns are never looked up or stored.
+    """
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        ttl: float = 3600.0,
+        source_ttl: Optional[dict] = None,
+        max_entries: int = 256,
+        min_words: int = 2,
+        bypass: Optional[Callable[[str], bool]] = mentions_symptoms,
+        contextual: Optional[Callable[[str], bool]] = depends_on_context,
+        embedder=None,
+    ):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            ttl: Default entry lifetime in seconds
+            source_ttl: Shorter lifetimes for answers using a data source,
+                        e.g. {"vitals": 120}
+            max_entries: LRU capacity
+            min_words: Utterances with fewer content words are not cached
+                       (they usually depend on the conversation, e.g. "yes")
+            bypass: Predicate for safety-critical utterances (the agent must see them)
+            contextual: Predicate for utterances that depend on the chat history
+            embedder: Object with embed() (default HashingEmbedder)
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        # The next pending dose moves through the day even if the schedule doesn't change
+        self.source_ttl = source_ttl if source_ttl is not None else {"vitals": 120.0, "schedule": 600.0}
+        self.max_entries = max_entries
+        self.min_words = min_words
+        self.bypass = bypass
+        self.contextual = contextual
+        self.embedder = embedder or HashingEmbedder()
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._matrix = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self._slots: list[Optional[CacheEntry]] = [None] * max_entries
+        self._free = list(range(max_entries - 1, -1, -1))
+
+        self.lookups = 0
+        self.hits = 0
+        self.bypassed = 0
+        self.contextual_skips = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.saved_ms = 0.0
+
+    def _cacheable(self, text: str) -> bool:
+        if self.bypass and self.bypass(text):
+            self.bypassed += 1
+            return False
+        if self.contextual and self.contextual(text):
+            self.contextual_skips += 1
+            return False
+        return len(tokenize(text)) >= self.min_words
+
+    def _remove(self, entry: CacheEntry):
+        del self._entries[entry.key]
+        self._matrix[entry.slot] = 0.0
+        self._slots[entry.slot] = None
+        self._free.append(entry.slot)
+
+    def _valid(self, entry: CacheEntry, versions: dict, now: float) -> bool:
+        if now > entry.expires:
+            return False
+        return all(versions.get(source) == version for source, version in entry.deps.items())
+
+    def lookup(self, text: str, versions: dict) -> Optional[str]:
+        """
+        Cached answer for an utterance, or None.
+
+        Args:
+            text: The user's utterance
+            versions: Current data versions (source -> version)
+        """
+        if not self._cacheable(text):
+            return None
+        self.lookups += 1
+        key = normalize(text)
+
+        entry = self._entries.get(key)
+        if entry is None and self._entries:
+            scores = self._matrix @ self.embedder.embed(key)
+            slot = int(np.argmax(scores))
+            if scores[slot] >= self.threshold:
+                entry = self._slots[slot]
+        if entry is None:
+            return None
+
+        if not self._valid(entry, versions, time.monotonic()):
+            self._remove(entry)
+            self.invalidations += 1
+            return None
+
+        self._entries.move_to_end(entry.key)
+        self.hits += 1
+        self.saved_ms += entry.latency_ms
+        return entry.response
+
+    def store(self, text: str, response: str, deps: dict, latency_ms: float):
+        """
+        Cache an answer.
+
+        Args:
+            text: The user's utterance
+            response: The full answer
+            deps: Data sources the answer used, with their versions
+            latency_ms: What producing the answer cost (reported as saved on hits)
+        """
+        if not response or not self._cacheable(text):
+            return
+        key = normalize(text)
+        if key in self._entries:
+            self._remove(self._entries[key])
+        if not self._free:
+            self._remove(next(iter(self._entries.values())))  # Least recently used
+            self.evictions += 1
+
+        ttl = min([self.ttl] + [self.source_ttl[s] for s in deps if s in self.source_ttl])
+        slot = self._free.pop()
+        self._matrix[slot] = self.embedder.embed(key)
+        entry = CacheEntry(key, response, dict(deps), time.monotonic() + ttl, latency_ms, slot)
+        self._entries[key] = self._slots[slot] = entry
+
+    def invalidate(self, source: Optional[str] = None):
+        """Drop every entry built from `source` (or everything)"""
+        for entry in list(self._entries.values()):
+            if source is None or source in entry.deps:
+                self._remove(entry)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "saved_ms": self.saved_ms,
+            "bypassed": self.bypassed,
+            "contextual_skips": self.contextual_skips,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
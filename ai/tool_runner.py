@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+logger = logging.getLogger(__name__)
+
+# Seconds a tool may take before the model is told it timed out
+DEFAULT_TIMEOUTS = {
+    "check_vitals": 15.0,
+    "trigger_emergency_alert": 30.0,
+}
+
+
+class ToolRunner:
+    """
+    Runs agent tools so that one slow tool can't stall a turn.
+
+    Every tool is wrapped in an async tool: coroutine tools run on the event
+    loop, sync tools run in a small bounded thread pool (instead of the
+    loop's shared default executor), and each call gets a timeout. The
+    AgentExecutor's async path gathers all tool calls of one model step, so
+    the wrapped tools run concurrently. A timed-out or failing tool returns
+    an error string to the model rather than raising.
+
+    A timeout only stops the waiting: a Python thread can't be killed, so a
+    hung sync tool keeps its thread until it returns. After a sync timeout
+    the pool is replaced, so later calls get fresh threads, and the stuck
+    call is counted as stranded. Once `max_stranded` threads are stuck,
+    sync tools fail immediately instead of piling up more threads.
+    """
+    def __init__(self, max_workers: int = 4, default_timeout: float = 8.0, timeouts: Optional[dict] = None,
+                 max_stranded: int = 8):
+        """
+        Args:
+            max_workers: Threads for sync tools
+            default_timeout: Timeout in seconds for tools not in `timeouts`
+            timeouts: Per-tool timeouts by tool name
+            max_stranded: Timed-out sync calls still running at which sync
+                          tools stop being started
+        """
+        self.default_timeout = default_timeout
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.max_workers = max_workers
+        self.max_stranded = max_stranded
+        self._pool = self._new_pool()
+        self._stranded: set[Future] = set()
+        self.pool_replacements = 0
+        self._stats: dict[str, dict] = {}
+
+    def _new_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+
+    def _strand(self, future: Future):
+        """Give up on a timed-out sync call: its thread stays busy, later calls get a new pool"""
+        if future.done():
+            return
+        self._stranded.add(future)
+        future.add_done_callback(self._stranded.discard)
+        old, self._pool = self._pool, self._new_pool()
+        old.shutdown(wait=False)
+        self.pool_replacements += 1
+
+    def _record(self, name: str, seconds: float, outcome: str):
+        stats = self._stats.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "timeouts": 0, "errors": 0})
+        stats["calls"] += 1
+        stats["total_ms"] += seconds * 1000.0
+        stats["max_ms"] = max(stats["max_ms"], seconds * 1000.0)
+        if outcome != "ok":
+            stats[outcome] += 1
+
+    async def run(self, tool: BaseTool, args: dict):
+        """Call one tool with its timeout; returns the tool output or an error string"""
+        timeout = self.timeouts.get(tool.name, self.default_timeout)
+        # The wrapper already reports the call; don't emit a nested tool run
+        config = {"callbacks": []}
+        start = time.perf_counter()
+        future = None
+        try:
+            if getattr(tool, "coroutine", None) is not None:
+                call = tool.ainvoke(args, config)
+            else:
+                if len(self._stranded) >= self.max_stranded:
+                    raise RuntimeError(f"{len(self._stranded)} earlier tool calls are still stuck")
+                future = self._pool.submit(partial(tool.invoke, args, config))
+                call = asyncio.wrap_future(future)
+            result = await asyncio.wait_for(call, timeout)
+            self._record(tool.name, time.perf_counter() - start, "ok")
+            return result
+        except asyncio.TimeoutError:
+            if future is not None:
+                self._strand(future)
+            self._record(tool.name, time.perf_counter() - start, "timeouts")
+            logger.warning(f"Tool {tool.name} timed out after {timeout:.0f} s")
+            return f"The {tool.name} tool timed out. Its data is unavailable right now."
+        except Exception as e:
+            self._record(tool.name, time.perf_counter() - start, "errors")
+            logger.error(f"Tool {tool.name} failed: {e}")
+            return f"The {tool.name} tool failed: {e}"
+
+    def wrap(self, tools: list[BaseTool]) -> list[BaseTool]:
+        """Async, time-limited versions of the given tools (same names and schemas)"""
+        wrapped = []
+        for tool in tools:
+            async def call(_tool=tool, **kwargs):
+                return await self.run(_tool, kwargs)
+
+            wrapped.append(StructuredTool.from_function(
+                coroutine=call,
+                name=tool.name,
+                description=tool.description,
+                args_schema=tool.args_schema,
+            ))
+        return wrapped
+
+    def stats(self) -> dict:
+        """Per-tool call count, mean/max latency, timeouts and errors"""
+        return {
+            name: dict(s, mean_ms=s["total_ms"] / s["calls"] if s["calls"] else 0.0)
+            for name, s in self._stats.items()
+        }
+
+    @property
+    def stranded(self) -> int:
+        """Timed-out sync calls whose threads are still running"""
+        return len(self._stranded)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
@@ -1,4 +1,5 @@
 import logging
+import threading
 from typing import Optional
 from langchain_core.tools import tool
 # Assuming the sensor modules are importable. 
@@ -14,13 +15,113 @@ except ImportError:
     class TemperatureSensor:
         async def read(self): return 36.6
 
+try:
+    from ai.patient_memory import PatientMemoryStore
+except ImportError:
+    from patient_memory import PatientMemoryStore
+
+try:
+    from sensors.vitals_monitor import VitalsMonitor
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from sensors.vitals_monitor import VitalsMonitor
+
 logger = logging.getLogger(__name__)
 
+CURRENT_PATIENT = "current_patient"
+
+# Long-term patient memory (on-disk vector index under data/patient_memory),
+# opened on first use so importing the tools touches no files
+_patient_memory: Optional[PatientMemoryStore] = None
+_patient_memory_lock = threading.Lock()
+
+
+def get_patient_memory() -> PatientMemoryStore:
+    global _patient_memory
+    with _patient_memory_lock:
+        if _patient_memory is None:
+            store = PatientMemoryStore()
+            if len(store) == 0:
+                # Seed the intake profile on first run
+                store.add_many([
+                    (CURRENT_PATIENT, "Patient name is Sarah", "profile"),
+                    (CURRENT_PATIENT, "Condition: Type 2 Diabetes, Hypertension", "condition"),
+                    (CURRENT_PATIENT, "Prefers being called Mrs. Sarah. Likes polite, calm interactions.", "preference"),
+                    (CURRENT_PATIENT, "Last incident: dizziness reported 2 days ago.", "incident"),
+                ])
+            _patient_memory = store
+        return _patient_memory
+
+
+def save_patient_memory():
+    """Snapshot the patient memory index (on shutdown), if it was opened"""
+    if _patient_memory is not None:
+        _patient_memory.save_index()
+
 # Singletons for sensors to persist state if needed
 heart_sensor = HeartRateSensor()
 # We don't have a temperature sensor file shown in list_dir (wait, yes we did: sensors/temperature.py)
 # but I haven't read it. I'll assume it exists similar to heart.py.
 
+# ===== Data versions (for caches that depend on tool results) ===== #
+
+# Last successful vitals reading
+latest_vitals = {"heart_rate": None, "temperature": None, "timestamp": None}
+
+
+async def _read_sensors() -> dict:
+    """One sensor capture"""
+    hr = await heart_sensor.read()
+    # Mocking temp read since I didn't init the class in global scope properly above without reading file
+    # But in real code we'd instantiate it.
+    temp = 37.0
+    return {"heart_rate": hr, "temperature": temp}
+
+
+def _publish_vitals(snapshot):
+    latest_vitals.update(heart_rate=snapshot.heart_rate, temperature=snapshot.temperature, timestamp=snapshot.timestamp)
+
+
+# Background acquisition: the pipeline prefetches while the user speaks,
+# check_vitals serves the snapshot while it is fresh
+vitals_monitor = VitalsMonitor(_read_sensors, on_update=_publish_vitals)
+
+# Which data source each tool reads
+TOOL_SOURCES = {
+    "check_vitals": "vitals",
+    "get_medicine_schedule": "schedule",
+    "recall_patient_memory": "patient_memory",
+}
+
+
+def _medicine_schedule(patient_id: Optional[str] = CURRENT_PATIENT) -> str:
+    # Mock database content
+    return """
+    - 09:00 AM: Aspirin (100mg) - Taken
+    - 02:00 PM: Vitamin D - Pending
+    - 08:00 PM: Metformin - Pending
+    """
+
+
+def vitals_bucket():
+    """Coarse vitals state: heart rate in 10 BPM steps, temperature in 0.5 °C steps"""
+    hr, temp = latest_vitals["heart_rate"], latest_vitals["temperature"]
+    if hr is None:
+        return None
+    return (int(hr // 10), int(round(temp * 2)))
+
+
+def data_versions() -> dict:
+    """Current version of every tool data source"""
+    return {
+        "vitals": vitals_bucket(),
+        # Changes whenever a dose is marked taken or the plan is edited
+        "schedule": hash(_medicine_schedule()),
+        "patient_memory": len(_patient_memory) if _patient_memory is not None else None,
+    }
+
 @tool
 async def check_vitals() -> str:
     """
@@ -29,11 +130,9 @@ async def check_vitals() -> str:
     Use this when the user asks about their health status or if you need to check their physical state.
     """
     try:
-        hr = await heart_sensor.read()
-        # Mocking temp read since I didn't init the class in global scope properly above without reading file
-        # But in real code we'd instantiate it.
-        temp = 37.0 
-        return f"Heart Rate: {hr} BPM, Temperature: {temp}°C"
+        snapshot = await vitals_monitor.get()
+        return (f"Heart Rate: {snapshot.heart_rate} BPM, Temperature: {snapshot.temperature}°C "
+                f"(measured {snapshot.age:.0f} s ago)")
     except Exception as e:
         logger.error(f"Error checking vials: {e}")
         return "Error reading vital signs sensors."
@@ -44,35 +143,21 @@ def get_medicine_schedule(patient_id: Optional[str] = "current_patient") -> str:
     Retrieves the medicine schedule for the patient.
     Use this to reminds the patient about their medication or check if they missed a dose.
     """
-    # Mock database content
-    return """
-    - 09:00 AM: Aspirin (100mg) - Taken
-    - 02:00 PM: Vitamin D - Pending
-    - 08:00 PM: Metformin - Pending
-    """
+    return _medicine_schedule(patient_id)
 
 @tool
-def recall_patient_memory(query: str) -> str:
+def recall_patient_memory(query: str, patient_id: Optional[str] = CURRENT_PATIENT) -> str:
     """
     Retrieves specific information from the patient's history or long-term memory.
     Use this to recall past conversations, medical history, or personal preferences.
     """
-    # Mock memory retrieval
-    memories = {
-        "name": "Sarah",
-        "condition": "Type 2 Diabetes, Hypertension",
-        "preference": "Prefers being called Mrs. Sarah. Likes polite, calm interactions.",
-        "last_incident": "Dizziness reported 2 days ago."
-    }
-    # Simple keyword search mock
-    results = []
-    for k, v in memories.items():
-        if k in query.lower() or query.lower() in v.lower():
-            results.append(f"{k}: {v}")
-    
+    patient_memory = get_patient_memory()
+    results = patient_memory.search(query, patient_id=patient_id, k=3)
     if not results:
-        return f"No specific memory found for '{query}', but patient context is: {memories['condition']}."
-    return "\n".join(results)
+        condition = patient_memory.search("condition", patient_id=patient_id, k=1)
+        context = condition[0][1]["text"] if condition else "none on file"
+        return f"No specific memory found for '{query}', but patient context is: {context}."
+    return "\n".join(f"{entry['kind']}: {entry['text']}" for _, entry in results)
 
 @tool
 def trigger_emergency_alert(reason: str, level: str = "high") -> str:
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Stella Nurse - Eye Clip Baker
+Runs RoboEyes offline (rgb565 backend, simulated clock, fixed dt, seeded
+randomness) and writes every state-to-state transition and one seamless idle
+loop per state as delta/RLE RGB565 clips:
+
+    <out>/<to_state>/from_<from_state>.s565
+    <out>/<state>/loop.s565
+
+    python3 bake_clips.py
+    python3 bake_clips.py --states idle happy sad --out /tmp/faces
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+# Ensure we can import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from clips import CLIP_EXT, write_clip
+from display_driver import MemoryDisplay
+from eyes import RoboEyes
+from expressions import STATE_TARGETS
+
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "faces")
+
+
+class BakeEyes(RoboEyes):
+    """RoboEyes on a simulated clock with all unscripted motion turned off"""
+    def __init__(self, width, height, fps):
+        super().__init__(MemoryDisplay(keep_frame=False), width=width, height=height, fps=fps,
+                         pipelined=False, backend="rgb565")
+        self.now = 0.0
+        self.clock = lambda: self.now
+        self.micro_movement_enabled = False  # No wander / jitter
+        self.next_blink_time = math.inf
+
+    def frame(self, dt):
+        """Render one frame at dt and return a copy of it"""
+        self.now += dt
+        return self._render(dt).copy()
+
+
+def bake_transition(eyes, from_state, to_state, max_seconds):
+    """From rest in from_state until to_state has settled (breathing off)"""
+    eyes.breathing_enabled = False
+    eyes.next_blink_time = math.inf
+    eyes.snap_state(from_state)
+    eyes.set_state(to_state)
+
+    frames = []
+    for _ in range(int(max_seconds * eyes.fps)):
+        frames.append(eyes.frame(eyes.dt))
+        if eyes._is_settled():
+            break
+    return frames
+
+
+def bake_loop(eyes, state, blink_at=0.3):
+    """
+    One breathing cycle at rest with a single blink. The cycle length is
+    fitted to a whole number of frames, so the last frame leads straight
+    back into the first.
+    """
+    period = 2.0 * math.pi / 3.0  # breathing_phase advances 3 rad/s
+    n = max(1, int(round(period * eyes.fps)))
+    dt = period / n
+
+    eyes.breathing_enabled = True
+    eyes.snap_state(state)
+    eyes.breathing_phase = 0.0
+    eyes.is_blinking = False
+    eyes.next_blink_time = eyes.now + period * blink_at
+
+    frames = [eyes.frame(dt) for _ in range(n)]
+    eyes.is_blinking = False
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake RoboEyes transitions and idle loops into clips")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Output directory (default: assets/faces)")
+    parser.add_argument("--states", nargs="+", default=list(STATE_TARGETS), help="States to bake")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=128)
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Longest transition clip")
+    parser.add_argument("--no-loops", action="store_true", help="Only bake transitions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    eyes = BakeEyes(args.width, args.height, args.fps)
+    raw_frame = args.width * args.height * 2
+
+    jobs = [(a, b) for b in args.states for a in args.states if a != b]
+    if not args.no_loops:
+        jobs += [(s, None) for s in args.states]
+
+    print(f"🎞️  Baking {len(jobs)} clips into {os.path.abspath(args.out)}")
+    start = time.perf_counter()
+    total_frames = total_bytes = 0
+    for from_state, to_state in jobs:
+        if to_state is None:
+            frames = bake_loop(eyes, from_state)
+            path = os.path.join(args.out, from_state, f"loop{CLIP_EXT}")
+        else:
+            frames = bake_transition(eyes, from_state, to_state, args.max_seconds)
+            path = os.path.join(args.out, to_state, f"from_{from_state}{CLIP_EXT}")
+        size = write_clip(path, frames, args.fps)
+        total_frames += len(frames)
+        total_bytes += size
+        print(f"   {os.path.relpath(path, args.out):32s} {len(frames):4d} frames {size / 1024:7.1f} KB")
+
+    elapsed = time.perf_counter() - start
+    print("=" * 50)
+    print(f"Frames:       {total_frames}")
+    print(f"Size:         {total_bytes / 1024:.0f} KB "
+          f"({total_bytes / max(1, total_frames * raw_frame) * 100:.1f}% of raw RGB565)")
+    print(f"Bake time:    {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Stella Nurse - Eye Render Benchmark
+Drives RoboEyes._render headlessly through every expression and reports
+frame rate, p50/p99 frame time, memory churn per frame and the share of time
+spent on rotated eyes. Exits non-zero when a --min-fps / --max-p99-ms gate
+fails, so it can be used as a render-performance regression check.
+
+    python3 benchmark_eyes.py
+    python3 benchmark_eyes.py --backend rgb565 --present --min-fps 500
+
+Per-eye panels vs. one double-width panel over a simulated 32 MHz SPI bus:
+    python3 benchmark_eyes.py --present --spi-mhz 32 --panels 2
+    python3 benchmark_eyes.py --present --spi-mhz 32 --width 320
+(--separate-buses models panels on their own SPI bus; by default they share one.)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+# Ensure we can import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from display_driver import MemoryDisplay
+from eyes import RoboEyes
+from expressions import STATE_TARGETS
+from sprite_cache import SpriteCache
+
+
+class ProfiledEyes(RoboEyes):
+    """RoboEyes that accounts time spent drawing rotated eyes"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rotated_time = 0.0
+        self.rotated_draws = 0
+
+    def _draw_eye(self, img, base_x, off_x, off_y, scale_w, scale_h, rot, *args, **kwargs):
+        if abs(rot) < 0.05:
+            return super()._draw_eye(img, base_x, off_x, off_y, scale_w, scale_h, rot, *args, **kwargs)
+        start = time.perf_counter()
+        super()._draw_eye(img, base_x, off_x, off_y, scale_w, scale_h, rot, *args, **kwargs)
+        self.rotated_time += time.perf_counter() - start
+        self.rotated_draws += 1
+
+
+def make_eyes(args):
+    spi_hz = args.spi_mhz * 1e6 if args.spi_mhz else None
+    # Like the wiring in init_display(): both panels share one bus and DC line
+    bus_lock = None if args.separate_buses else threading.Lock()
+    devices = [MemoryDisplay(keep_frame=False, spi_hz=spi_hz, bus_lock=bus_lock) for _ in range(args.panels)]
+    eyes = ProfiledEyes(devices if args.panels > 1 else devices[0], width=args.width, height=args.height,
+                        fps=args.fps, backend=args.backend, pipelined=False)
+    if args.no_sprite_cache:
+        eyes.sprite_cache = SpriteCache(max_entries=0)
+        if eyes._rgb565:
+            eyes._rgb565.sprites = SpriteCache(max_entries=0)
+            eyes._rgb565.spans = SpriteCache(max_entries=0)
+    return eyes, devices
+
+
+def run_states(eyes, states, frames_per_state, present, dt):
+    """Render every state in turn; returns per-frame times in seconds"""
+    times = []
+    for state in states:
+        eyes.set_state(state)
+        for _ in range(frames_per_state):
+            start = time.perf_counter()
+            frame = eyes._render(dt)
+            if present:
+                eyes._present(frame)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def measure_allocations(args, states):
+    """Transient Python heap use per frame (peak above baseline), via tracemalloc"""
+    eyes, _ = make_eyes(args)
+    dt = 1.0 / args.fps
+    run_states(eyes, states, 5, args.present, dt)  # warm caches
+
+    peaks = []
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    for state in states:
+        eyes.set_state(state)
+        for _ in range(max(1, args.frames // 10)):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            frame = eyes._render(dt)
+            if args.present:
+                eyes._present(frame)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+    tracemalloc.stop()
+    frames = len(peaks)
+    return {
+        "alloc_kb_per_frame": float(np.mean(peaks)) / 1024.0,
+        "net_blocks_per_frame": (sys.getallocatedblocks() - blocks_before) / frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RoboEyes renderer headlessly")
+    parser.add_argument("--frames", type=int, default=120, help="Frames rendered per state")
+    parser.add_argument("--fps", type=int, default=60, help="Simulated frame rate (physics dt)")
+    parser.add_argument("--backend", choices=("pil", "rgb565"), default="pil")
+    parser.add_argument("--present", action="store_true", help="Include frame diff + device write")
+    parser.add_argument("--panels", type=int, choices=(1, 2), default=1, help="2 = one panel per eye")
+    parser.add_argument("--width", type=int, default=160, help="Frame width (per panel)")
+    parser.add_argument("--height", type=int, default=128, help="Frame height (per panel)")
+    parser.add_argument("--spi-mhz", type=float, help="Simulate SPI transfer time at this bus speed")
+    parser.add_argument("--separate-buses", action="store_true",
+                        help="Panels on their own SPI bus and DC pin (default: shared, as wired)")
+    parser.add_argument("--no-sprite-cache", action="store_true", help="Rasterize every eye from scratch")
+    parser.add_argument("--min-fps", type=float, help="Fail if mean FPS is below this")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if p99 frame time exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    states = list(STATE_TARGETS)
+
+    eyes, devices = make_eyes(args)
+    dt = 1.0 / args.fps
+    run_states(eyes, states, 10, args.present, dt)  # warm-up
+    eyes.rotated_time = 0.0
+    eyes.rotated_draws = 0
+    for device in devices:
+        device.writes = device.pixels = 0
+
+    start = time.perf_counter()
+    times = np.array(run_states(eyes, states, args.frames, args.present, dt))
+    total = time.perf_counter() - start
+
+    results = {
+        "backend": args.backend,
+        "panels": args.panels,
+        "shared_bus": args.panels > 1 and not args.separate_buses,
+        "frame_size": f"{args.width}x{args.height}",
+        "states": len(states),
+        "frames": len(times),
+        "fps": len(times) / total,
+        "p50_ms": float(np.percentile(times, 50)) * 1000.0,
+        "p99_ms": float(np.percentile(times, 99)) * 1000.0,
+        "max_ms": float(times.max()) * 1000.0,
+        "rotated_share": eyes.rotated_time / times.sum() if times.sum() else 0.0,
+        "rotated_draws": eyes.rotated_draws,
+        "sprite_cache": (eyes._rgb565.sprites if eyes._rgb565 else eyes.sprite_cache).stats(),
+    }
+    if args.present:
+        results["spi_kb_per_frame"] = sum(d.bytes_sent for d in devices) / len(times) / 1024.0
+    results.update(measure_allocations(args, states))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("🤖 RoboEyes render benchmark")
+        print("=" * 50)
+        print(f"Backend:            {results['backend']}")
+        print(f"Panels:             {results['panels']} x {results['frame_size']}"
+              f"{' (shared SPI bus)' if results['shared_bus'] else ''}")
+        print(f"States x frames:    {results['states']} x {args.frames}")
+        print(f"Frames/sec:         {results['fps']:.1f}")
+        print(f"Frame time p50/p99: {results['p50_ms']:.3f} / {results['p99_ms']:.3f} ms (max {results['max_ms']:.3f})")
+        print(f"Rotated path share: {results['rotated_share'] * 100:.1f}% ({results['rotated_draws']} eye draws)")
+        print(f"Alloc per frame:    {results['alloc_kb_per_frame']:.1f} KB transient, "
+              f"{results['net_blocks_per_frame']:.2f} net blocks")
+        print(f"Sprite cache:       {results['sprite_cache']['hit_rate'] * 100:.1f}% hits, "
+              f"{results['sprite_cache']['bytes'] / 1024:.0f} KB")
+        if args.present:
+            print(f"SPI payload:        {results['spi_kb_per_frame']:.1f} KB/frame")
+
+    failed = False
+    if args.min_fps is not None and results["fps"] < args.min_fps:
+        print(f"❌ FPS {results['fps']:.1f} below gate {args.min_fps}")
+        failed = True
+    if args.max_p99_ms is not None and results["p99_ms"] > args.max_p99_ms:
+        print(f"❌ p99 {results['p99_ms']:.3f} ms above gate {args.max_p99_ms}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
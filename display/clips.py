@@ -0,0 +1,259 @@
+"""
+Stella Nurse - Pre-baked Eye Clips
+Compact delta/RLE-encoded RGB565 animation clips, read through mmap and
+streamed to the panel as raw SPI windows. Playing a baked transition costs
+a few NumPy calls per frame instead of a full physics + render pass.
+
+File layout (.s565, little-endian unless noted):
+    header   4s magic "S565", H version, H width, H height, H fps, I frames
+    index    (frames + 1) x I absolute byte offsets of each frame record
+    frame    H rect count, then per rect:
+               H x0, H y0, H x1, H y1 (x1/y1 exclusive), I run count,
+               run lengths (H each; longer runs are split), run values
+               (big-endian RGB565, H each)
+Frame 0 always covers the whole screen; later frames only carry the
+regions that changed since the previous frame.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+try:
+    from frame_diff import FrameDiff, panel_origin
+except ImportError:
+    from display.frame_diff import FrameDiff, panel_origin
+
+MAGIC = b"S565"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHHI")
+RECT = struct.Struct("<HHHHI")
+CLIP_EXT = ".s565"
+MAX_RUN = 0xFFFF  # Longest run a u2 length can hold
+
+
+# ================= ENCODING ================= #
+
+def _encode_rect(frame, box):
+    x0, y0, x1, y1 = box
+    flat = frame[y0:y1, x0:x1].ravel()
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.concatenate((starts, [flat.size])))
+    values = flat[starts].astype(">u2")
+    pieces = (lengths + MAX_RUN - 1) // MAX_RUN
+    if (pieces > 1).any():
+        # Split long runs (e.g. a solid full frame) into MAX_RUN pieces plus the remainder
+        values = np.repeat(values, pieces)
+        split = np.full(int(pieces.sum()), MAX_RUN)
+        split[np.cumsum(pieces) - 1] = lengths - (pieces - 1) * MAX_RUN
+        lengths = split
+    return (
+        RECT.pack(x0, y0, x1, y1, len(lengths))
+        + lengths.astype("<u2").tobytes()
+        + values.tobytes()
+    )
+
+
+def write_clip(path, frames, fps):
+    """
+    Encode RGB565 frames (HxW uint16 arrays) into a clip file.
+
+    Returns the number of bytes written.
+    """
+    frames = list(frames)
+    if not frames:
+        raise ValueError("Clip needs at least one frame")
+    height, width = frames[0].shape
+    differ = FrameDiff(width, height)
+
+    records = []
+    for frame in frames:
+        boxes = differ.diff(frame)
+        if boxes is None:
+            boxes = [(0, 0, width, height)]
+        records.append(struct.pack("<H", len(boxes)) + b"".join(_encode_rect(frame, b) for b in boxes))
+
+    offsets = []
+    pos = HEADER.size + 4 * (len(records) + 1)
+    for rec in records:
+        offsets.append(pos)
+        pos += len(rec)
+    offsets.append(pos)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, height, fps, len(records)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        for rec in records:
+            f.write(rec)
+    return pos
+
+
+# ================= DECODING ================= #
+
+class Clip:
+    """
+    Memory-mapped clip. Frame data is decoded straight from the mapping,
+    so opening a clip costs nothing until its frames are played.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.fps, self.frames = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a v{VERSION} S565 clip: {path}")
+        self._index = np.frombuffer(self._mm, dtype="<u4", count=self.frames + 1, offset=HEADER.size)
+
+    def __len__(self):
+        return self.frames
+
+    @property
+    def duration(self):
+        return self.frames / self.fps
+
+    def rects(self, i):
+        """Yield ((x0, y0, x1, y1), HxW big-endian RGB565 pixels) for frame i"""
+        pos = int(self._index[i])
+        (count,) = struct.unpack_from("<H", self._mm, pos)
+        pos += 2
+        for _ in range(count):
+            x0, y0, x1, y1, runs = RECT.unpack_from(self._mm, pos)
+            pos += RECT.size
+            lengths = np.frombuffer(self._mm, dtype="<u2", count=runs, offset=pos)
+            pos += 2 * runs
+            values = np.frombuffer(self._mm, dtype=">u2", count=runs, offset=pos)
+            pos += 2 * runs
+            yield (x0, y0, x1, y1), np.repeat(values, lengths).reshape(y1 - y0, x1 - x0)
+
+    def close(self):
+        self._index = None
+        self._mm.close()
+
+
+class ClipLibrary:
+    """
+    Baked clips on disk, laid out as
+        <root>/<to_state>/from_<from_state>.s565   state transitions
+        <root>/<state>/loop.s565                   seamless idle loops
+    Clips are opened (mapped) on first use and kept open.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._open = {}
+
+    def _get(self, path):
+        clip = self._open.get(path)
+        if clip is None and os.path.exists(path):
+            clip = self._open[path] = Clip(path)
+        return clip
+
+    def transition(self, from_state, to_state):
+        return self._get(os.path.join(self.root, to_state, f"from_{from_state}{CLIP_EXT}"))
+
+    def loop(self, state):
+        return self._get(os.path.join(self.root, state, f"loop{CLIP_EXT}"))
+
+    def close(self):
+        for clip in self._open.values():
+            clip.close()
+        self._open.clear()
+
+
+# ================= PLAYBACK ================= #
+
+class ClipPlayer:
+    """
+    Streams clips to an adafruit-style device (raw RGB565 _block writes) on
+    one long-lived worker thread. play() preempts whatever is playing.
+    """
+    def __init__(self, device):
+        self.device = device
+        self.playing = False
+        self._cond = threading.Condition()
+        self._request = None
+        self._generation = 0
+        self._writing = False
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="eyes-clips")
+        self._thread.start()
+
+    def play(self, clip, loop=False, on_done=None):
+        """
+        Start streaming a clip.
+
+        Args:
+            clip: Clip to play
+            loop: Repeat until preempted or stopped
+            on_done: Called on the player thread once a non-looping clip has
+                     been fully sent (not called when it was preempted)
+        """
+        with self._cond:
+            self._generation += 1
+            self._request = (self._generation, clip, loop, on_done)
+            self.playing = True
+            self._cond.notify_all()
+
+    def stop(self):
+        """Stop playback; returns once the device is no longer being written"""
+        with self._cond:
+            self._generation += 1
+            self._request = None
+            self.playing = False
+            self._cond.notify_all()
+            if threading.current_thread() is not self._thread:
+                while self._writing:
+                    self._cond.wait()
+
+    def _push(self, clip, box, pixels):
+        rotation = getattr(self.device, "rotation", 0) or 0
+        x, y = panel_origin(box, rotation, clip.width, clip.height)
+        if rotation:
+            pixels = np.rot90(pixels, rotation // 90)
+        h, w = pixels.shape
+        self.device._block(x, y, x + w - 1, y + h - 1, np.ascontiguousarray(pixels).tobytes())
+
+    def _stream(self, generation, clip, loop):
+        """Send frames on a fixed-period deadline; True if the clip ran to the end"""
+        period = 1.0 / clip.fps
+        deadline = time.monotonic()
+        while True:
+            for i in range(len(clip)):
+                if generation != self._generation:
+                    return False
+                for box, pixels in clip.rects(i):
+                    self._push(clip, box, pixels)
+                deadline += period
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    deadline = time.monotonic()  # Running late: don't burst
+            if not loop:
+                return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                generation, clip, loop, on_done = self._request
+                self._request = None
+                self._writing = True
+
+            finished = False
+            try:
+                finished = self._stream(generation, clip, loop)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    finished = finished and generation == self._generation
+                    if finished:
+                        self.playing = False
+                    self._cond.notify_all()
+
+            if finished and on_done:
+                on_done()
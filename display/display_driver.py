@@ -1,27 +1,122 @@
-import digitalio
-import board
-from adafruit_rgb_display import st7735
+import os
+import threading
+import time
 
+import numpy as np
+from PIL import Image
+
+
+class MemoryDisplay:
+    """
+    Headless stand-in for the ST7735 driver.
+
+    Speaks the same interface RoboEyes uses on adafruit devices (image() with
+    x/y windows and raw RGB565 _block() writes) and counts what it was sent.
+    With keep_frame=True it also keeps the panel contents, so renders can be
+    inspected or saved on an ordinary Linux box. With spi_hz set, every write
+    also blocks for as long as the transfer would take on a bus of that
+    speed (releasing the GIL, like a real SPI ioctl). Devices given the same
+    bus_lock model panels sharing one bus and DC line (transfers serialize).
+    """
+    def __init__(self, width=240, height=240, rotation=90, keep_frame=True, spi_hz=None, bus_lock=None):
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+        self.keep_frame = keep_frame
+        self.spi_hz = spi_hz
+        self.bus_lock = bus_lock
+        self.frame = Image.new("RGB", (width, height), "black") if keep_frame else None
+
+        self.writes = 0
+        self.pixels = 0
+
+    def image(self, img, rotation=None, x=0, y=0):
+        if rotation is None:
+            rotation = self.rotation
+        if rotation:
+            img = img.rotate(rotation, expand=True)
+        self.writes += 1
+        self.pixels += img.width * img.height
+        self._transfer(img.width * img.height)
+        if self.keep_frame:
+            self.frame.paste(img, (x, y))
+
+    def _block(self, x0, y0, x1, y1, data=None):
+        w, h = x1 - x0 + 1, y1 - y0 + 1
+        self.writes += 1
+        self.pixels += w * h
+        self._transfer(w * h)
+        if self.keep_frame and data is not None:
+            px = np.frombuffer(data, dtype=">u2").reshape(h, w).astype(np.uint16)
+            rgb = np.stack(((px >> 8) & 0xF8, (px >> 3) & 0xFC, (px << 3) & 0xF8), axis=-1)
+            self.frame.paste(Image.fromarray(rgb.astype(np.uint8), "RGB"), (x0, y0))
+
+    def _transfer(self, pixels):
+        if self.spi_hz:
+            time.sleep(pixels * 16 / self.spi_hz)
+
+    def display(self, img):
+        self.image(img, rotation=0)
+
+    @property
+    def bytes_sent(self):
+        """SPI payload in bytes (RGB565 = 2 bytes per pixel)"""
+        return self.pixels * 2
+
+
+def init_display(backend=None, panels=1):
+    """
+    Create the display device.
+
+    Args:
+        backend: "st7735" (default) for the SPI panel, or "memory" for a
+                 headless in-memory device. Falls back to the STELLA_DISPLAY
+                 environment variable when not given.
+        panels: 1 for a single panel, or 2 for one panel per eye (returns a
+                [left, right] list; the right panel sits on CE1)
+
+    Both panels share one SPI bus and one DC line, and the adafruit driver
+    toggles DC outside its SPI lock, so each device gets the same
+    `bus_lock`: writes to the two panels must never overlap. The headless
+    devices get one shared lock too, so they take the same code path.
+    """
+    backend = backend or os.getenv("STELLA_DISPLAY", "st7735")
+    bus_lock = threading.Lock()
+    if backend in ("memory", "null"):
+        if panels > 1:
+            return [MemoryDisplay(bus_lock=bus_lock) for _ in range(panels)]
+        return MemoryDisplay(bus_lock=bus_lock)
+
+    # Hardware libraries are only needed for the real panel
+    import digitalio
+    import board
+    from adafruit_rgb_display import st7735
 
-def init_display():
     spi = board.SPI()
 
-    cs = digitalio.DigitalInOut(board.CE0)
     dc = digitalio.DigitalInOut(board.D25)
     rst = digitalio.DigitalInOut(board.D27)
 
-    # Offsets align the active area so the first column isn't a stray blue line
-    disp = st7735.ST7735R(
-        spi,
-        cs=cs,
-        dc=dc,
-        rst=rst,
-        width=240,
-        height=240,
-        rotation=90,
-        x_offset=0,
-        y_offset=0,
-        bgr=True
-    )
-
-    return disp
\ No newline at end of file
+    displays = []
+    for cs_pin in (board.CE0, board.CE1)[:panels]:
+        cs = digitalio.DigitalInOut(cs_pin)
+
+        # Offsets align the active area so the first column isn't a stray blue line
+        disp = st7735.ST7735R(
+            spi,
+            cs=cs,
+            dc=dc,
+            rst=rst,
+            width=240,
+            height=240,
+            rotation=90,
+            x_offset=0,
+            y_offset=0,
+            bgr=True
+        )
+        disp.bus_lock = bus_lock
+        displays.append(disp)
+        # Shared reset line: only pulse it when bringing up the first panel
+        rst = None
+
+    return displays if panels > 1 else displays[0]
@@ -0,0 +1,82 @@
+"""
+Stella Nurse - Expression Targets
+Physical spring targets for every named eye state, shared by the render
+engine and the keyframe timeline compiler.
+"""
+
+import numpy as np
+
+# Target channels in SpringBank order (color is expanded to r, g, b)
+CHANNELS = ("x", "y", "width", "height", "angle", "upper_lid", "lower_lid", "r", "g", "b")
+
+# ================= EXPRESSIONS ================= #
+# Physical targets per state. Anything a state doesn't list uses the default;
+# unknown state names fall back to the defaults entirely.
+DEFAULT_TARGETS = {
+    "x": 0.0, "y": 0.0,             # Position
+    "width": 1.0, "height": 1.0,    # Scale
+    "angle": 0.0,                   # Rotation (radians)
+    "upper_lid": 0.0,               # Eyelids (0.0 = open, 1.0 = fully closed)
+    "lower_lid": 0.0,
+    "color": (255, 255, 255),       # Default White
+}
+
+STATE_TARGETS = {
+    "idle": {},
+    "happy": {
+        "y": -5, "width": 1.1, "height": 0.9,
+        "lower_lid": 0.55,  # Push lower lid up significantly (cheek smile)
+    },
+    "sad": {
+        "y": 10, "width": 0.95, "height": 0.9,
+        "upper_lid": 0.5,   # Droop upper lid
+        "angle": 0.1,       # Slight droop tilt outer
+        "color": (0, 100, 255),
+    },
+    "angry": {
+        "y": -5, "height": 0.8,
+        "upper_lid": 0.65,  # Heavy upper browser
+        "angle": -0.25,     # Inward tilt
+        "color": (255, 30, 30),
+    },
+    "surprised": {
+        "y": -5, "width": 1.25, "height": 1.3,
+        "upper_lid": -0.1, "lower_lid": -0.1,  # Widen eyes beyond normal
+    },
+    "sleepy": {
+        "y": 10, "height": 0.8,
+        "upper_lid": 0.75,  # Heavy drooping
+        "color": (0, 120, 180),
+    },
+    "curious": {
+        "y": -5, "width": 1.1,
+        "upper_lid": 0.1,
+        "angle": 0.05,
+    },
+    "suspicious": {
+        "y": 0, "height": 0.6,
+        "upper_lid": 0.4, "lower_lid": 0.4,
+        "color": (255, 200, 0),
+    },
+    "excited": {
+        "y": -8, "width": 1.2, "height": 1.2,
+        "upper_lid": -0.05, "lower_lid": 0.1,  # Wide but active
+    },
+    "love": {  # Handle heart in render separately usually, but here we prep
+        "width": 1.1, "height": 1.1,
+        "color": (255, 50, 150),
+    },
+}
+
+
+def target_vector(state, overrides=None):
+    """
+    Resolve a state (plus optional per-channel overrides) into a target
+    vector ordered like CHANNELS.
+    """
+    targets = dict(DEFAULT_TARGETS)
+    targets.update(STATE_TARGETS.get(state, {}))
+    if overrides:
+        targets.update(overrides)
+    r, g, b = targets["color"]
+    return np.array([targets[name] for name in CHANNELS[:7]] + [r, g, b], dtype=np.float64)
@@ -3,11 +3,17 @@ Stella Nurse - Eye Animation Controller
 Easy API for controlling robot emotions from any module
 """
 
+import os
+import threading
 import time  # Add this import
 
 
 from eyes import RoboEyes
 from display_driver import init_display
+from timeline import Timeline
+from clips import ClipLibrary, ClipPlayer
+
+DEFAULT_CLIP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "faces")
 
 
 class EyeController:
@@ -16,20 +22,28 @@ class EyeController:
     Use this in your main robot code for easy emotion control.
     """
     
-    def __init__(self, fps=60, auto_start=True):
+    def __init__(self, fps=60, auto_start=True, panels=1):
         """
         Initialize the eye controller.
         
         Args:
             fps: Frames per second (60 recommended for smooth Cozmo-style animation)
             auto_start: If True, starts the animation loop immediately
+            panels: 1 for both eyes on one display, 2 for one display per eye
         """
-        self.display = init_display()
+        self.display = init_display(panels=panels)
         self.eyes = RoboEyes(
             device=self.display,
             fps=fps,
             display_type="adafruit"
         )
+        self._sequences = {}
+
+        # Pre-baked clips (see use_baked_clips)
+        self._clips = None
+        self._clip_player = None
+        self._clip_state = None  # State the playing clip ends in
+        self._clip_lock = threading.Lock()
         
         if auto_start:
             self.eyes.start()
@@ -38,67 +52,67 @@ class EyeController:
     
     def idle(self):
         """Default resting state with gentle wandering"""
-        self.eyes.set_state("idle")
+        self.set_emotion("idle")
     
     def happy(self):
         """Joyful, bouncing expression"""
-        self.eyes.set_state("happy")
+        self.set_emotion("happy")
     
     def sad(self):
         """Droopy, downward-looking expression"""
-        self.eyes.set_state("sad")
+        self.set_emotion("sad")
     
     def angry(self):
         """Intense, narrowed eyes"""
-        self.eyes.set_state("angry")
+        self.set_emotion("angry")
     
     def surprised(self):
         """Wide-eyed shock with visible pupils"""
-        self.eyes.set_state("surprised")
+        self.set_emotion("surprised")
     
     def curious(self):
         """Inquisitive head-tilt look with pupils"""
-        self.eyes.set_state("curious")
+        self.set_emotion("curious")
     
     def thinking(self):
         """Contemplative, eyes drifting to the side"""
-        self.eyes.set_state("thinking")
+        self.set_emotion("thinking")
     
     def listening(self):
         """Attentive, focused upward"""
-        self.eyes.set_state("listening")
+        self.set_emotion("listening")
     
     def speaking(self):
         """Gentle bobbing while talking"""
-        self.eyes.set_state("speaking")
+        self.set_emotion("speaking")
     
     def alert(self):
         """Wide, focused, intense attention"""
-        self.eyes.set_state("alert")
+        self.set_emotion("alert")
     
     def concerned(self):
         """Worried, wobbling expression"""
-        self.eyes.set_state("concerned")
+        self.set_emotion("concerned")
     
     def sleepy(self):
         """Drowsy, droopy with slow blinks"""
-        self.eyes.set_state("sleepy")
+        self.set_emotion("sleepy")
     
     def excited(self):
         """Energetic, bouncy, wiggling"""
-        self.eyes.set_state("excited")
+        self.set_emotion("excited")
     
     def love(self):
         """Affectionate, warm, pulsing"""
-        self.eyes.set_state("love")
+        self.set_emotion("love")
     
     def focused(self):
         """Alert, attentive, slightly narrowed"""
-        self.eyes.set_state("focused")
+        self.set_emotion("focused")
 
     def suspicious(self):
         """Squinting, suspicious look"""
-        self.eyes.set_state("suspicious")
+        self.set_emotion("suspicious")
     
     # ===== Utility Methods ===== #
     
@@ -111,15 +125,76 @@ class EyeController:
                     thinking, listening, speaking, alert, concerned, 
                     sleepy, excited, love, focused
         """
-        self.eyes.set_state(emotion)
+        with self._clip_lock:
+            clip = None
+            if self._clips is not None:
+                current = self._clip_state or self.eyes.state
+                clip = self._clips.transition(current, emotion)
+
+            if clip is None:
+                self._release_display()
+                self.eyes.set_state(emotion)
+                return
+
+            # Hand the panel to the clip player; the engine sleeps meanwhile
+            self._clip_state = emotion
+            self.eyes.pause()
+            self._clip_player.play(clip, on_done=lambda: self._clip_finished(emotion))
+
+    def use_baked_clips(self, root=None, enable=True):
+        """
+        Play pre-baked transition / idle-loop clips instead of rendering
+        when they exist for a state change (see bake_clips.py). Frees the
+        CPU while the face moves between expressions.
+
+        Args:
+            root: Clip directory (default: assets/faces)
+            enable: False to go back to fully procedural animation
+        """
+        if enable and self.eyes.multi_panel:
+            raise ValueError("Baked clips are single-panel only")
+        with self._clip_lock:
+            if not enable:
+                self._release_display()
+                self._clips = None
+                return
+            self._clips = ClipLibrary(root or DEFAULT_CLIP_DIR)
+            if self._clip_player is None:
+                self._clip_player = ClipPlayer(self.display)
+
+    def _clip_finished(self, emotion):
+        """Transition clip done: loop the baked idle clip, or hand back to the engine"""
+        with self._clip_lock:
+            if self._clip_state != emotion or self._clip_player.playing:
+                return  # Superseded
+            loop = self._clips.loop(emotion) if self._clips else None
+            if loop is not None:
+                self._clip_player.play(loop, loop=True)
+            else:
+                self._release_display()
+
+    def _release_display(self):
+        """Stop any clip and resume rendering from the pose it ended on (lock held)"""
+        if self._clip_state is None:
+            return
+        self._clip_player.stop()
+        self.eyes.snap_state(self._clip_state)
+        self.eyes.breathing_phase = 0.0  # Baked clips end at the neutral breath
+        self._clip_state = None
+        self.eyes.resume()
     
-    def express_sequence(self, emotions: list, durations: list):
+    def express_sequence(self, emotions: list, durations: list, easing: str = "step"):
         """
         Play a sequence of emotions with timing for complex expressions.
+        Runs inside the render loop; starting another sequence (or calling
+        any emotion method) cancels the one that is playing.
         
         Args:
             emotions: List of emotion names
             durations: List of duration in seconds for each emotion
+            easing: How targets move between emotions: "step" (default,
+                    like set_state), "linear", "ease_in", "ease_out",
+                    "ease_in_out"
             
         Example:
             eyes.express_sequence(
@@ -127,14 +202,19 @@ class EyeController:
                 [0.5, 1.0, 2.0]
             )
         """
-        import threading
-        
-        def play():
-            for emotion, duration in zip(emotions, durations):
-                self.eyes.set_state(emotion)
-                time.sleep(duration)
-        
-        threading.Thread(target=play, daemon=True).start()
+        with self._clip_lock:
+            self._release_display()
+        key = (tuple(emotions), tuple(durations), easing)
+        timeline = self._sequences.get(key)
+        if timeline is None:
+            # Compile once, replay from cache afterwards
+            timeline = Timeline.from_states(emotions, durations, easing)
+            self._sequences[key] = timeline
+        self.eyes.play_sequence(timeline)
+    
+    def stop_sequence(self):
+        """Cancel the playing sequence, holding the current expression"""
+        self.eyes.stop_sequence()
     
     def enable_micro_movements(self, enable=True):
         """
@@ -165,6 +245,8 @@ class EyeController:
     
     def stop(self):
         """Stop the animation loop"""
+        if self._clip_player:
+            self._clip_player.stop()
         self.eyes.stop()
     
     def start(self):
@@ -1,40 +1,31 @@
+import contextlib
 import time
 import threading
 import random
 import math
+import numpy as np
 from PIL import Image, ImageDraw
 
-class SpringScalar:
-    """
-    Spring physics solver for a single scalar value.
-    Simulates a damped harmonic oscillator for organic movement.
-    """
-    def __init__(self, value, stiffness=120.0, damping=14.0, mass=1.0):
-        self.value = value
-        self.target = value
-        self.velocity = 0.0
-        self.stiffness = stiffness  # Higher = tighter/faster spring
-        self.damping = damping      # Higher = less oscillation/friction
-        self.mass = mass            # Higher = heavier/slower
-
-    def update(self, dt):
-        # F = -kx - cv
-        force = (self.target - self.value) * self.stiffness
-        force -= self.velocity * self.damping
-        
-        accel = force / self.mass
-        self.velocity += accel * dt
-        self.value += self.velocity * dt
-        
-        return self.value
-
-    def set_target(self, target):
-        self.target = target
-
-    def snap_to(self, value):
-        self.value = value
-        self.target = value
-        self.velocity = 0.0
+try:
+    from frame_diff import FrameDiff, panel_origin
+    from sprite_cache import EyeSprite, SpriteCache
+    from springs import SpringBank
+    from frame_pipeline import FramePipeline, FrameStats
+    from frame_scheduler import FrameScheduler
+    from rgb565 import RGB565Renderer, to_image
+    from expressions import target_vector
+    from timeline import Timeline, TimelinePlayer
+    from panel_group import PanelGroup
+except ImportError:
+    from display.frame_diff import FrameDiff, panel_origin
+    from display.sprite_cache import EyeSprite, SpriteCache
+    from display.springs import SpringBank
+    from display.frame_pipeline import FramePipeline, FrameStats
+    from display.frame_scheduler import FrameScheduler
+    from display.rgb565 import RGB565Renderer, to_image
+    from display.expressions import target_vector
+    from display.timeline import Timeline, TimelinePlayer
+    from display.panel_group import PanelGroup
 
 class RoboEyes:
     def __init__(
@@ -46,47 +37,111 @@ class RoboEyes:
         eye_size=46,
         eye_spacing=58,
         display_type="adafruit",
+        idle_fps=15,
+        partial_updates=True,
+        pipelined=True,
+        backend="pil",
     ):
-        self.device = device
+        # One device for both eyes, or [left, right] for one panel per eye
+        # (each panel then gets its own width x height frame)
+        self.devices = list(device) if isinstance(device, (list, tuple)) else [device]
+        if len(self.devices) > 2:
+            raise ValueError("Multi-panel mode drives one panel per eye (2 devices)")
+        self.device = self.devices[0]
+        self.multi_panel = len(self.devices) == 2
         self.display_type = display_type
 
+        # Only push changed screen regions over SPI (adafruit devices only)
+        self.partial_updates = partial_updates
+        self._frame_diffs = [FrameDiff(width, height) for _ in self.devices]
+        self._frame_diff = self._frame_diffs[0]
+
+        # Per-eye panels are pushed in parallel
+        self._panels = PanelGroup(len(self.devices), self._present_panel) if self.multi_panel else None
+        self._panel_buffers = None
+
+        # Render and SPI transmit on separate threads (double-buffered)
+        self.pipelined = pipelined
+        self._pipeline = None
+        self.frame_stats = FrameStats()
+
         self.width = width
         self.height = height
         self.fps = fps
         self.dt = 1.0 / fps
 
+        # Drops to idle_fps once everything has settled, back to fps on change
+        self.scheduler = FrameScheduler(fps=fps, idle_fps=idle_fps)
+        self.settle_epsilon = 0.01
+
         # Eye geometry
         self.eye_size = eye_size
         self.eye_spacing = eye_spacing
         self.corner_radius = 18
+
+        # Pre-rendered eye sprites keyed by quantized geometry
+        self.sprite_cache = SpriteCache()
+        self.sprite_angle_step = 0.01 # radians per rotation bucket
+
+        # Render backend: "pil" (RGB images) or "rgb565" (NumPy framebuffer
+        # in the panel's native format, written to SPI as raw bytes)
+        if backend not in ("pil", "rgb565"):
+            raise ValueError(f"Unknown render backend: {backend}")
+        self.backend = backend
+        self._rgb565 = None
+        if backend == "rgb565":
+            self._rgb565 = RGB565Renderer(width, height, self.corner_radius, self._build_eye_sprite)
         
         self.center_y = height // 2
-        self.left_eye_x_base = (width // 2) - eye_spacing // 2
-        self.right_eye_x_base = (width // 2) + eye_spacing // 2
+        if self.multi_panel:
+            # Each eye sits in the middle of its own panel
+            self.left_eye_x_base = self.right_eye_x_base = width // 2
+        else:
+            self.left_eye_x_base = (width // 2) - eye_spacing // 2
+            self.right_eye_x_base = (width // 2) + eye_spacing // 2
 
         # ================= PHYSICS ENGINE (SPRINGS) ================= #
         # Stiffness 120, Damping 12 is a good "snappy but bouncy" feel
         spring_config = {'stiffness': 180.0, 'damping': 12.0, 'mass': 1.0}
         smooth_config = {'stiffness': 100.0, 'damping': 10.0, 'mass': 1.2}
-        
-        # Position
-        self.spring_x = SpringScalar(0.0, **spring_config)
-        self.spring_y = SpringScalar(0.0, **spring_config)
-        
-        # Scale (Width/Height)
-        self.spring_width = SpringScalar(1.0, **spring_config)
-        self.spring_height = SpringScalar(1.0, **spring_config)
-        
-        # Rotation
-        self.spring_angle = SpringScalar(0.0, **smooth_config)
-        
-        # Eyelids (0.0 = open, 1.0 = fully closed)
-        self.spring_upper_lid = SpringScalar(0.0, **spring_config)
-        self.spring_lower_lid = SpringScalar(0.0, **spring_config)
-        
-        # Color (RGB)
-        self.current_color = [255, 255, 255]
-        self.target_color = [255, 255, 255]
+        # Critically damped (w = 10 rad/s) so colors fade without overshoot
+        color_config = {'stiffness': 100.0, 'damping': 20.0, 'mass': 1.0}
+
+        # All channels are stepped together in one vectorized call
+        # (same order as expressions.CHANNELS)
+        self.springs = SpringBank([
+            # Position
+            ("x", 0.0, spring_config),
+            ("y", 0.0, spring_config),
+            # Scale (Width/Height)
+            ("width", 1.0, spring_config),
+            ("height", 1.0, spring_config),
+            # Rotation
+            ("angle", 0.0, smooth_config),
+            # Eyelids (0.0 = open, 1.0 = fully closed)
+            ("upper_lid", 0.0, spring_config),
+            ("lower_lid", 0.0, spring_config),
+            # Color (RGB)
+            ("r", 255.0, color_config),
+            ("g", 255.0, color_config),
+            ("b", 255.0, color_config),
+        ])
+        self._color_slice = self.springs.slice(("r", "g", "b"))
+
+        self.spring_x = self.springs.channel("x")
+        self.spring_y = self.springs.channel("y")
+        self.spring_width = self.springs.channel("width")
+        self.spring_height = self.springs.channel("height")
+        self.spring_angle = self.springs.channel("angle")
+        self.spring_upper_lid = self.springs.channel("upper_lid")
+        self.spring_lower_lid = self.springs.channel("lower_lid")
+
+        # Longest frame time fed to the physics (e.g. after a stall)
+        self.max_frame_dt = 0.25
+
+        # Clock for blinks / glances / jitter (swapped for a simulated clock
+        # when baking clips offline)
+        self.clock = time.monotonic
 
         # ================= ANIMATION PARAMS ================= #
         self.micro_movement_enabled = True
@@ -94,138 +149,179 @@ class RoboEyes:
         self.breathing_phase = 0.0
         
         self.noise_seed = random.random() * 1000
-        self.last_idle_move = time.time()
+        self.last_idle_move = self.clock()
 
         # Blink system
-        self.next_blink_time = time.time() + random.uniform(2.0, 5.0)
+        self.next_blink_time = self.clock() + random.uniform(2.0, 5.0)
         self.is_blinking = False
         self.blink_duration = 0.15 # seconds
         self.blink_start_time = 0
 
         # State
         self.state = "idle"
+        self._player = None # Active keyframe timeline, if any
         self.running = False
+        self.paused = False # Display handed over to a baked clip
         self._lock = threading.Lock()
+        self._device_lock = threading.Lock()
 
     # ================= PUBLIC API ================= #
 
     def set_state(self, state):
         with self._lock:
+            self._player = None # An explicit state preempts any sequence
             self.state = state
             self._apply_state_targets(state)
+        self.scheduler.wake()
+
+    def play_sequence(self, timeline):
+        """
+        Play a keyframe sequence on the render clock, preempting whatever
+        sequence is currently playing.
+
+        Args:
+            timeline: A compiled Timeline, or a list of Keyframes
+        """
+        if not isinstance(timeline, Timeline):
+            timeline = Timeline(timeline)
+        with self._lock:
+            self._player = TimelinePlayer(timeline)
+        self.scheduler.wake()
+
+    def stop_sequence(self):
+        """Stop the current sequence, holding the pose it reached"""
+        with self._lock:
+            self._player = None
+
+    @property
+    def sequence_playing(self):
+        return self._player is not None
+
+    def snap_state(self, state):
+        """Jump straight to a state's settled pose (no spring animation)"""
+        with self._lock:
+            self._player = None
+            self.state = state
+            self._apply_state_targets(state)
+            self.springs.value[0] = self.springs.target[0]
+            self.springs.velocity[0] = 0.0
+        self.scheduler.wake()
+
+    def pause(self):
+        """
+        Stop rendering and release the display (e.g. to a ClipPlayer).
+        Returns once no frame is being sent any more.
+        """
+        if self._pipeline:
+            self._pipeline.pause()
+        with self._device_lock:
+            self.paused = True
+
+    def resume(self):
+        """Take the display back; the next frame is pushed in full"""
+        for diff in self._frame_diffs:
+            diff.reset()
+        self.paused = False
+        if self._pipeline:
+            self._pipeline.resume()
+        self.scheduler.wake()
 
     def start(self):
         self.running = True
-        threading.Thread(target=self._loop, daemon=True).start()
+        if self.pipelined:
+            self._pipeline = FramePipeline(
+                render=lambda dt, buf: self._render(dt, buf),
+                present=self._present,
+                make_buffer=self._new_frame_buffer,
+                scheduler=self.scheduler,
+                next_event=self._next_event_time,
+                max_frame_dt=self.max_frame_dt,
+                stats=self.frame_stats,
+            )
+            self._pipeline.start()
+        else:
+            threading.Thread(target=self._loop, daemon=True).start()
 
     def stop(self):
         self.running = False
+        self.scheduler.wake()
+        if self._pipeline:
+            self._pipeline.stop()
+            self._pipeline = None
+
+    def _new_frame_buffer(self):
+        """One frame buffer, or a [left, right] pair in multi-panel mode"""
+        if self.multi_panel:
+            return [self._new_panel_buffer() for _ in self.devices]
+        return self._new_panel_buffer()
+
+    def _new_panel_buffer(self):
+        if self._rgb565:
+            return self._rgb565.new_buffer()
+        return Image.new("RGB", (self.width, self.height), "black")
+
+    def _clear(self, img):
+        if self._rgb565:
+            self._rgb565.clear(img)
+        else:
+            img.paste((0, 0, 0), (0, 0, self.width, self.height))
+
+    def stats(self):
+        """
+        Frame timings: render vs. transmit time in milliseconds, pacing mode,
+        achieved FPS and CPU time per frame.
+        """
+        stats = self.frame_stats.snapshot()
+        stats.update(self.scheduler.snapshot())
+        if self._panels:
+            stats["panels"] = self._panels.stats()
+        return stats
 
     # ================= LOGIC ================= #
 
     def _apply_state_targets(self, state):
         """Map state names to physical target parameters"""
-        # Defaults
-        tx, ty = 0.0, 0.0
-        tw, th = 1.0, 1.0
-        tang = 0.0
-        tul, tll = 0.0, 0.0 # Upper lid, Lower lid
-        col = (255, 255, 255) # Default White
-
-        if state == "idle":
-            col = (255, 255, 255)
-            
-        elif state == "happy":
-            ty = -5
-            tw, th = 1.1, 0.9
-            tll = 0.55  # Push lower lid up significantly (cheek smile)
-            col = (255, 255, 255)
-            
-        elif state == "sad":
-            ty = 10
-            tw, th = 0.95, 0.9
-            tul = 0.5  # Droop upper lid
-            tang = 0.1 # Slight droop tilt outer
-            col = (0, 100, 255)
-            
-        elif state == "angry":
-            ty = -5
-            th = 0.8
-            tul = 0.65 # Heavy upper browser
-            tang = -0.25 # Inward tilt
-            col = (255, 30, 30)
-            
-        elif state == "surprised":
-            ty = -5
-            tw, th = 1.25, 1.3
-            tul, tll = -0.1, -0.1 # Widen eyes beyond normal
-            col = (255, 255, 255)
-            
-        elif state == "sleepy":
-            ty = 10
-            tul = 0.75 # Heavy drooping
-            th = 0.8
-            col = (0, 120, 180)
-            
-        elif state == "curious":
-            ty = -5
-            tw = 1.1
-            tul = 0.1
-            tang = 0.05
-            col = (255, 255, 255)
-            
-        elif state == "suspicious": # New state
-            ty = 0
-            th = 0.6
-            tul = 0.4
-            tll = 0.4
-            col = (255, 200, 0)
-            
-        elif state == "excited":
-            ty = -8
-            tw, th = 1.2, 1.2
-            tul, tll = -0.05, 0.1 # Wide but active
-            col = (255, 255, 255)
-            
-        elif state == "love": # Handle heart in render separately usually, but here we prep
-            tw, th = 1.1, 1.1
-            col = (255, 50, 150)
-        
-        # Apply targets
-        self.spring_x.set_target(tx)
-        self.spring_y.set_target(ty)
-        self.spring_width.set_target(tw)
-        self.spring_height.set_target(th)
-        self.spring_angle.set_target(tang)
-        self.spring_upper_lid.set_target(tul)
-        self.spring_lower_lid.set_target(tll)
-        self.target_color = list(col)
-
-    def _update_physics(self):
-        dt = self.dt
-        
-        # Step springs
-        self.spring_x.update(dt)
-        self.spring_y.update(dt)
-        self.spring_width.update(dt)
-        self.spring_height.update(dt)
-        self.spring_angle.update(dt)
-        self.spring_upper_lid.update(dt)
-        self.spring_lower_lid.update(dt)
-
-        # Smooth color transition
-        for i in range(3):
-            self.current_color[i] += (self.target_color[i] - self.current_color[i]) * 10.0 * dt
-
-    def _update_behaviors(self):
+        self.springs.target[0] = target_vector(state)
+
+    @property
+    def current_color(self):
+        return [float(c) for c in self.springs.value[0, self._color_slice]]
+
+    @property
+    def target_color(self):
+        return [float(c) for c in self.springs.target[0, self._color_slice]]
+
+    @target_color.setter
+    def target_color(self, color):
+        self.springs.target[0, self._color_slice] = color
+
+    def _update_physics(self, dt):
+        # Step all springs (shape, lids and color) at once
+        self.springs.step(dt)
+
+    def _update_timeline(self, dt):
+        """Advance the active sequence: one table lookup per frame"""
+        with self._lock:
+            player = self._player
+            if player is None:
+                return
+            targets, state, finished = player.advance(dt)
+            self.state = state
+            if targets is not None:
+                self.springs.target[0] = targets
+            if finished:
+                self._player = None
+
+    def _update_behaviors(self, dt):
         """High level behaviors like blinking, breathing, idle movements"""
-        t = time.time()
+        t = self.clock()
         
         # 1. Blinking (Independent of state, effectively modulates upper lid)
         if t > self.next_blink_time and not self.is_blinking:
             self.is_blinking = True
             self.blink_start_time = t
             self.blink_duration = random.uniform(0.12, 0.18)
+            self.scheduler.wake()
             
         # Calc blink offset
         blink_lid_offset = 0.0
@@ -251,12 +347,13 @@ class RoboEyes:
                 tgt_y = random.uniform(-8, 8)
                 self.spring_x.set_target(tgt_x)
                 self.spring_y.set_target(tgt_y)
+                self.scheduler.wake()
                 self.last_idle_move = t + random.uniform(0.0, 1.0) # slight random delay
 
         # 3. Breathing (Oscillation of size)
         breath_scale = 1.0
         if self.breathing_enabled:
-            self.breathing_phase += 3.0 * self.dt # speed
+            self.breathing_phase += 3.0 * dt # speed
             breath_scale = 1.0 + math.sin(self.breathing_phase) * 0.025
             
         # 4. Micro-movements (Jitter)
@@ -269,11 +366,27 @@ class RoboEyes:
 
         return blink_lid_offset, breath_scale, jitter_x, jitter_y
 
-    def _render(self):
-        blink_offset, breath_scale, jitter_x, jitter_y = self._update_behaviors()
-        self._update_physics()
-
-        img = Image.new("RGB", (self.width, self.height), "black")
+    def _render(self, dt=None, img=None):
+        """Advance one frame and draw it (into img when a buffer is supplied)"""
+        if dt is None:
+            dt = self.dt
+        self._update_timeline(dt)
+        blink_offset, breath_scale, jitter_x, jitter_y = self._update_behaviors(dt)
+        self._update_physics(dt)
+
+        if self.multi_panel:
+            if img is None:
+                if self._panel_buffers is None:
+                    self._panel_buffers = self._new_frame_buffer()
+                img = self._panel_buffers
+            for buf in img:
+                self._clear(buf)
+            left_img, right_img = img
+        else:
+            if img is None:
+                img = self._rgb565.buffer if self._rgb565 else self._new_panel_buffer()
+            self._clear(img)
+            left_img = right_img = img
         
         # Resolve final render values
         val_x = self.spring_x.value + jitter_x
@@ -286,17 +399,18 @@ class RoboEyes:
         val_ul = max(0.0, min(1.0, self.spring_upper_lid.value + blink_offset))
         val_ll = max(0.0, min(1.0, self.spring_lower_lid.value)) # Lower lid doesn't blink usually
 
-        col = tuple(int(c) for c in self.current_color)
+        col = tuple(int(min(255.0, max(0.0, c))) for c in self.current_color)
 
         # Draw eyes
-        self._draw_eye(img, self.left_eye_x_base, val_x, val_y, val_w, val_h, val_rot, val_ul, val_ll, col, is_left=True)
-        self._draw_eye(img, self.right_eye_x_base, val_x, val_y, val_w, val_h, val_rot, val_ul, val_ll, col, is_left=False)
+        self._draw_eye(left_img, self.left_eye_x_base, val_x, val_y, val_w, val_h, val_rot, val_ul, val_ll, col, is_left=True)
+        self._draw_eye(right_img, self.right_eye_x_base, val_x, val_y, val_w, val_h, val_rot, val_ul, val_ll, col, is_left=False)
+
+        # Nothing left to animate -> let the scheduler throttle
+        self.scheduler.set_idle(self._is_settled())
 
         return img
 
     def _draw_eye(self, img, base_x, off_x, off_y, scale_w, scale_h, rot, upper_lid, lower_lid, color, is_left):
-        draw = ImageDraw.Draw(img)
-        
         # Calculate depth perspective
         # If looking right (off_x > 0), right eye gets bigger, left gets smaller
         # Max shift is ~20px
@@ -319,98 +433,180 @@ class RoboEyes:
         y0 = cy - h/2
         x1 = cx + w/2
         y1 = cy + h/2
-        
-        # 1. Simple Axis Aligned (Fast Path)
+
+        # Quantize geometry to whole pixels / small angle steps so steady
+        # expressions map onto the same cached sprite every frame
         if abs(rot) < 0.05:
-            # Simple axis aligned
-            # Ensure coordinates are integers for sharper rendering
-            draw.rounded_rectangle([x0, y0, x1, y1], radius=self.corner_radius, fill=color)
-            
-            # Eyelids (Axis aligned)
-            # Expand mask X by 2px each side to ensure coverage
-            mask_x0 = x0 - 2
-            mask_x1 = x1 + 2
+            # Snap edges exactly where the rasterizer would put them
+            ix0, iy0 = int(round(x0)), int(round(y0))
+            ix1, iy1 = int(round(x1)), int(round(y1))
+            upper_px = math.floor(y0 + h * upper_lid) - iy0 if upper_lid > 0.05 else 0
+            lower_px = iy1 - math.floor(y1 - h * lower_lid) if lower_lid > 0.05 else 0
+            key = (ix1 - ix0, iy1 - iy0, 0, upper_px, lower_px)
+            anchor = (ix0, iy0)
+        else:
+            qw, qh = int(round(w)), int(round(h))
+            qrot = int(round(rot / self.sprite_angle_step))
+            upper_px = int(round(qh * upper_lid)) if upper_lid > 0.05 else 0
+            lower_px = int(round(qh * lower_lid)) if lower_lid > 0.05 else 0
+            key = (qw, qh, qrot, upper_px, lower_px)
+            anchor = (int(round(cx)), int(round(cy)))
+
+        if self._rgb565:
+            self._rgb565.draw_eye(img, key, anchor, color)
+            return
+
+        sprite = self.sprite_cache.get(key, lambda: self._build_eye_sprite(*key))
+        sprite.paste(img, anchor[0], anchor[1], color)
+
+    def _build_eye_sprite(self, w, h, qrot, upper_px, lower_px):
+        """Rasterize one eye (shape + eyelid masks) into an alpha sprite"""
+        # 1. Simple Axis Aligned (Fast Path)
+        if qrot == 0:
+            # Pad so the lid masks never clip at the edge; anchor is the eye's top-left
+            pad = 2
+            mask = Image.new("L", (w + 2 * pad + 1, h + 2 * pad + 1), 0)
+            draw = ImageDraw.Draw(mask)
+            x0, y0 = pad, pad
+            x1, y1 = pad + w, pad + h
+            draw.rounded_rectangle([x0, y0, x1, y1], radius=self.corner_radius, fill=255)
             
-            if upper_lid > 0.05:
-                # Cover top portion - extend UPWARDS to ensure top edge is clean coverage
-                lid_h = h * upper_lid
-                coord_y_cut = y0 + lid_h
-                # Mask from way above (y0-10) to cut line
-                draw.rectangle([mask_x0, y0 - 10, mask_x1, coord_y_cut], fill="black")
-                
-            if lower_lid > 0.05:
-                # Cover bottom portion - extend DOWNWARDS
-                lid_h = h * lower_lid
-                coord_y_cut = y1 - lid_h
-                # Mask from cut line to way below (y1+10)
-                draw.rectangle([mask_x0, coord_y_cut, mask_x1, y1 + 10], fill="black")
+            # Eyelids (Axis aligned) - cut out of the alpha mask
+            if upper_px > 0:
+                draw.rectangle([0, 0, mask.width, y0 + upper_px], fill=0)
+            if lower_px > 0:
+                draw.rectangle([0, y1 - lower_px, mask.width, mask.height], fill=0)
+
+            return EyeSprite(mask, pad, pad)
                 
         # 2. Rotated (Quality Path with Rounding)
-        else:
-            # Create a larger canvas to draw the unrotated eye, then rotate it
-            diag_size = int(math.hypot(w, h)) + 20
-            # Ensure even size for center alignment
-            if diag_size % 2 != 0: diag_size += 1
-            
-            # 2a. Draw unrotated eye on temp buffer
-            # Use RGBA for transparency
-            temp_img = Image.new("RGBA", (diag_size, diag_size), (0,0,0,0))
-            temp_draw = ImageDraw.Draw(temp_img)
-            
-            tx = diag_size / 2
-            ty = diag_size / 2
-            
-            # Unrotated coords centered at tx, ty
-            rx0 = tx - w/2
-            ry0 = ty - h/2
-            rx1 = tx + w/2
-            ry1 = ty + h/2
-            
-            # Draw rounded eye
-            temp_draw.rounded_rectangle([rx0, ry0, rx1, ry1], radius=self.corner_radius, fill=color)
-            
-            # Draw eyelids on temp buffer (also unrotated)
-            rmask_x0 = rx0 - 2
-            rmask_x1 = rx1 + 2
-            
-            if upper_lid > 0.05:
-                lid_h = h * upper_lid
-                r_y_cut = ry0 + lid_h
-                temp_draw.rectangle([rmask_x0, ry0 - 10, rmask_x1, r_y_cut], fill="black")
-            
-            if lower_lid > 0.05:
-                lid_h = h * lower_lid
-                r_y_cut = ry1 - lid_h
-                temp_draw.rectangle([rmask_x0, r_y_cut, rmask_x1, ry1 + 10], fill="black")
-            
-            # 2b. Rotate
-            # PIL rotate is counter-clockwise. Positive rot (radians) usually means clockwise movement on screen.
-            # So we rotate by negative degrees.
-            rot_deg = math.degrees(rot)
-            rotated_img = temp_img.rotate(-rot_deg, resample=Image.BICUBIC)
-            
-            # 2c. Paste onto main image
-            # Align centers
-            # cx, cy is center on main img
-            # tx, ty was center on temp img (which is also center of rotated_img)
-            
-            paste_x = int(cx - (diag_size / 2))
-            paste_y = int(cy - (diag_size / 2))
-            
-            # Paste with alpha mask
-            img.paste(rotated_img, (paste_x, paste_y), rotated_img)
+        # Create a larger canvas to draw the unrotated eye, then rotate it
+        diag_size = int(math.hypot(w, h)) + 20
+        # Ensure even size for center alignment
+        if diag_size % 2 != 0: diag_size += 1
+        
+        # 2a. Draw unrotated eye on temp buffer
+        mask = Image.new("L", (diag_size, diag_size), 0)
+        draw = ImageDraw.Draw(mask)
+        
+        tx = diag_size / 2
+        ty = diag_size / 2
+        
+        # Unrotated coords centered at tx, ty
+        rx0 = tx - w/2
+        ry0 = ty - h/2
+        rx1 = tx + w/2
+        ry1 = ty + h/2
+        
+        # Draw rounded eye
+        draw.rounded_rectangle([rx0, ry0, rx1, ry1], radius=self.corner_radius, fill=255)
+        
+        # Draw eyelids on temp buffer (also unrotated)
+        if upper_px > 0:
+            draw.rectangle([0, 0, diag_size, ry0 + upper_px], fill=0)
+        if lower_px > 0:
+            draw.rectangle([0, ry1 - lower_px, diag_size, diag_size], fill=0)
+        
+        # 2b. Rotate
+        # PIL rotate is counter-clockwise. Positive rot (radians) usually means clockwise movement on screen.
+        # So we rotate by negative degrees.
+        rot_deg = math.degrees(qrot * self.sprite_angle_step)
+        rotated = mask.rotate(-rot_deg, resample=Image.BICUBIC)
+        
+        # Rotation is about the canvas center, which is the eye center
+        return EyeSprite(rotated, diag_size // 2, diag_size // 2)
 
 
+    def _present(self, frame):
+        """Send a frame (or a [left, right] pair of panel frames) to the display"""
+        if self._panels:
+            self._panels.present(frame)
+        else:
+            self._present_panel(0, frame)
+
+    def _present_panel(self, index, frame):
+        """Send one panel's frame, pushing only the regions that changed"""
+        device = self.devices[index]
+        if self.display_type != "adafruit":
+            if self._rgb565:
+                frame = to_image(frame)
+            with self._bus(device):
+                device.display(frame)
+            return
+
+        boxes = self._frame_diffs[index].diff(frame) if self.partial_updates else None
+        if boxes is None:
+            # First frame, or most of the screen changed: one full transfer
+            if self._rgb565:
+                self._push_region(frame, (0, 0, self.width, self.height), device)
+            else:
+                with self._bus(device):
+                    device.image(frame)
+            return
+
+        for box in boxes:
+            self._push_region(frame, box, device)
+
+    def _push_region(self, frame, box, device=None):
+        """Write one window of the frame (sets the address window, then sends the block)"""
+        device = device or self.device
+        rotation = getattr(device, "rotation", 0) or 0
+        x, y = panel_origin(box, rotation, self.width, self.height)
+
+        if self._rgb565:
+            # Raw RGB565 bytes straight to the panel, no PIL conversion
+            x0, y0, x1, y1 = box
+            region = frame[y0:y1, x0:x1]
+            if rotation:
+                region = np.rot90(region, rotation // 90)
+            h, w = region.shape
+            data = np.ascontiguousarray(region).tobytes()
+            with self._bus(device):
+                device._block(x, y, x + w - 1, y + h - 1, data)
+            return
+
+        region = frame.crop(box)
+        if rotation:
+            region = region.rotate(rotation, expand=True)
+        with self._bus(device):
+            device.image(region, rotation=0, x=x, y=y)
+
+    @staticmethod
+    def _bus(device):
+        """Held while writing to a panel that shares its SPI bus and DC line with another"""
+        return getattr(device, "bus_lock", None) or contextlib.nullcontext()
+
+    def _is_settled(self):
+        """True when no spring is moving and no blink is in progress"""
+        return (
+            self._player is None
+            and not self.is_blinking
+            and self.springs.settled(self.settle_epsilon)
+        )
+
+    def _next_event_time(self):
+        """Monotonic time of the next scheduled behavior (blink / idle glance)"""
+        t = self.next_blink_time
+        if self.state == "idle" and self.micro_movement_enabled:
+            t = min(t, self.last_idle_move + 2.0)
+        return t
+
     def _loop(self):
+        sched = self.scheduler
+        last_t = time.monotonic()
         while self.running:
-            start_t = time.time()
-            frame = self._render()
-            
-            if self.display_type == "adafruit":
-                self.device.image(frame)
-            else:
-                self.device.display(frame)
-                
-            elapsed = time.time() - start_t
-            sleep_t = max(0, self.dt - elapsed)
-            time.sleep(sleep_t)
+            start_t = sched.begin_frame()
+            dt = min(start_t - last_t, self.max_frame_dt)
+            last_t = start_t
+            with self._device_lock:
+                if not self.paused:
+                    frame = self._render(dt)
+                    render_t = time.monotonic()
+                    self.frame_stats.record("render", render_t - start_t)
+                    self._present(frame)
+                    self.frame_stats.record("transmit", time.monotonic() - render_t)
+                else:
+                    sched.set_idle(True)
+
+            sched.end_frame()
+            sched.wait(self._next_event_time())
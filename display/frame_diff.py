@@ -0,0 +1,98 @@
+"""
+Stella Nurse - Frame Differencing
+Finds the screen regions that changed since the last frame sent to the panel,
+so the render loop can push small SPI windows instead of the whole screen.
+"""
+
+import numpy as np
+
+
+class FrameDiff:
+    """
+    Dirty-rectangle finder for full-screen frames.
+
+    Keeps a copy of the last frame that went out to the display and compares
+    the next one against it. Changed columns are grouped into runs (so the two
+    eyes come out as two boxes instead of one wide box spanning the gap), and
+    each run gets the tightest row range that covers its changes.
+    """
+    def __init__(self, width, height, full_threshold=0.5, merge_gap=8):
+        """
+        Args:
+            width, height: Frame size in pixels
+            full_threshold: Fraction of the screen above which a full push is
+                            cheaper than several windowed writes
+            merge_gap: Column runs closer than this many pixels are merged
+                       into one box (each window costs a few SPI commands)
+        """
+        self.width = width
+        self.height = height
+        self.full_threshold = full_threshold
+        self.merge_gap = merge_gap
+        self._last = None
+
+    def reset(self):
+        """Forget the last frame, forcing the next diff to be a full push"""
+        self._last = None
+
+    def diff(self, frame):
+        """
+        Compare a frame against the last one sent.
+
+        Args:
+            frame: PIL image or NumPy array (HxW or HxWxC)
+
+        Returns:
+            None if the whole frame should be pushed, otherwise a list of
+            (x0, y0, x1, y1) boxes with exclusive x1/y1. An empty list means
+            nothing changed.
+        """
+        arr = np.asarray(frame)
+
+        if self._last is None or self._last.shape != arr.shape:
+            self._last = arr.copy()
+            return None
+
+        changed = arr != self._last
+        if changed.ndim == 3:
+            changed = changed.any(axis=2)
+        np.copyto(self._last, arr)
+
+        cols = np.flatnonzero(changed.any(axis=0))
+        if cols.size == 0:
+            return []
+
+        # Split changed columns into runs separated by clean gaps
+        breaks = np.flatnonzero(np.diff(cols) > self.merge_gap)
+        starts = np.concatenate(([cols[0]], cols[breaks + 1]))
+        ends = np.concatenate((cols[breaks], [cols[-1]])) + 1
+
+        boxes = []
+        area = 0
+        for x0, x1 in zip(starts, ends):
+            rows = np.flatnonzero(changed[:, x0:x1].any(axis=1))
+            y0, y1 = rows[0], rows[-1] + 1
+            boxes.append((int(x0), int(y0), int(x1), int(y1)))
+            area += (x1 - x0) * (y1 - y0)
+
+        if area > self.full_threshold * self.width * self.height:
+            return None
+        return boxes
+
+
+def panel_origin(box, rotation, width, height):
+    """
+    Map the top-left of a frame-space box to panel coordinates.
+
+    The adafruit driver rotates full frames counter-clockwise by the display
+    rotation before writing them at (0, 0); windowed writes need the same
+    transform applied to their position.
+    """
+    x0, y0, x1, y1 = box
+    if rotation == 90:
+        return y0, width - x1
+    if rotation == 180:
+        return width - x1, height - y1
+    if rotation == 270:
+        return height - y1, x0
+    return x0, y0
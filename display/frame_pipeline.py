@@ -0,0 +1,221 @@
+"""
+Stella Nurse - Double-Buffered Frame Pipeline
+A producer thread renders into one of two preallocated frame buffers while a
+consumer thread sends the other one to the display, so SPI transmit time no
+longer adds to render time.
+"""
+
+import threading
+import time
+
+
+class StageTimer:
+    """Running count / mean / max of one pipeline stage, in seconds"""
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class FrameStats:
+    """
+    Per-stage timings for the render loop.
+
+    render:   time spent producing a frame (physics + drawing)
+    transmit: time spent pushing a frame to the device
+    dropped:  frames that were rendered but replaced before being sent
+    """
+    def __init__(self):
+        self.render = StageTimer()
+        self.transmit = StageTimer()
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            getattr(self, stage).record(seconds)
+
+    def drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def reset(self):
+        with self._lock:
+            self.render.reset()
+            self.transmit.reset()
+            self.dropped = 0
+
+    def snapshot(self):
+        """Timings in milliseconds, plus which stage is the bottleneck"""
+        with self._lock:
+            render_ms = self.render.mean * 1000.0
+            transmit_ms = self.transmit.mean * 1000.0
+            return {
+                "frames_rendered": self.render.count,
+                "frames_sent": self.transmit.count,
+                "frames_dropped": self.dropped,
+                "render_ms_avg": render_ms,
+                "render_ms_max": self.render.max * 1000.0,
+                "transmit_ms_avg": transmit_ms,
+                "transmit_ms_max": self.transmit.max * 1000.0,
+                "bottleneck": "render" if render_ms >= transmit_ms else "transmit",
+            }
+
+
+class FramePipeline:
+    """
+    Two-stage render/transmit pipeline over two frame buffers.
+
+    At most one finished frame waits for the display. If the producer
+    finishes another frame before the consumer picked up the waiting one,
+    the waiting frame is dropped rather than queued, so latency stays
+    bounded to about one frame.
+    """
+    def __init__(self, render, present, make_buffer, scheduler, next_event=None, max_frame_dt=0.25, stats=None):
+        """
+        Args:
+            render: render(dt, buffer) draws the next frame into buffer
+            present: present(buffer) sends a finished frame to the display
+            make_buffer: Factory for one preallocated frame buffer
+            scheduler: FrameScheduler that paces the render thread
+            next_event: Optional callable returning the monotonic time of the
+                        next scheduled animation event
+            max_frame_dt: Clamp on the dt handed to render after a stall
+            stats: Optional FrameStats to record into
+        """
+        self.render = render
+        self.present = present
+        self.buffers = [make_buffer(), make_buffer()]
+        self.scheduler = scheduler
+        self.next_event = next_event
+        self.max_frame_dt = max_frame_dt
+        self.stats = stats or FrameStats()
+
+        self.running = False
+        self.paused = False
+        self._cond = threading.Condition()
+        self._pending = None   # index of a finished frame not yet sent
+        self._sending = None   # index of the frame being transmitted
+        self._threads = []
+
+    def start(self):
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._produce, daemon=True, name="eyes-render"),
+            threading.Thread(target=self._consume, daemon=True, name="eyes-transmit"),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        self.scheduler.wake()
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout)
+        self._threads = []
+
+    def pause(self):
+        """
+        Stop producing frames. Blocks until the display is no longer being
+        written, so another writer can take over the device.
+        """
+        with self._cond:
+            self.paused = True
+            if self._pending is not None:
+                self._pending = None
+                self.stats.drop()
+            while self._sending is not None:
+                self._cond.wait()
+
+    def resume(self):
+        with self._cond:
+            self.paused = False
+        self.scheduler.wake()
+
+    def _claim_buffer(self):
+        """Pick the buffer the display isn't reading (caller holds the lock)"""
+        if self._sending is not None:
+            idx = 1 - self._sending
+        elif self._pending is not None:
+            idx = 1 - self._pending
+        else:
+            idx = 0
+        if self._pending == idx:
+            # The display is still busy with the other buffer: overwrite the
+            # waiting frame instead of queueing behind it
+            self._pending = None
+            self.stats.drop()
+        return idx
+
+    def _produce(self):
+        sched = self.scheduler
+        last_t = time.monotonic()
+        while self.running:
+            start_t = sched.begin_frame()
+            dt = min(start_t - last_t, self.max_frame_dt)
+            last_t = start_t
+
+            if self.paused:
+                sched.set_idle(True)
+                sched.end_frame()
+                sched.wait()
+                continue
+
+            with self._cond:
+                idx = self._claim_buffer()
+
+            self.render(dt, self.buffers[idx])
+            self.stats.record("render", time.monotonic() - start_t)
+
+            with self._cond:
+                if self.paused:
+                    # Paused mid-render: the display belongs to someone else
+                    self.stats.drop()
+                else:
+                    if self._pending is not None:
+                        self.stats.drop()
+                    self._pending = idx
+                    self._cond.notify()
+
+            sched.end_frame()
+            sched.wait(self.next_event() if self.next_event else None)
+
+    def _consume(self):
+        while True:
+            with self._cond:
+                while self.running and self._pending is None:
+                    self._cond.wait()
+                if not self.running:
+                    return
+                idx = self._pending
+                self._pending = None
+                self._sending = idx
+
+            start_t = time.monotonic()
+            try:
+                self.present(self.buffers[idx])
+            finally:
+                self.stats.record("transmit", time.monotonic() - start_t)
+                with self._cond:
+                    self._sending = None
+                    self._cond.notify_all()
@@ -0,0 +1,117 @@
+"""
+Stella Nurse - Adaptive Frame Scheduler
+Deadline-based frame pacing on a monotonic clock that drops to a low refresh
+rate while the face is at rest and jumps back to full rate on demand.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class FrameScheduler:
+    """
+    Paces the render loop.
+
+    Deadlines advance by a fixed period from the previous deadline (not from
+    "now"), so the frame rate doesn't drift with render time. While idle the
+    period stretches to 1 / idle_fps; wake() interrupts an idle sleep so a
+    state change is drawn on the very next frame.
+    """
+    def __init__(self, fps=60, idle_fps=15, window=1.0):
+        """
+        Args:
+            fps: Full (active) frame rate
+            idle_fps: Frame rate while nothing is animating
+            window: Seconds of recent frames used for the achieved-FPS and
+                    CPU figures
+        """
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.idle = False
+        self.window = window
+
+        self._wake = threading.Event()
+        self._deadline = None
+        self._frame_start = 0.0
+        self._cpu_start = 0.0
+        self._frames = deque()  # (monotonic start, cpu seconds)
+        self._lock = threading.Lock()
+
+    @property
+    def period(self):
+        return 1.0 / (self.idle_fps if self.idle else self.fps)
+
+    def wake(self):
+        """Return to full rate immediately (safe to call from any thread)"""
+        self.idle = False
+        self._wake.set()
+
+    def set_idle(self, idle):
+        """Report whether the last frame had anything left to animate"""
+        self.idle = idle
+
+    def begin_frame(self):
+        """Mark the start of a frame; returns the monotonic frame time"""
+        now = time.monotonic()
+        if self._deadline is None:
+            self._deadline = now
+        self._frame_start = now
+        self._cpu_start = time.thread_time()
+        return now
+
+    def end_frame(self):
+        """Mark the end of a frame's work (for CPU time accounting)"""
+        cpu = time.thread_time() - self._cpu_start
+        with self._lock:
+            self._frames.append((self._frame_start, cpu))
+            self._trim(self._frame_start)
+
+    def _trim(self, now):
+        while self._frames and self._frames[0][0] < now - self.window:
+            self._frames.popleft()
+
+    def wait(self, wake_at=None):
+        """
+        Sleep until the next frame deadline.
+
+        Args:
+            wake_at: Optional monotonic time of an upcoming event (e.g. a
+                     scheduled blink) that must not be slept through
+        """
+        now = time.monotonic()
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += self.period
+
+        # Fell more than a frame behind: resync instead of bursting frames
+        if self._deadline < now - self.period:
+            self._deadline = now
+
+        if wake_at is not None and now <= wake_at < self._deadline:
+            self._deadline = wake_at
+
+        timeout = self._deadline - now
+        if timeout > 0 and self._wake.wait(timeout):
+            # Woken early: start the next frame right away
+            self._deadline = time.monotonic()
+        self._wake.clear()
+
+    def snapshot(self):
+        """Pacing mode, achieved frame rate and CPU time per frame"""
+        with self._lock:
+            self._trim(time.monotonic())
+            frames = list(self._frames)
+
+        achieved = 0.0
+        cpu_ms = 0.0
+        if frames:
+            achieved = len(frames) / self.window
+            cpu_ms = sum(cpu for _, cpu in frames) / len(frames) * 1000.0
+
+        return {
+            "mode": "idle" if self.idle else "active",
+            "target_fps": self.idle_fps if self.idle else self.fps,
+            "achieved_fps": achieved,
+            "cpu_ms_per_frame": cpu_ms,
+        }
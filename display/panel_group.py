@@ -0,0 +1,81 @@
+"""
+Stella Nurse - Parallel Panel Output
+Pushes one frame per panel to several displays at the same time, so the
+CPU-side work for one panel overlaps the other panel's transfer.
+"""
+
+import queue
+import threading
+import time
+
+try:
+    from frame_pipeline import StageTimer
+except ImportError:
+    from display.frame_pipeline import StageTimer
+
+
+class PanelGroup:
+    """
+    Presents a list of frames, one per panel, concurrently.
+
+    Panel 0 is sent on the calling thread; every other panel has its own
+    persistent sender thread. present() returns once all panels are done.
+    Panels that share one SPI bus and DC line carry a common `bus_lock`
+    that the present callback holds only around the device writes: the
+    per-panel Python work (diffing, rotation, byte packing) still overlaps
+    the other panel's transfer, but transfers never interleave. Panels on
+    separate buses transfer fully in parallel.
+    """
+    def __init__(self, count, present):
+        """
+        Args:
+            count: Number of panels
+            present: present(index, frame) sends one frame to panel index
+        """
+        self.count = count
+        self._present = present
+        self.timers = [StageTimer() for _ in range(count)]
+        self._lock = threading.Lock()
+        self._inbox = [queue.Queue(maxsize=1) for _ in range(count - 1)]
+        self._done = queue.Queue()
+        for i in range(1, count):
+            threading.Thread(target=self._worker, args=(i,), daemon=True, name=f"eyes-panel{i}").start()
+
+    def _send(self, index, frame):
+        start = time.monotonic()
+        try:
+            self._present(index, frame)
+        finally:
+            with self._lock:
+                self.timers[index].record(time.monotonic() - start)
+
+    def _worker(self, index):
+        inbox = self._inbox[index - 1]
+        while True:
+            frame = inbox.get()
+            error = None
+            try:
+                self._send(index, frame)
+            except Exception as e:
+                error = e
+            self._done.put(error)
+
+    def present(self, frames):
+        """Send frames[i] to panel i for every panel, in parallel"""
+        for inbox, frame in zip(self._inbox, frames[1:]):
+            inbox.put(frame)
+        try:
+            self._send(0, frames[0])
+        finally:
+            errors = [self._done.get() for _ in self._inbox]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def stats(self):
+        """Mean / max send time per panel in milliseconds"""
+        with self._lock:
+            return [
+                {"transmit_ms_avg": t.mean * 1000.0, "transmit_ms_max": t.max * 1000.0}
+                for t in self.timers
+            ]
@@ -0,0 +1,195 @@
+"""
+Stella Nurse - Direct RGB565 Renderer
+Draws eyes straight into a preallocated NumPy framebuffer in the panel's
+native RGB565 format, so frames go to SPI as raw bytes with no per-frame
+image allocation and no Python-side color conversion.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+try:
+    from sprite_cache import SpriteCache
+except ImportError:
+    from display.sprite_cache import SpriteCache
+
+# Big-endian 16-bit: the buffer's bytes are already in wire order
+RGB565 = np.dtype(">u2")
+
+
+def color565(color):
+    """Pack an (r, g, b) tuple into a 16-bit RGB565 value"""
+    r, g, b = color
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def _div255(v):
+    """PIL's rounded division by 255"""
+    tmp = v + 128
+    return ((tmp >> 8) + tmp) >> 8
+
+
+def to_image(buf):
+    """Expand an RGB565 framebuffer back into a PIL RGB image (debug/equivalence checks)"""
+    px = buf.astype(np.uint16)
+    rgb = np.empty(buf.shape + (3,), dtype=np.uint8)
+    rgb[..., 0] = (px >> 8) & 0xF8
+    rgb[..., 1] = (px >> 3) & 0xFC
+    rgb[..., 2] = (px << 3) & 0xF8
+    return Image.fromarray(rgb, "RGB")
+
+
+class RowSpans:
+    """
+    Per-row [left, right] fill columns of a rounded rectangle.
+    Rounded rects are convex, so each row is a single contiguous span.
+    """
+    __slots__ = ("left", "right", "nbytes")
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.nbytes = left.nbytes + right.nbytes
+
+
+class AlphaSprite:
+    """Alpha mask as a NumPy array plus its integer anchor point"""
+    __slots__ = ("alpha", "anchor_x", "anchor_y", "nbytes")
+
+    def __init__(self, alpha, anchor_x, anchor_y):
+        self.alpha = alpha
+        self.anchor_x = anchor_x
+        self.anchor_y = anchor_y
+        self.nbytes = alpha.nbytes
+
+
+class RGB565Renderer:
+    """
+    Eye renderer targeting a uint16 RGB565 framebuffer.
+
+    Axis-aligned eyes are filled with vectorized row-span comparisons; the
+    span table for each eye size is taken once from PIL's own rounded
+    rectangle rasterizer, so the output matches the PIL backend pixel for
+    pixel. Eyelids are row ranges that are simply skipped. Rotated eyes
+    reuse the same alpha sprites as the PIL path and are blended with
+    PIL's integer blend formula.
+
+    Where the two eyes overlap, the second blends over the first. The packed
+    pixel has lost the low bits PIL blends with, so each buffer also keeps
+    the per-pixel coverage drawn so far in the frame's single eye color; the
+    8-bit value underneath is rebuilt from it exactly.
+    """
+    def __init__(self, width, height, corner_radius, build_sprite):
+        """
+        Args:
+            width, height: Framebuffer size
+            corner_radius: Eye corner radius in pixels
+            build_sprite: build_sprite(*key) -> EyeSprite for rotated keys
+        """
+        self.width = width
+        self.height = height
+        self.corner_radius = corner_radius
+        self.build_sprite = build_sprite
+
+        self.buffer = self.new_buffer()
+        self._cols = np.arange(width, dtype=np.int32)
+        self.spans = SpriteCache(max_entries=128)
+        self.sprites = SpriteCache()
+        self._coverage = {}  # id(framebuffer) -> uint8 coverage of this frame's eyes
+
+    def new_buffer(self):
+        """Allocate one zeroed (black) framebuffer"""
+        return np.zeros((self.height, self.width), dtype=RGB565)
+
+    def _coverage_of(self, buf):
+        coverage = self._coverage.get(id(buf))
+        if coverage is None or coverage.shape != buf.shape:
+            coverage = self._coverage[id(buf)] = np.zeros(buf.shape, dtype=np.uint16)
+        return coverage
+
+    def clear(self, buf):
+        buf.fill(0)
+        self._coverage_of(buf).fill(0)
+
+    # ================= AXIS ALIGNED ================= #
+
+    def _build_spans(self, w, h):
+        mask = Image.new("L", (w + 1, h + 1), 0)
+        ImageDraw.Draw(mask).rounded_rectangle([0, 0, w, h], radius=self.corner_radius, fill=255)
+        filled = np.asarray(mask) > 0
+        any_fill = filled.any(axis=1)
+        left = np.where(any_fill, filled.argmax(axis=1), w + 1).astype(np.int32)
+        right = np.where(any_fill, w - filled[:, ::-1].argmax(axis=1), -1).astype(np.int32)
+        return RowSpans(left, right)
+
+    def _fill_rounded(self, buf, x0, y0, key, color):
+        w, h, _, upper_px, lower_px = key
+        spans = self.spans.get((w, h), lambda: self._build_spans(w, h))
+
+        # Eyelids just trim the visible row range
+        r0 = upper_px + 1 if upper_px > 0 else 0
+        r1 = h - lower_px if lower_px > 0 else h + 1
+
+        # Clip to the framebuffer
+        r0 = max(r0, -y0)
+        r1 = min(r1, self.height - y0)
+        c0 = max(0, x0)
+        c1 = min(self.width, x0 + w + 1)
+        if r0 >= r1 or c0 >= c1:
+            return
+
+        cols = self._cols[c0:c1] - x0
+        left = spans.left[r0:r1, None]
+        right = spans.right[r0:r1, None]
+        mask = (cols >= left) & (cols <= right)
+        np.putmask(buf[y0 + r0:y0 + r1, c0:c1], mask, color565(color))
+        np.putmask(self._coverage_of(buf)[y0 + r0:y0 + r1, c0:c1], mask, 255)
+
+    # ================= ROTATED ================= #
+
+    def _alpha_sprite(self, key):
+        sprite = self.build_sprite(*key)
+        return AlphaSprite(np.asarray(sprite.mask, dtype=np.uint16), sprite.anchor_x, sprite.anchor_y)
+
+    def _blend_sprite(self, buf, ax, ay, key, color):
+        sprite = self.sprites.get(key, lambda: self._alpha_sprite(key))
+        x0 = ax - sprite.anchor_x
+        y0 = ay - sprite.anchor_y
+        sh, sw = sprite.alpha.shape
+
+        bx0, by0 = max(0, x0), max(0, y0)
+        bx1, by1 = min(self.width, x0 + sw), min(self.height, y0 + sh)
+        if bx0 >= bx1 or by0 >= by1:
+            return
+
+        alpha = sprite.alpha[by0 - y0:by1 - y0, bx0 - x0:bx1 - x0]
+        covered = alpha > 0
+        a = alpha[covered]
+        coverage = self._coverage_of(buf)[by0:by1, bx0:bx1]
+        under = coverage[covered]
+
+        # PIL's paste blend: out = div255(dst * (255 - a) + c * a), where dst
+        # is black, or this color already drawn at coverage `under`
+        packed = np.zeros(a.shape, dtype=np.uint16)
+        for shift, keep, c in ((8, 0xF8, color[0]), (3, 0xFC, color[1]), (-3, 0xF8, color[2])):
+            dst = _div255(under * c)
+            chan = _div255(dst * (255 - a) + c * a) & keep
+            packed |= (chan << shift) if shift > 0 else (chan >> -shift)
+
+        buf[by0:by1, bx0:bx1][covered] = packed
+        coverage[covered] = under + a - _div255(under * a)
+
+    # ================= PUBLIC ================= #
+
+    def draw_eye(self, buf, key, anchor, color):
+        """
+        Draw one eye described by the same (key, anchor) pair the PIL path
+        uses for its sprite cache.
+        """
+        if key[2] == 0:
+            self._fill_rounded(buf, anchor[0], anchor[1], key, color)
+        else:
+            self._blend_sprite(buf, anchor[0], anchor[1], key, color)
+
+    def stats(self):
+        return {"spans": self.spans.stats(), "sprites": self.sprites.stats()}
@@ -0,0 +1,125 @@
+"""
+Stella Nurse - Vectorized Spring Physics
+All animated channels (position, scale, rotation, eyelids, RGB) live in
+contiguous NumPy arrays and are stepped with one vectorized update, for one
+or many eye instances at once.
+"""
+
+import math
+
+import numpy as np
+
+
+class SpringChannel:
+    """
+    View of one channel of a SpringBank for one instance.
+    Scalar spring handle (value, target, velocity, set_target, snap_to).
+    """
+    __slots__ = ("bank", "instance", "index")
+
+    def __init__(self, bank, instance, index):
+        self.bank = bank
+        self.instance = instance
+        self.index = index
+
+    @property
+    def value(self):
+        return float(self.bank.value[self.instance, self.index])
+
+    @value.setter
+    def value(self, v):
+        self.bank.value[self.instance, self.index] = v
+
+    @property
+    def target(self):
+        return float(self.bank.target[self.instance, self.index])
+
+    @property
+    def velocity(self):
+        return float(self.bank.velocity[self.instance, self.index])
+
+    def set_target(self, target):
+        self.bank.target[self.instance, self.index] = target
+
+    def snap_to(self, value):
+        self.bank.value[self.instance, self.index] = value
+        self.bank.target[self.instance, self.index] = value
+        self.bank.velocity[self.instance, self.index] = 0.0
+
+
+class SpringBank:
+    """
+    Damped harmonic oscillators for many channels, stepped together.
+
+    Arrays are shaped (instances, channels). Integration is semi-implicit
+    Euler with fixed substeps, so a late frame is split into several small
+    steps instead of one large one that could make a stiff spring explode.
+    """
+    def __init__(self, channels, instances=1, max_substep=1.0 / 240.0, max_substeps=16):
+        """
+        Args:
+            channels: List of (name, initial_value, config) tuples, where config
+                      holds 'stiffness', 'damping' and 'mass'
+            instances: Number of independent eye rigs sharing this bank
+            max_substep: Longest integration step in seconds
+            max_substeps: Upper bound on substeps per call (caps CPU on huge dt)
+        """
+        self.names = [name for name, _, _ in channels]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.max_substep = max_substep
+        self.max_substeps = max_substeps
+
+        shape = (instances, len(self.names))
+        initial = np.array([v for _, v, _ in channels], dtype=np.float64)
+        self.value = np.tile(initial, (instances, 1))
+        self.target = self.value.copy()
+        self.velocity = np.zeros(shape)
+
+        self.stiffness = np.tile([c["stiffness"] for _, _, c in channels], (instances, 1)).astype(np.float64)
+        self.damping = np.tile([c["damping"] for _, _, c in channels], (instances, 1)).astype(np.float64)
+        self.mass = np.tile([c.get("mass", 1.0) for _, _, c in channels], (instances, 1)).astype(np.float64)
+        self._inv_mass = 1.0 / self.mass
+
+        # Scratch buffers so stepping doesn't allocate
+        self._accel = np.empty(shape)
+        self._tmp = np.empty(shape)
+
+    @property
+    def instances(self):
+        return self.value.shape[0]
+
+    def channel(self, name, instance=0):
+        """Return a scalar spring handle for one channel"""
+        return SpringChannel(self, instance, self.index[name])
+
+    def slice(self, names):
+        """Column slice covering a contiguous run of channel names"""
+        first = self.index[names[0]]
+        return slice(first, first + len(names))
+
+    def step(self, dt):
+        """Advance every spring by dt seconds"""
+        if dt <= 0:
+            return
+        n = min(self.max_substeps, max(1, math.ceil(dt / self.max_substep)))
+        h = dt / n
+        accel, tmp = self._accel, self._tmp
+        for _ in range(n):
+            # F = -kx - cv
+            np.subtract(self.target, self.value, out=accel)
+            accel *= self.stiffness
+            np.multiply(self.velocity, self.damping, out=tmp)
+            accel -= tmp
+            accel *= self._inv_mass
+            accel *= h
+            self.velocity += accel
+            np.multiply(self.velocity, h, out=tmp)
+            self.value += tmp
+
+    def settled(self, eps=1e-3, instance=None):
+        """True when every spring is within eps of its target and at rest"""
+        if instance is None:
+            value, target, velocity = self.value, self.target, self.velocity
+        else:
+            value, target, velocity = self.value[instance], self.target[instance], self.velocity[instance]
+        return bool(np.all(np.abs(target - value) < eps) and np.all(np.abs(velocity) < eps))
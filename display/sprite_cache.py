@@ -0,0 +1,93 @@
+"""
+Stella Nurse - Eye Sprite Cache
+LRU cache of pre-rendered eye masks keyed by quantized geometry, so steady
+expressions are drawn with a single paste instead of being re-rasterized
+(and re-rotated) every frame.
+"""
+
+from collections import OrderedDict
+
+
+class EyeSprite:
+    """
+    A ready-to-blit eye: an "L" alpha mask plus an integer anchor point
+    inside it. The color is applied at paste time, so one sprite serves
+    every color the eye fades through.
+    """
+    __slots__ = ("mask", "anchor_x", "anchor_y", "nbytes")
+
+    def __init__(self, mask, anchor_x, anchor_y):
+        self.mask = mask
+        self.anchor_x = anchor_x
+        self.anchor_y = anchor_y
+        self.nbytes = mask.width * mask.height * len(mask.getbands())
+
+    def paste(self, img, x, y, color):
+        """Blit the sprite onto img with its anchor at pixel (x, y)"""
+        x -= self.anchor_x
+        y -= self.anchor_y
+        img.paste(color, (x, y, x + self.mask.width, y + self.mask.height), self.mask)
+
+
+class SpriteCache:
+    """
+    Least-recently-used sprite store with hit-rate and memory accounting.
+    """
+    def __init__(self, max_entries=256, max_bytes=2 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of sprites kept
+            max_bytes: Maximum total mask memory in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sprites = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory):
+        """
+        Return the sprite for key, building it with factory() on a miss.
+        """
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = factory()
+        self._sprites[key] = sprite
+        self.nbytes += sprite.nbytes
+
+        while self._sprites and (
+            len(self._sprites) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            _, old = self._sprites.popitem(last=False)
+            self.nbytes -= old.nbytes
+            self.evictions += 1
+
+        return sprite
+
+    def clear(self):
+        """Drop all sprites (counters are kept)"""
+        self._sprites.clear()
+        self.nbytes = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Snapshot of cache effectiveness and memory use"""
+        return {
+            "entries": len(self._sprites),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
@@ -0,0 +1,116 @@
+"""
+Stella Nurse - Keyframe Animation Timeline
+Sequences of expression keyframes compiled once into sampled target curves,
+then played back inside the RoboEyes render loop with a table lookup per
+frame (no extra threads, preemptible at any frame).
+"""
+
+import numpy as np
+
+try:
+    from expressions import target_vector
+except ImportError:
+    from display.expressions import target_vector
+
+
+# Easing curves over normalized time u in [0, 1]
+EASINGS = {
+    "step": lambda u: np.ones_like(u),
+    "linear": lambda u: u,
+    "ease_in": lambda u: u * u,
+    "ease_out": lambda u: 1.0 - (1.0 - u) ** 2,
+    "ease_in_out": lambda u: u * u * (3.0 - 2.0 * u),
+}
+
+
+class Keyframe:
+    """
+    One step of a sequence.
+
+    The spring targets move from the previous keyframe's targets to this
+    keyframe's state (plus overrides) over `duration` seconds, shaped by
+    `easing`. "step" jumps immediately and holds, like set_state().
+    """
+    __slots__ = ("state", "duration", "easing", "overrides")
+
+    def __init__(self, state, duration, easing="step", overrides=None):
+        if easing not in EASINGS:
+            raise ValueError(f"Unknown easing: {easing}")
+        self.state = state
+        self.duration = max(0.0, float(duration))
+        self.easing = easing
+        self.overrides = overrides or {}
+
+
+class Timeline:
+    """
+    A compiled keyframe sequence.
+
+    Compilation samples every target channel at sample_rate Hz into one
+    (samples, channels) array. Playback only indexes into it.
+    """
+    def __init__(self, keyframes, sample_rate=120):
+        if not keyframes:
+            raise ValueError("Timeline needs at least one keyframe")
+        self.keyframes = list(keyframes)
+        self.sample_rate = sample_rate
+        self._compile()
+
+    @classmethod
+    def from_states(cls, states, durations, easing="step"):
+        """Build a timeline from parallel lists of state names and durations"""
+        return cls([Keyframe(s, d, easing) for s, d in zip(states, durations)])
+
+    def _compile(self):
+        rate = self.sample_rate
+        curves, states = [], []
+        prev = target_vector(self.keyframes[0].state, self.keyframes[0].overrides)
+
+        for i, kf in enumerate(self.keyframes):
+            target = target_vector(kf.state, kf.overrides)
+            n = max(1, int(round(kf.duration * rate)))
+            u = (np.arange(n) + 1) / n
+            w = EASINGS[kf.easing](u)[:, None]
+            curves.append(prev + (target - prev) * w)
+            states.extend([i] * n)
+            prev = target
+
+        self.curve = np.vstack(curves)
+        self.state_index = np.array(states, dtype=np.int32)
+        self.states = [kf.state for kf in self.keyframes]
+        self.duration = len(self.curve) / rate
+
+        # Change counter: playback only writes targets when the row differs
+        # from what was last applied, so idle wander etc. still work on holds
+        changed = np.ones(len(self.curve), dtype=bool)
+        changed[1:] = np.any(self.curve[1:] != self.curve[:-1], axis=1)
+        self.version = np.cumsum(changed)
+
+    def sample_at(self, t):
+        """Row index for playback time t (clamped to the last sample)"""
+        return min(int(t * self.sample_rate), len(self.curve) - 1)
+
+
+class TimelinePlayer:
+    """Playback cursor for one Timeline on the render clock"""
+    __slots__ = ("timeline", "t", "version")
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.t = 0.0
+        self.version = 0
+
+    def advance(self, dt):
+        """
+        Step the cursor. Returns (targets or None, state name, finished);
+        targets is only returned when the curve changed since the last call.
+        """
+        tl = self.timeline
+        idx = tl.sample_at(self.t)
+        finished = self.t >= tl.duration
+        self.t += dt
+        targets = None
+        if tl.version[idx] != self.version:
+            self.version = tl.version[idx]
+            targets = tl.curve[idx]
+        return targets, tl.states[tl.state_index[idx]], finished
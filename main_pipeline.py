@@ -3,6 +3,12 @@ import logging
 import signal
 import sys
 import os
+import time
+from startup import StartupTimer
+
+# Measured from here: every startup phase below ends up in the startup report
+STARTUP = StartupTimer()
+
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,23 +18,113 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("MainPipeline")
 
-from ai.langchain_agent import NurseAgent
-from voice.elevenlabs import VoiceSystem
-from voice.stt import STTSystem
+# Seconds after a turn during which the next one is likely to follow
+# (vitals are prefetched while listening only within this window)
+CONVERSATION_WINDOW = 120.0
+
+# The LangChain agent stack itself is imported later by NurseAgent.initialize()
+with STARTUP.phase("imports"):
+    from ai.langchain_agent import NurseAgent
+    from ai.memory import ConversationMemory, DEFAULT_PATH as DEFAULT_MEMORY_PATH
+    from ai.intent_router import IntentRouter, VITALS
+    from ai.response_cache import ResponseCache
+    from ai.tools import vitals_monitor, save_patient_memory
+    from voice.elevenlabs import VoiceSystem
+    from voice.stt import STTSystem
+    from voice.chunker import SpeechChunker
+    from voice.barge_in import BargeInMonitor
+    from voice.mic_capture import MicCapture
+    from wakeword.listener import WakeWordListener
 
 class PipelineManager:
-    def __init__(self):
-        self.agent = NurseAgent()
+    def __init__(self, warm_start: bool = True):
+        """
+        Args:
+            warm_start: Bring up face, wake word and TTS first and load the
+                        LLM agent in the background (local fallback answers
+                        until it is ready)
+        """
+        self.warm_start = warm_start
+        # Bounded, persistent history so every turn has context
+        self.memory = ConversationMemory(path=os.getenv("STELLA_MEMORY_PATH", DEFAULT_MEMORY_PATH))
+        router = IntentRouter()
+        # Emergency-like turns the router leaves to the agent must not be answered from the cache
+        self.agent = NurseAgent(memory=self.memory, router=router, cache=ResponseCache(bypass=router.needs_agent))
         # Pass explicit key if needed, or let class handle env var
         self.tts = VoiceSystem(api_key=os.getenv("ELEVENLABS_API_KEY"))
-        self.stt = STTSystem()
+        # One always-on microphone stream shared by wake word, STT and barge-in
+        self.mic = MicCapture()
+        self.stt = STTSystem(capture=self.mic)
+        # Partial transcripts (local streaming STT) start intent-dependent work early
+        self.stt.on_partial = self._on_partial
+        # Groups agent tokens into clauses so speech starts after the first one
+        self.chunker = SpeechChunker()
+        # Cuts speech off as soon as the patient talks over Stella
+        self.barge_in = BargeInMonitor(self.tts, self.mic)
+        # Vitals are captured in the background so check_vitals answers from a snapshot
+        self.vitals = vitals_monitor
+        self.wakeword = WakeWordListener(capture=self.mic)
+        self.face = None
         self.running = True
         self.interrupted = False
+        self.last_turn_at = None  # time.monotonic() of the last transcribed utterance
+
+    def _start_face(self):
+        """Start the eye animation (optional: needs the display hardware or STELLA_DISPLAY=memory)"""
+        if os.getenv("STELLA_FACE", "1") == "0":
+            return None
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "display"))
+        try:
+            from eye_controller import EyeController
+            return EyeController()
+        except Exception as e:
+            logger.warning(f"Face display unavailable: {e}")
+            return None
 
     async def setup(self):
-        await self.agent.initialize()
-        await self.tts.initialize()
-        logger.info("Pipeline components initialized.")
+        with STARTUP.phase("face"):
+            self.face = self._start_face()
+        STARTUP.mark("face up")
+        with STARTUP.phase("microphone"):
+            self.mic.start()
+        with STARTUP.phase("wake word"):
+            await self.wakeword.start()
+        STARTUP.mark("wake word listening")
+        with STARTUP.phase("tts"):
+            await self.tts.initialize()
+        with STARTUP.phase("stt"):
+            await self.stt.initialize()
+        interval = float(os.getenv("STELLA_VITALS_INTERVAL", "0"))
+        if interval > 0:
+            self.vitals.start(interval)
+
+        if self.warm_start:
+            self.agent.start_background_init().add_done_callback(self._agent_loaded)
+            logger.info("Pipeline components initialized, agent loading in the background.")
+        else:
+            with STARTUP.phase("agent"):
+                await self.agent.initialize()
+            self._agent_loaded(None)
+            logger.info("Pipeline components initialized.")
+
+    def _agent_loaded(self, task):
+        if task is not None and not task.cancelled() and task.exception():
+            # process_stream retries the initialization on the next turn
+            logger.error(f"Agent failed to load: {task.exception()}")
+            return
+        for name, seconds in self.agent.init_timings.items():
+            STARTUP.add_phase(f"agent {name}", seconds)
+        STARTUP.mark("agent ready")
+        STARTUP.log_report()
+
+    def _on_partial(self, text: str):
+        """Classify the utterance while it is still being spoken"""
+        if self.agent.router is None:
+            return
+        intent, _ = self.agent.router.classify(text)
+        if intent == VITALS and not self.vitals.acquiring and self.vitals.prefetch() is not None:
+            # The answer needs a fresh reading; start it before the patient finishes
+            logger.info(f"Vitals reading started from partial transcript: '{text}'")
 
     async def run_loop(self):
         """
@@ -44,28 +140,40 @@ class PipelineManager:
                 # In a real system, we'd have a VAD task running in parallel to TTS
                 # If VAD detects speech during TTS, we call self.tts.stop()
                 
+                # Mid-conversation, start a vitals capture while the user talks (no-op if
+                # the snapshot is fresh); otherwise only a vitals question starts one (_on_partial)
+                if self.last_turn_at is not None and time.monotonic() - self.last_turn_at < CONVERSATION_WINDOW:
+                    self.vitals.prefetch()
+
                 # Simulation:
                 user_text = await self.stt.listen_and_transcribe()
                 
                 if not user_text:
                     continue
+                self.last_turn_at = time.monotonic()
                     
                 print(f"User: {user_text}")
                 
-                # 2. Check Interruption (simulation logic)
-                # Note: In real code, VAD would set a flag or cancel the TTS task
-                if self.tts.is_speaking:
-                    logger.info("User spoke while agent was speaking -> Stopping TTS")
-                    self.tts.stop()
-                
-                # 3. Process with Agent
-                response_stream = self.agent.process_stream(user_text)
+                # 2. Process with Agent (tokens -> speakable clauses)
+                response_stream = self.chunker.stream(self.agent.process_stream(user_text))
                 
-                # 4. Speak Response (Streamed)
-                await self.tts.stream_audio(response_stream)
+                # 3. Speak Response (Streamed, synthesis prefetched ahead of playback)
+                #    while the barge-in monitor listens for the patient talking over it
+                monitor = asyncio.ensure_future(self.barge_in.watch())
+                try:
+                    await self.tts.stream_audio(response_stream)
+                finally:
+                    if not self.barge_in.triggered:
+                        monitor.cancel()
+                    # After a barge-in, let the monitor finish recording its stop latency
+                    await asyncio.gather(monitor, return_exceptions=True)
+                    self.interrupted = self.barge_in.triggered
+                    # Don't transcribe Stella's own voice; keep the patient's speech after a barge-in
+                    self.stt.skip_playback(self.barge_in.onset if self.interrupted else None)
                 
-                # Loop simulation delay
-                await asyncio.sleep(1)
+                # Loop simulation delay (skipped after a barge-in: the patient is already talking)
+                if not self.interrupted:
+                    await asyncio.sleep(1)
                 
                 # For demo purposes, stop after one interaction
                 # self.running = False 
@@ -79,9 +187,16 @@ class PipelineManager:
 
     def stop(self):
         self.running = False
+        self.vitals.stop()
+        save_patient_memory()
+        self.mic.stop()
+        self.stt.close()
+        if self.face:
+            self.face.stop()
 
 async def main():
-    pipeline = PipelineManager()
+    with STARTUP.phase("pipeline objects"):
+        pipeline = PipelineManager(warm_start=os.getenv("STELLA_WARM_START", "1") != "0")
     
     # Handle signals
     def signal_handler(sig, frame):
@@ -0,0 +1,138 @@
+"""
+Vitals Monitor Module
+Acquires vitals in the background and keeps the latest timestamped snapshot,
+so readers don't have to wait for a sensor capture.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VitalsSnapshot:
+    __slots__ = ("heart_rate", "temperature", "spo2", "timestamp")
+
+    def __init__(self, heart_rate, temperature, spo2=None, timestamp=None):
+        self.heart_rate = heart_rate
+        self.temperature = temperature
+        self.spo2 = spo2
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the reading was taken"""
+        return time.time() - self.timestamp
+
+
+class VitalsMonitor:
+    """
+    Background vitals acquisition with a cached snapshot.
+
+    `acquire` is an async callable returning a dict with heart_rate,
+    temperature and optionally spo2 (a heart-rate capture can take ~10 s).
+    prefetch() starts an acquisition unless the snapshot is still fresh or
+    one is already running, e.g. as soon as the user starts speaking; start()
+    additionally refreshes on a fixed interval. get() returns the snapshot
+    while it is fresh, otherwise joins the running acquisition (or starts
+    one). Readers that give up waiting don't cancel the acquisition.
+    """
+    def __init__(
+        self,
+        acquire: Callable[[], Awaitable[dict]],
+        max_age: float = 90.0,
+        on_update: Optional[Callable[[VitalsSnapshot], None]] = None,
+    ):
+        """
+        Args:
+            acquire: Async callable performing one sensor capture
+            max_age: Seconds a snapshot counts as fresh
+            on_update: Called with every new snapshot
+        """
+        self.acquire = acquire
+        self.max_age = max_age
+        self.on_update = on_update
+        self.snapshot: Optional[VitalsSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._schedule: Optional[asyncio.Task] = None
+        self.stats = {"acquisitions": 0, "failures": 0, "served_fresh": 0, "joined": 0}
+
+    def fresh(self, max_age: Optional[float] = None) -> Optional[VitalsSnapshot]:
+        """The snapshot if it is younger than max_age, else None"""
+        max_age = self.max_age if max_age is None else max_age
+        if self.snapshot is not None and self.snapshot.age <= max_age:
+            return self.snapshot
+        return None
+
+    @property
+    def acquiring(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _acquire(self) -> VitalsSnapshot:
+        start = time.perf_counter()
+        try:
+            values = await self.acquire()
+            if values.get("heart_rate") is None:
+                raise ValueError("no heart rate (weak signal)")
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.warning(f"Vitals acquisition failed: {e}")
+            raise
+        snapshot = VitalsSnapshot(values["heart_rate"], values.get("temperature"), values.get("spo2"))
+        self.snapshot = snapshot
+        self.stats["acquisitions"] += 1
+        logger.info(f"Vitals updated in {time.perf_counter() - start:.1f} s: "
+                    f"HR {snapshot.heart_rate}, temp {snapshot.temperature}")
+        if self.on_update:
+            self.on_update(snapshot)
+        return snapshot
+
+    def _finished(self, task: asyncio.Task):
+        # Retrieve the exception so an unawaited prefetch doesn't log "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def prefetch(self, max_age: Optional[float] = None) -> Optional[asyncio.Task]:
+        """Start a background acquisition unless the snapshot is fresh; returns the running task"""
+        if self.acquiring:
+            return self._task
+        if self.fresh(max_age) is not None:
+            return None
+        self._task = asyncio.ensure_future(self._acquire())
+        self._task.add_done_callback(self._finished)
+        return self._task
+
+    async def get(self, max_age: Optional[float] = None) -> VitalsSnapshot:
+        """A fresh snapshot, waiting for an acquisition only when needed"""
+        snapshot = self.fresh(max_age)
+        if snapshot is not None:
+            self.stats["served_fresh"] += 1
+            return snapshot
+        if self.acquiring:
+            self.stats["joined"] += 1
+        task = self.prefetch(max_age)
+        return await asyncio.shield(task)
+
+    async def _run(self, interval: float):
+        while True:
+            task = self.prefetch(max_age=interval)
+            if task is not None:
+                try:
+                    await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    pass
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float):
+        """Also refresh the snapshot every `interval` seconds"""
+        self.stop()
+        self._schedule = asyncio.ensure_future(self._run(interval))
+
+    def stop(self):
+        if self._schedule is not None:
+            self._schedule.cancel()
+            self._schedule = None
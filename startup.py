@@ -0,0 +1,52 @@
+"""
+Stella Nurse - Startup Timing
+Records how long each startup phase takes and when milestones (face up,
+wake word listening, agent ready) are reached.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("Startup")
+
+
+class StartupTimer:
+    def __init__(self, start=None):
+        """
+        Args:
+            start: perf_counter() value startup is measured from (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []      # (name, seconds)
+        self.milestones = []  # (name, seconds since start)
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of startup work"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - begin))
+
+    def add_phase(self, name, seconds):
+        """Record a phase timed elsewhere (e.g. in a background task)"""
+        self.phases.append((name, seconds))
+
+    def mark(self, name):
+        """Record a milestone at the current time"""
+        self.milestones.append((name, time.perf_counter() - self.start))
+
+    def report(self):
+        """Dict of phase durations and milestone times, in ms"""
+        return {
+            "phases": {name: seconds * 1000.0 for name, seconds in self.phases},
+            "milestones": {name: seconds * 1000.0 for name, seconds in self.milestones},
+        }
+
+    def log_report(self):
+        lines = ["Startup breakdown:"]
+        lines += [f"  {name:<24} {seconds * 1000.0:8.0f} ms" for name, seconds in self.phases]
+        lines += [f"  @ {name:<22} {seconds * 1000.0:8.0f} ms" for name, seconds in self.milestones]
+        logger.info("\n".join(lines))
@@ -0,0 +1,75 @@
+"""Barge-in must ignore Stella's own voice echoed by the mic, but not the patient"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.audio_output import AudioOutput
+from voice.barge_in import BargeInMonitor
+from voice.mic_capture import MicCapture
+
+FRAME = 320  # 20 ms at 16 kHz
+
+
+def noise(rng, db):
+    """One frame of white noise at `db` dBFS RMS"""
+    return rng.standard_normal(FRAME) * 32768.0 * 10 ** (db / 20)
+
+
+class FakeVoice:
+    """VoiceSystem stand-in: a real AudioOutput, interrupts are only counted"""
+    def __init__(self):
+        self.output = AudioOutput()
+        self.is_speaking = True
+        self.interrupts = 0
+
+    async def interrupt(self):
+        self.interrupts += 1
+        self.is_speaking = False
+        return 0.0
+
+
+async def simulate(seconds, patient_from=None, patient_db=-15.0, echo_db=-15.0):
+    """
+    Room at -65 dBFS; Stella plays speech-level audio whose echo reaches
+    the mic `echo_db` below the playback; from `patient_from` seconds the
+    patient also talks. Returns the number of interrupts.
+    """
+    rng = np.random.default_rng(0)
+    mic = MicCapture()
+    mic._loop = asyncio.get_running_loop()
+    mic._running = True  # Frames are written by the test, not a device
+    voice = FakeVoice()
+    monitor = BargeInMonitor(voice, mic)
+
+    for _ in range(25):  # Quiet room before Stella speaks
+        mic.write(noise(rng, -65).astype(np.int16))
+        await asyncio.sleep(0.02)
+
+    watch = asyncio.ensure_future(monitor.watch())
+    for i in range(int(seconds / 0.02)):
+        if not voice.is_speaking:
+            break
+        playback = noise(rng, -20)
+        voice.output.ring.write(playback.astype(np.int16))
+        voice.output._pull(FRAME)
+        heard = playback * 10 ** (echo_db / 20) + noise(rng, -65)
+        if patient_from is not None and i * 0.02 >= patient_from:
+            heard += noise(rng, patient_db)
+        mic.write(np.clip(heard, -32768, 32767).astype(np.int16))
+        await asyncio.sleep(0.02)
+    await asyncio.sleep(0.05)
+    watch.cancel()
+    await asyncio.gather(watch, return_exceptions=True)
+    return voice.interrupts
+
+
+def test_echo_alone_does_not_interrupt():
+    assert asyncio.run(simulate(2.0)) == 0
+
+
+def test_patient_over_echo_interrupts():
+    assert asyncio.run(simulate(2.0, patient_from=1.0)) == 1
@@ -0,0 +1,82 @@
+"""While the agent loads, a patient in distress must still be able to raise an alert"""
+import asyncio
+import os
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import ai.tools  # noqa: F401
+except ImportError:
+    # Without LangChain installed; the alert tool is replaced per test anyway
+    sys.modules["ai.tools"] = types.SimpleNamespace(
+        check_vitals=None, get_medicine_schedule=None, trigger_emergency_alert=None)
+
+from ai import fallback
+from ai.fallback import DEFAULT_REPLY, FallbackResponder
+from ai.intent_router import EMERGENCY, TEMPLATES, IntentRouter
+
+ALERTS = [
+    ("emergency", "high"),
+    ("help", "high"),
+    ("help me please", "high"),
+    ("I just fell", "high"),
+    ("I've fallen and I can't get up", "high"),
+    ("my knee hurts", "medium"),
+    ("I feel dizzy", "medium"),
+]
+
+NO_ALERTS = [
+    "hello",
+    "what's the weather like",
+    "I fell asleep early",
+    "I don't feel sick anymore",
+    "this is not an emergency",
+]
+
+
+@pytest.mark.parametrize("text,level", ALERTS)
+def test_distress_alerts(text, level):
+    responder = FallbackResponder()
+    with mock.patch.object(fallback, "trigger_emergency_alert") as alert:
+        reply = responder.respond(text)
+    alert.invoke.assert_called_once()
+    assert alert.invoke.call_args.args[0]["level"] == level
+    assert reply == TEMPLATES[EMERGENCY]
+    assert responder.alerts == 1
+
+
+@pytest.mark.parametrize("text", NO_ALERTS)
+def test_no_alert(text):
+    responder = FallbackResponder()
+    with mock.patch.object(fallback, "trigger_emergency_alert") as alert:
+        reply = responder.respond(text)
+    alert.invoke.assert_not_called()
+    assert reply != TEMPLATES[EMERGENCY]
+
+
+def test_default_reply_promises_nothing_unhandled():
+    assert "say emergency" not in DEFAULT_REPLY
+
+
+def test_agent_loading_emergency_alerts():
+    pytest.importorskip("langchain_core")
+    from ai.langchain_agent import NurseAgent
+
+    async def turn():
+        agent = NurseAgent(router=IntentRouter(), backends=[])
+        agent._init_task = asyncio.get_running_loop().create_future()  # Still loading
+        try:
+            return [chunk async for chunk in agent.process_stream("emergency")], agent
+        finally:
+            agent._init_task.cancel()
+
+    with mock.patch.object(fallback, "trigger_emergency_alert") as alert:
+        chunks, agent = asyncio.run(turn())
+    alert.invoke.assert_called_once()
+    assert chunks == [TEMPLATES[EMERGENCY]]
+    assert agent.last_turn_metrics["fallback"]
@@ -0,0 +1,110 @@
+"""Emergency routing: what may and may not raise an alert without the LLM"""
+import asyncio
+import os
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import ai.tools  # noqa: F401
+except ImportError:
+    # Without LangChain installed; the router's tools are replaced per test anyway
+    sys.modules["ai.tools"] = types.SimpleNamespace(
+        check_vitals=None, get_medicine_schedule=None, trigger_emergency_alert=None)
+
+from ai import intent_router
+from ai.intent_router import EMERGENCY, VITALS, IntentRouter, is_emergency
+
+EMERGENCIES = [
+    "I have chest pain",
+    "my chest hurts",
+    "severe pain in my chest",
+    "I can't breathe",
+    "I'm having trouble breathing",
+    "I fell down in the kitchen",
+    "I have fallen on the floor",
+    "I think I'm having a heart attack",
+    "I'm having a stroke",
+    "please call an ambulance",
+    "this is an emergency",
+    "I had chest pain yesterday but now I can't breathe",
+]
+
+NOT_EMERGENCIES = [
+    "I don't have chest pain anymore",
+    "no chest pain today",
+    "my chest pain is gone",
+    "this is not an emergency",
+    "what's the emergency number",
+    "my daughter had a stroke of luck",
+    "I fell asleep early",
+    "I fell in love with this song",
+    "i feel like going to the garden",
+    "help me please",
+]
+
+VITALS_REQUESTS = [
+    "what's my heart rate",
+    "check my pulse",
+    "what is my temperature",
+    "do I have a fever",
+    "how are my vital signs",
+]
+
+# Past readings and questions about what a reading means go to the agent
+NOT_VITALS_REQUESTS = [
+    "what was my heart rate yesterday",
+    "my heart rate was high last night, should I worry?",
+    "is my heart rate normal",
+    "should I worry about my pulse",
+    "why is my pulse so fast",
+]
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter()
+
+
+@pytest.mark.parametrize("text", EMERGENCIES)
+def test_emergency_detected(router, text):
+    assert is_emergency(text)
+    assert router.classify(text) == (EMERGENCY, 1.0)
+
+
+@pytest.mark.parametrize("text", NOT_EMERGENCIES)
+def test_no_emergency(router, text):
+    assert not is_emergency(text)
+    assert router.classify(text)[0] != EMERGENCY
+
+
+def test_route_raises_alert(router):
+    with mock.patch.object(intent_router, "trigger_emergency_alert") as alert:
+        intent, reply = asyncio.run(router.route("I can't breathe"))
+    assert intent == EMERGENCY
+    alert.invoke.assert_called_once()
+
+
+@pytest.mark.parametrize("text", NOT_EMERGENCIES)
+def test_route_never_alerts_on_false_positive(router, text):
+    with mock.patch.object(intent_router, "trigger_emergency_alert") as alert, \
+            mock.patch.object(intent_router, "check_vitals") as vitals, \
+            mock.patch.object(intent_router, "get_medicine_schedule"):
+        vitals.ainvoke = mock.AsyncMock(return_value="Heart Rate: 72 BPM, Temperature: 36.8°C")
+        routed = asyncio.run(router.route(text))
+    alert.invoke.assert_not_called()
+    assert routed is None or routed[0] != EMERGENCY
+
+
+@pytest.mark.parametrize("text", VITALS_REQUESTS)
+def test_current_vitals_routed(router, text):
+    assert router.classify(text)[0] == VITALS
+
+
+@pytest.mark.parametrize("text", NOT_VITALS_REQUESTS)
+def test_vitals_history_and_advice_not_routed(router, text):
+    assert router.classify(text)[0] is None
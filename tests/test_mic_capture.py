@@ -0,0 +1,29 @@
+"""The shared capture buffer must accept recorded audio in chunks of any size"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.mic_capture import MicCapture
+
+
+@pytest.mark.parametrize("chunk", [320, 700, 999, 16000, 20000])
+def test_write_any_chunk_size(chunk):
+    mic = MicCapture(buffer_seconds=1.0)  # Capacity 16000 samples
+    audio = (np.arange(50000) % 30000).astype(np.int16)
+    reader = mic.reader()
+    received = []
+    for start in range(0, len(audio), chunk):
+        mic.write(audio[start:start + chunk])
+        received.append(reader.read().copy())  # Read before the buffer wraps past the reader
+
+    assert mic.position == len(audio)
+    assert np.array_equal(mic.view(mic.oldest, mic.position), audio[-mic.capacity:])
+    if chunk <= mic.capacity:
+        assert np.array_equal(np.concatenate(received), audio)
+    # Any window up to the capacity is contiguous, wherever it starts
+    for start in range(mic.oldest, mic.position - mic.frame, 777):
+        assert np.array_equal(mic.view(start, start + mic.frame), audio[start:start + mic.frame])
@@ -0,0 +1,69 @@
+"""Backend ordering: a slow sample must not demote the local model for good"""
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import model_backends
+from ai.model_backends import LOCAL, REMOTE, BackendPolicy, ModelBackend
+
+
+class FakeBackend(ModelBackend):
+    def __init__(self, name, kind):
+        super().__init__("fake", timeout=1.0)
+        self.name = name
+        self.kind = kind
+
+    def create(self):
+        return None
+
+
+LOCAL_MODEL = FakeBackend("ollama", LOCAL)
+REMOTE_MODEL = FakeBackend("gemini", REMOTE)
+BACKENDS = [REMOTE_MODEL, LOCAL_MODEL]
+
+
+def first(policy, now):
+    with mock.patch.object(model_backends.time, "monotonic", return_value=now):
+        return policy.order("what's on tv tonight", BACKENDS)[0].kind
+
+
+def test_create_is_abstract():
+    with pytest.raises(TypeError):
+        ModelBackend("fake", timeout=1.0)
+
+
+def test_cold_start_sample_ignored():
+    policy = BackendPolicy()
+    policy.record(LOCAL_MODEL, 9000.0)  # Model load
+    assert first(policy, 0.0) == LOCAL
+    policy.record(LOCAL_MODEL, 600.0)
+    assert policy.latency_ms["ollama"] == 600.0
+
+
+def test_demoted_local_model_recovers():
+    policy = BackendPolicy(warmup=0, probe_interval=300.0)
+    policy.record(LOCAL_MODEL, 6000.0)
+    assert first(policy, 0.0) == REMOTE
+    assert first(policy, 299.0) == REMOTE
+
+    assert first(policy, 300.0) == LOCAL  # Probe turn
+    assert policy.stats["probes"] == 1
+    assert first(policy, 301.0) == REMOTE  # Until the probe is measured
+
+    policy.record(LOCAL_MODEL, 700.0)
+    assert first(policy, 302.0) == LOCAL
+    assert policy.latency_ms["ollama"] == 700.0
+
+
+def test_still_slow_after_probe_stays_demoted():
+    policy = BackendPolicy(warmup=0, probe_interval=300.0)
+    policy.record(LOCAL_MODEL, 6000.0)
+    assert first(policy, 0.0) == REMOTE
+    assert first(policy, 300.0) == LOCAL
+    policy.record(LOCAL_MODEL, 4000.0)
+    assert first(policy, 301.0) == REMOTE
+    assert first(policy, 600.0) == LOCAL
@@ -0,0 +1,53 @@
+"""The response cache must never answer a turn the agent has to see"""
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import ai.tools  # noqa: F401
+except ImportError:
+    # Without LangChain installed; the cache never calls the tools
+    sys.modules["ai.tools"] = types.SimpleNamespace(
+        check_vitals=None, get_medicine_schedule=None, trigger_emergency_alert=None)
+
+from ai.intent_router import IntentRouter
+from ai.response_cache import ResponseCache
+
+ANSWER = "Take your time getting up, and sit on a chair for a moment."
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(threshold=0.6, bypass=IntentRouter().needs_agent)
+    cache.store("I sat down on the kitchen floor", ANSWER, {}, 900.0)
+    return cache
+
+
+def test_paraphrase_hits(cache):
+    assert cache.lookup("sat down on the kitchen floor", {}) == ANSWER
+
+
+@pytest.mark.parametrize("text", [
+    "I fell down on the kitchen floor",
+    "help me please I sat down on the kitchen floor",
+    "I fainted and sat down on the kitchen floor",
+    "I sat down on the kitchen floor feeling dizzy",
+])
+def test_emergency_paraphrase_bypasses_cache(cache, text):
+    cache.bypass = None
+    assert cache.lookup(text, {}) == ANSWER  # Similar enough to be served without the bypass
+    cache.bypass = IntentRouter().needs_agent
+    bypassed = cache.bypassed
+    assert cache.lookup(text, {}) is None
+    assert cache.bypassed == bypassed + 1
+
+
+def test_emergency_like_answers_not_stored():
+    cache = ResponseCache(bypass=IntentRouter().needs_agent)
+    cache.store("I just fell", "Are you hurt?", {}, 900.0)
+    cache.store("help me please", "What do you need?", {}, 900.0)
+    assert cache.stats()["entries"] == 0
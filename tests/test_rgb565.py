@@ -0,0 +1,35 @@
+"""The RGB565 backend must match the PIL backend pixel for pixel, also where the eyes overlap"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "display"))
+
+from eyes import RoboEyes
+from rgb565 import to_image
+
+STATES = ["idle", "happy", "sad", "angry", "surprised", "sleepy", "curious", "love", "excited", "suspicious"]
+
+
+def make_eyes(backend, eye_spacing):
+    eyes = RoboEyes(None, eye_spacing=eye_spacing, pipelined=False, backend=backend)
+    # Deterministic: no blinks, glances or jitter
+    eyes.micro_movement_enabled = False
+    eyes.next_blink_time = float("inf")
+    return eyes
+
+
+# Default spacing (the eyes touch in the surprised transition), and closer eyes that overlap more often
+@pytest.mark.parametrize("eye_spacing", [58, 36])
+def test_matches_pil_through_transitions(eye_spacing):
+    pil, fast = make_eyes("pil", eye_spacing), make_eyes("rgb565", eye_spacing)
+    for state in STATES:
+        pil.set_state(state)
+        fast.set_state(state)
+        for frame in range(60):
+            expected = np.asarray(pil._render(1 / 60)) & np.array([0xF8, 0xFC, 0xF8], dtype=np.uint8)
+            actual = np.asarray(to_image(fast._render(1 / 60)))
+            diff = (expected != actual).any(axis=2)
+            assert not diff.any(), f"{state} frame {frame}: {diff.sum()} pixels differ near x={np.nonzero(diff)[1].min()}"
@@ -0,0 +1,59 @@
+"""Hung sync tools must not starve the tool calls that come after them"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.tools import StructuredTool
+
+from ai.tool_runner import ToolRunner
+
+
+def make_tools(release: threading.Event):
+    def stuck() -> str:
+        release.wait(5.0)
+        return "late"
+
+    def quick() -> str:
+        return "ok"
+
+    return (StructuredTool.from_function(func=stuck, name="stuck", description="Never returns in time"),
+            StructuredTool.from_function(func=quick, name="quick", description="Returns at once"))
+
+
+def test_timed_out_calls_do_not_starve_pool():
+    release = threading.Event()
+    stuck, quick = make_tools(release)
+    runner = ToolRunner(max_workers=2, default_timeout=0.1, max_stranded=3)
+
+    async def scenario():
+        hung = await asyncio.gather(runner.run(stuck, {}), runner.run(stuck, {}))
+        assert all("timed out" in result for result in hung)
+        assert runner.stranded == 2
+        # Both original workers are still stuck; the replacement pool answers
+        assert await runner.run(quick, {}) == "ok"
+
+        assert "timed out" in await runner.run(stuck, {})
+        assert runner.stranded == 3
+        # Too many stuck threads: fail at once instead of starting another
+        start = time.perf_counter()
+        result = await runner.run(quick, {})
+        assert "failed" in result and time.perf_counter() - start < 0.05
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+    deadline = time.perf_counter() + 2.0
+    while runner.stranded and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert runner.stranded == 0
+    assert runner.stats()["stuck"]["timeouts"] == 3
+    runner.shutdown()
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+try:
+    from voice.ring_buffer import RingBuffer
+    from voice.vad import frame_db
+except ImportError:
+    from ring_buffer import RingBuffer
+    from vad import frame_db
+
+logger = logging.getLogger(__name__)
+
+
+class AudioOutput:
+    """
+    Gapless speaker output fed from a ring buffer.
+
+    The sound card pulls fixed blocks from the ring buffer in PyAudio's
+    callback thread (silence when it runs dry), so playback never waits for
+    the asyncio side and consecutive chunks play back to back. Without
+    PyAudio or an output device, a pacing thread consumes the buffer in real
+    time instead, which keeps timing and metrics meaningful.
+
+    Between begin() and finish() every block that runs short after the first
+    audio counts towards a gap (consecutive short blocks form one gap).
+
+    The level of the last `history` blocks is kept with the time each was
+    handed to the device, so barge-in detection can tell Stella's own voice
+    (echoed by the mic) from the patient's (see level_between()).
+    """
+    def __init__(self, sample_rate: int = 16000, block_ms: int = 20, buffer_seconds: float = 4.0,
+                 history: int = 64):
+        """
+        Args:
+            sample_rate: 16-bit mono PCM sample rate
+            block_ms: Samples handed to the sound card per callback
+            buffer_seconds: Ring buffer capacity
+            history: Played blocks whose level is remembered
+        """
+        self.sample_rate = sample_rate
+        self.block = sample_rate * block_ms // 1000
+        self.ring = RingBuffer(int(sample_rate * buffer_seconds))
+        self._carry = b""
+
+        self._pa = None
+        self._stream = None
+        self._thread = None
+        self._running = False
+
+        # Per-utterance metrics (written by the audio thread)
+        self.first_audio_at: Optional[float] = None
+        self.gaps: list[float] = []
+        self._awaiting_first = False
+        self._active = False
+        self._in_gap = False
+
+        # Playback level per block (dBFS) and when it was handed to the device
+        self._levels = np.full(history, -90.0)
+        self._level_times = np.zeros(history)
+        self._pulled = 0
+
+    @property
+    def simulated(self) -> bool:
+        return self._stream is None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        try:
+            import pyaudio
+            self._pa = pyaudio.PyAudio()
+            self._stream = self._pa.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=self.sample_rate,
+                output=True,
+                frames_per_buffer=self.block,
+                stream_callback=self._callback,
+            )
+            self._stream.start_stream()
+            logger.info(f"Audio output started ({self.sample_rate} Hz, {self.block}-sample blocks)")
+        except Exception as e:
+            logger.warning(f"No audio output device ({e}); using simulated playback")
+            self._stream = None
+            self._thread = threading.Thread(target=self._simulate, name="audio-out", daemon=True)
+            self._thread.start()
+
+    def _pull(self, frames: int) -> np.ndarray:
+        out = np.zeros(frames, dtype=np.int16)
+        n = self.ring.read(out)
+        if n and self._awaiting_first:
+            self.first_audio_at = time.perf_counter()
+            self._awaiting_first = False
+        if self._active and self.first_audio_at is not None and n < frames:
+            if self._in_gap:
+                self.gaps[-1] += (frames - n) / self.sample_rate
+            else:
+                self.gaps.append((frames - n) / self.sample_rate)
+            self._in_gap = True
+        elif n == frames:
+            self._in_gap = False
+        i = self._pulled % len(self._levels)
+        self._levels[i] = frame_db(out[:n]) if n else -90.0
+        self._level_times[i] = time.perf_counter()
+        self._pulled += 1
+        return out
+
+    def level_between(self, start: float, end: float) -> float:
+        """Loudest block (dBFS) handed to the device between two perf_counter() times"""
+        played = (self._level_times >= start) & (self._level_times <= end)
+        return float(self._levels[played].max()) if played.any() else -90.0
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        import pyaudio
+        return self._pull(frame_count).tobytes(), pyaudio.paContinue
+
+    def _simulate(self):
+        period = self.block / self.sample_rate
+        deadline = time.perf_counter()
+        while self._running:
+            self._pull(self.block)
+            deadline += period
+            time.sleep(max(deadline - time.perf_counter(), 0.0))
+
+    # ===== Feeding (asyncio side) ===== #
+
+    def begin(self):
+        """Start measuring a new utterance"""
+        self.first_audio_at = None
+        self.gaps = []
+        self._in_gap = False
+        self._awaiting_first = True
+        self._active = True
+
+    def finish(self):
+        """No more audio for this utterance; the buffer running dry is no longer a gap"""
+        self._active = False
+
+    async def write(self, pcm: bytes):
+        """Queue 16-bit PCM, waiting while the ring buffer is full"""
+        pcm = self._carry + pcm
+        if len(pcm) % 2:
+            pcm, self._carry = pcm[:-1], pcm[-1:]
+        else:
+            self._carry = b""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        offset = 0
+        while offset < len(samples):
+            offset += self.ring.write(samples[offset:])
+            if offset < len(samples):
+                await asyncio.sleep(self.block / self.sample_rate)
+
+    async def drain(self):
+        """Wait until everything queued has been played"""
+        while self.ring.available():
+            await asyncio.sleep(self.block / self.sample_rate)
+
+    def flush(self):
+        """Drop queued audio immediately (safe from any thread)"""
+        self._carry = b""
+        self.ring.clear()
+
+    def buffered_ms(self) -> float:
+        return self.ring.available() * 1000.0 / self.sample_rate
+
+    def close(self):
+        self._running = False
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._pa.terminate()
+            self._stream = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+try:
+    from voice.vad import EnergyVAD, frame_db
+except ImportError:
+    from vad import EnergyVAD, frame_db
+
+logger = logging.getLogger(__name__)
+
+
+class EchoGate:
+    """
+    Playback-referenced speech threshold (a Geigel-style double-talk test).
+
+    While Stella talks, the mic hears her voice at about the playback level
+    plus the speaker-to-mic coupling. A frame only counts as the patient's
+    speech when it is `margin_db` above that expected echo. The coupling is
+    learned from frames that stay below the gate: it rises quickly when the
+    echo gets louder and decays slowly, so the gate errs on the high side.
+    It starts at `coupling_db` (echo as loud as the playback).
+    """
+    def __init__(self, output, margin_db: float = 6.0, window: float = 0.25, coupling_db: float = 0.0,
+                 silence_db: float = -80.0):
+        """
+        Args:
+            output: AudioOutput that plays Stella's voice (level_between())
+            margin_db: Level above the expected echo that counts as speech
+            window: Playback considered for one mic frame (output latency +
+                    acoustic delay + echo tail), in seconds
+            coupling_db: Initial speaker-to-mic coupling estimate
+            silence_db: Playback below this is treated as silence (no gate)
+        """
+        self.output = output
+        self.margin_db = margin_db
+        self.window = window
+        self.coupling_db = coupling_db
+        self.silence_db = silence_db
+
+    def gate(self, start: float, end: float) -> Optional[float]:
+        """Threshold (dBFS) for a mic frame captured between two perf_counter() times"""
+        playback = self.output.level_between(start - self.window, end)
+        if playback < self.silence_db:
+            return None
+        return playback + self.coupling_db + self.margin_db
+
+    def learn(self, level: float, start: float, end: float):
+        """Update the coupling from a mic frame judged to be echo only"""
+        playback = self.output.level_between(start - self.window, end)
+        if playback < self.silence_db:
+            return
+        coupling = level - playback
+        rate = 0.3 if coupling > self.coupling_db else 0.05
+        self.coupling_db += rate * (coupling - self.coupling_db)
+
+
+class BargeInMonitor:
+    """
+    Stops Stella mid-sentence when the patient starts talking.
+
+    watch() runs next to playback: it reads live frames from the shared
+    MicCapture, and when the VAD detects speech onset it calls
+    VoiceSystem.interrupt(). That flushes the output ring buffer at once and
+    cancels the playback task, which cancels in-flight synthesis and closes
+    the text stream (chunker, then the agent's event stream). Speaker and mic
+    sit in the same robot, so the VAD threshold is also raised to the
+    expected echo of what AudioOutput is playing (EchoGate): Stella's own
+    voice alone doesn't trigger it, the patient talking over it does.
+
+    Each barge-in is recorded in `events` with how long detection took after
+    the first loud frame (detect_ms) and how long stopping took (stop_ms).
+    """
+    def __init__(self, tts, capture, vad: Optional[EnergyVAD] = None, echo: Optional[EchoGate] = None):
+        """
+        Args:
+            tts: VoiceSystem to interrupt
+            capture: Running MicCapture
+            vad: Onset detector (default: EnergyVAD with an 18 dB margin over
+                 the capture's noise floor)
+            echo: Playback-referenced gate (default: EchoGate on tts.output)
+        """
+        self.tts = tts
+        self.capture = capture
+        self.vad = vad or EnergyVAD(margin_db=18.0, floor=lambda: capture.noise_floor)
+        output = getattr(tts, "output", None)
+        self.echo = echo or (EchoGate(output) if output is not None else None)
+        self.frame_ms = capture.frame * 1000 / capture.sample_rate
+        self.events: list[dict] = []
+        self.available = True
+        self.triggered = False  # Set on detection, before stopping completes
+        self.onset: Optional[int] = None  # Capture position where the patient started talking
+
+    @property
+    def last_event(self) -> Optional[dict]:
+        return self.events[-1] if self.events else None
+
+    async def watch(self) -> bool:
+        """Monitor until playback ends; returns True if the patient barged in"""
+        if not self.available or not self.capture.running:
+            return False
+        self.vad.reset()
+        self.triggered = False
+        self.onset = None
+        reader = self.capture.reader()
+        source = reader.frames()
+        try:
+            async for captured, frame in source:
+                if not self.tts.is_speaking:
+                    continue
+                gate = None
+                if self.echo is not None:
+                    start = captured - self.frame_ms / 1000.0
+                    gate = self.echo.gate(start, captured)
+                    level = frame_db(frame)
+                    if gate is not None and level <= gate:
+                        self.echo.learn(level, start, captured)
+                if self.vad.process(frame, gate_db=gate):
+                    detected = time.perf_counter()
+                    self.onset = reader.position - self.vad.onset_frames * self.capture.frame
+                    self.triggered = True
+                    # Onset was the first of the loud frames the VAD waited for
+                    onset = captured - (self.vad.onset_frames - 1) * self.frame_ms / 1000.0
+                    stop_ms = await self.tts.interrupt()
+                    event = {
+                        "detect_ms": (detected - onset) * 1000.0,
+                        "stop_ms": stop_ms,
+                        "total_ms": (time.perf_counter() - onset) * 1000.0,
+                    }
+                    self.events.append(event)
+                    logger.info(f"Barge-in: detected {event['detect_ms']:.0f} ms after onset, "
+                                f"speech stopped in {stop_ms:.1f} ms")
+                    return True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.available = False
+            logger.warning(f"Barge-in disabled: {e}")
+        finally:
+            await source.aclose()
+        return False
+
+    def stats(self) -> dict:
+        stops = [e["stop_ms"] for e in self.events]
+        totals = [e["total_ms"] for e in self.events]
+        return {
+            "barge_ins": len(self.events),
+            "stop_ms_avg": float(np.mean(stops)) if stops else None,
+            "stop_ms_max": max(stops) if stops else None,
+            "total_ms_avg": float(np.mean(totals)) if totals else None,
+        }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Stella Nurse - Speech Recognition Benchmark
+Plays recorded WAV fixtures (each `name.wav` with its reference transcript in
+`name.txt`) through the recognizers at real-time pace and reports word error
+rate, time to the first partial transcript (from the start of the audio) and
+final-transcript latency (from the end of the audio). Exits non-zero when the
+--max-wer or --max-final-ms gate fails.
+
+    python3 voice/benchmark_stt.py data/stt_fixtures
+    python3 voice/benchmark_stt.py data/stt_fixtures --backend vosk google --max-wer 0.2
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+import sys
+import time
+import wave
+from functools import partial
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.local_stt import LocalRecognizer
+
+SAMPLE_RATE = 16000
+FRAME = SAMPLE_RATE // 50  # 20 ms, as delivered by MicCapture
+
+
+def load_wav(path: str) -> np.ndarray:
+    """16-bit mono samples at SAMPLE_RATE"""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        rate, channels = f.getframerate(), f.getnchannels()
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        count = int(len(samples) * SAMPLE_RATE / rate)
+        samples = np.interp(np.linspace(0, len(samples) - 1, count), np.arange(len(samples)), samples)
+    return samples.astype(np.int16)
+
+
+def load_fixtures(directory: str) -> list[tuple[str, np.ndarray, str]]:
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+        reference = os.path.splitext(path)[0] + ".txt"
+        if not os.path.exists(reference):
+            print(f"⚠️  {os.path.basename(path)}: no transcript, skipped")
+            continue
+        with open(reference) as f:
+            fixtures.append((os.path.basename(path), load_wav(path), f.read()))
+    return fixtures
+
+
+def words(text: str) -> list[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def edit_distance(reference: list[str], hypothesis: list[str]) -> int:
+    """Word-level Levenshtein distance (substitutions + deletions + insertions)"""
+    row = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        previous, row[0] = row[0], i
+        for j, hyp in enumerate(hypothesis, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (ref != hyp))
+    return row[-1]
+
+
+async def run_local(recognizer: LocalRecognizer, samples: np.ndarray, realtime: bool) -> dict:
+    first_partial = []
+
+    def on_partial(text):
+        if not first_partial:
+            first_partial.append(time.perf_counter())
+
+    start = time.perf_counter()
+    recognizer.begin(on_partial)
+    for offset in range(0, len(samples), FRAME):
+        recognizer.feed(samples[offset:offset + FRAME])
+        if realtime:
+            # Pace against the clock, like a live microphone
+            await asyncio.sleep(max(start + (offset + FRAME) / SAMPLE_RATE - time.perf_counter(), 0))
+        else:
+            await asyncio.sleep(0)
+    end = time.perf_counter()
+    text = await recognizer.finish(timeout=30.0)
+    return {
+        "text": text,
+        "first_partial_ms": (first_partial[0] - start) * 1000.0 if first_partial else None,
+        "final_ms": (time.perf_counter() - end) * 1000.0,
+    }
+
+
+async def run_google(samples: np.ndarray) -> dict:
+    import speech_recognition as sr
+    recognizer = sr.Recognizer()
+    audio = sr.AudioData(samples.tobytes(), SAMPLE_RATE, 2)
+    start = time.perf_counter()
+    try:
+        text = await asyncio.get_running_loop().run_in_executor(None, partial(recognizer.recognize_google, audio))
+    except sr.UnknownValueError:
+        text = ""
+    return {"text": text, "first_partial_ms": None, "final_ms": (time.perf_counter() - start) * 1000.0}
+
+
+def summarize(rows: list[dict]) -> dict:
+    reference_words = sum(row["reference_words"] for row in rows)
+    final = np.array([row["final_ms"] for row in rows])
+    partials = [row["first_partial_ms"] for row in rows if row["first_partial_ms"] is not None]
+    return {
+        "files": len(rows),
+        "wer": sum(row["errors"] for row in rows) / max(reference_words, 1),
+        "first_partial_p50_ms": float(np.percentile(partials, 50)) if partials else None,
+        "final_p50_ms": float(np.percentile(final, 50)),
+        "final_p95_ms": float(np.percentile(final, 95)),
+    }
+
+
+async def benchmark(args) -> dict:
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        sys.exit(f"No .wav fixtures with .txt transcripts in {args.fixtures}")
+
+    results = {}
+    for backend in args.backend:
+        recognizer = None
+        if backend == "vosk":
+            recognizer = LocalRecognizer(model_path=args.model, sample_rate=SAMPLE_RATE)
+            start = time.perf_counter()
+            if not await recognizer.start():
+                sys.exit(f"Could not load the Vosk model from {recognizer.model_path}")
+            load_s = time.perf_counter() - start
+
+        rows = []
+        try:
+            for name, samples, reference in fixtures:
+                if backend == "vosk":
+                    row = await run_local(recognizer, samples, not args.fast)
+                else:
+                    row = await run_google(samples)
+                ref = words(reference)
+                row.update(file=name, reference_words=len(ref), errors=edit_distance(ref, words(row["text"])))
+                rows.append(row)
+        finally:
+            if recognizer is not None:
+                recognizer.stop()
+
+        results[backend] = summarize(rows)
+        if backend == "vosk":
+            results[backend]["model_load_s"] = load_s
+        if args.verbose:
+            results[backend]["rows"] = rows
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech recognition accuracy and latency")
+    parser.add_argument("fixtures", help="Directory of name.wav + name.txt pairs")
+    parser.add_argument("--backend", nargs="+", choices=["vosk", "google"], default=["vosk"])
+    parser.add_argument("--model", help="Vosk model directory (default STELLA_VOSK_MODEL)")
+    parser.add_argument("--fast", action="store_true", help="Feed audio as fast as possible, not in real time")
+    parser.add_argument("--max-wer", type=float, help="Fail if any backend's WER exceeds this")
+    parser.add_argument("--max-final-ms", type=float, help="Fail if any backend's final p95 exceeds this")
+    parser.add_argument("--verbose", action="store_true", help="Per-file transcripts and timings")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("🎙️ Speech recognition benchmark")
+        print("=" * 50)
+        for backend, summary in results.items():
+            print(f"{backend} ({summary['files']} files)")
+            if "model_load_s" in summary:
+                print(f"  Model load:         {summary['model_load_s']:.1f} s")
+            print(f"  WER:                {summary['wer']:.1%}")
+            if summary["first_partial_p50_ms"] is not None:
+                print(f"  First partial p50:  {summary['first_partial_p50_ms']:.0f} ms after audio start")
+            print(f"  Final p50/p95:      {summary['final_p50_ms']:.0f} / {summary['final_p95_ms']:.0f} ms"
+                  f" after audio end")
+            for row in summary.get("rows", []):
+                print(f"    {row['file']}: {row['errors']}/{row['reference_words']} errors, "
+                      f"{row['final_ms']:.0f} ms - {row['text']}")
+
+    failed = False
+    for backend, summary in results.items():
+        if args.max_wer is not None and summary["wer"] > args.max_wer:
+            print(f"❌ {backend} WER {summary['wer']:.1%} above gate {args.max_wer:.1%}")
+            failed = True
+        if args.max_final_ms is not None and summary["final_p95_ms"] > args.max_final_ms:
+            print(f"❌ {backend} final p95 {summary['final_p95_ms']:.0f} ms above gate {args.max_final_ms}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import re
+from typing import AsyncGenerator, AsyncIterable
+
+logger = logging.getLogger(__name__)
+
+# Punctuation followed by whitespace; "98.6" or "e.g" mid-token don't match
+SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+")
+CLAUSE_END = re.compile(r"[,;:—–]\s+")
+
+
+class SpeechChunker:
+    """
+    Groups streamed tokens into speakable units for TTS.
+
+    A unit ends at a sentence or clause boundary once it holds at least
+    min_chars, is cut at a word boundary when it reaches max_chars, and
+    whatever is buffered gets flushed when no token arrives for
+    flush_timeout seconds (e.g. while the agent is running a tool).
+    """
+    def __init__(self, min_chars: int = 12, max_chars: int = 180, flush_timeout: float = 0.7):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.flush_timeout = flush_timeout
+        self._buffer = ""
+
+    def _take(self, end: int) -> str:
+        piece, self._buffer = self._buffer[:end].strip(), self._buffer[end:]
+        return piece
+
+    def _split(self):
+        """Yield every complete unit currently in the buffer"""
+        while True:
+            end = None
+            for pattern in (SENTENCE_END, CLAUSE_END):
+                for m in pattern.finditer(self._buffer):
+                    if m.end() >= self.min_chars:
+                        end = m.end() if end is None else min(end, m.end())
+                        break
+            if end is None and len(self._buffer) >= self.max_chars:
+                # No boundary in sight: cut at the last space (or hard cut)
+                space = self._buffer.rfind(" ", 0, self.max_chars)
+                end = space + 1 if space > 0 else self.max_chars
+            if end is None:
+                return
+            piece = self._take(end)
+            if piece:
+                yield piece
+
+    def _flush_words(self) -> str:
+        """Flush on timeout, keeping a possibly unfinished last word"""
+        if self._buffer[-1:].isspace() or self._buffer[-1:] in ".!?,;:":
+            return self._take(len(self._buffer))
+        space = self._buffer.rfind(" ")
+        return self._take(space + 1) if space > 0 else ""
+
+    async def stream(self, tokens: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+        """Consume a token stream and yield speakable chunks"""
+        self._buffer = ""
+        source = tokens.__aiter__()
+        pending = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(source.__anext__())
+                # asyncio.wait (unlike wait_for) leaves the pending read alive on timeout
+                timeout = self.flush_timeout if self._buffer.strip() else None
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    piece = self._flush_words()
+                    if piece:
+                        logger.debug(f"Chunker timeout flush: {piece!r}")
+                        yield piece
+                    continue
+
+                task, pending = pending, None
+                try:
+                    self._buffer += task.result()
+                except StopAsyncIteration:
+                    break
+                for piece in self._split():
+                    yield piece
+
+            tail = self._take(len(self._buffer))
+            if tail:
+                yield tail
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+            # Stop the upstream generator too (e.g. speech was interrupted)
+            if hasattr(source, "aclose"):
+                await source.aclose()
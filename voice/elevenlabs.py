@@ -1,68 +1,132 @@
 import asyncio
 import logging
-from typing import AsyncGenerator
+import os
+import time
+from typing import AsyncGenerator, Optional
+
+try:
+    from voice.audio_output import AudioOutput
+    from voice.tts_engine import ElevenLabsSynthesizer, SimulatedSynthesizer, StreamingTTS
+    from voice.phrase_cache import DEFAULT_PATH as DEFAULT_CACHE_PATH, CachingSynthesizer, PhraseCache
+except ImportError:
+    from audio_output import AudioOutput
+    from tts_engine import ElevenLabsSynthesizer, SimulatedSynthesizer, StreamingTTS
+    from phrase_cache import DEFAULT_PATH as DEFAULT_CACHE_PATH, CachingSynthesizer, PhraseCache
 
 logger = logging.getLogger(__name__)
 
 class VoiceSystem:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, prefetch: int = 2, cache_dir: Optional[str] = None):
         self.api_key = api_key
         self.voice_id = "21m00Tcm4TlvDq8ikWAM" # Default voice
         self.is_speaking = False
+        # Recurring phrases play from disk (no request, works offline)
+        self.cache = None
+        synthesizer = self._make_synthesizer()
+        if api_key and os.getenv("STELLA_TTS_CACHE", "") != "0":
+            self.cache = PhraseCache(cache_dir or os.getenv("STELLA_TTS_CACHE") or DEFAULT_CACHE_PATH)
+            synthesizer = CachingSynthesizer(synthesizer, self.cache)
+        # Persistent session + ring-buffered output; synthesis runs `prefetch` chunks ahead of playback
+        self.output = AudioOutput()
+        self.engine = StreamingTTS(synthesizer, self.output, prefetch=prefetch)
+        self._playback = None
+        self._stopping = False
+        self.last_stop_ms = None
         logger.info("Voice system initialized")
-    
+
+    def _make_synthesizer(self):
+        if not self.api_key:
+            return SimulatedSynthesizer()
+        return ElevenLabsSynthesizer(self.api_key, self.voice_id)
+
     async def initialize(self):
         """Initialize ElevenLabs connection"""
         if not self.api_key:
              logger.warning("ElevenLabs API Key missing!")
         logger.info("Initializing ElevenLabs voice system...")
-    
+        self.output.start()
+        try:
+            await self.engine.synthesizer.open()
+        except Exception as e:
+            logger.error(f"Could not open TTS session ({e}); using simulated speech")
+            if self.cache is not None:
+                self.engine.synthesizer.fallback = SimulatedSynthesizer()  # Cached phrases still play
+            else:
+                self.engine.synthesizer = SimulatedSynthesizer()
+
+    @property
+    def last_metrics(self):
+        """First-audio latency, per-chunk time to first byte and gaps of the last utterance"""
+        return self.engine.last_metrics
+
+    async def warm_cache(self, phrases: list[str]) -> int:
+        """Pre-render phrases into the phrase cache; returns how many were added"""
+        if self.cache is None:
+            return 0
+        await self.engine.synthesizer.open()
+        return await self.engine.synthesizer.warm(phrases)
+
     async def speak(self, text: str):
         """Convert text to speech and play fully"""
         logger.info(f"Speaking: {text}")
-        self.is_speaking = True
-        try:
-            # audio = generate(text=text, voice=self.voice_id, model="eleven_monolingual_v1")
-            # play(audio)
-            await asyncio.sleep(len(text) * 0.05) # Simulation
-        finally:
-            self.is_speaking = False
-            
+
+        async def single():
+            yield text
+
+        await self.stream_audio(single())
+
     async def stream_audio(self, text_iterator: AsyncGenerator[str, None]):
         """
         Consumes a text generator and streams audio.
         Handles interruption checking.
         """
         logger.info("Starting audio stream...")
+        self.output.start()
         self.is_speaking = True
+        self._stopping = False
+        self._playback = asyncio.ensure_future(self.engine.play(text_iterator))
         try:
-            async for text_chunk in text_iterator:
-                if not self.is_speaking: 
-                    # Interrupted externally
-                    logger.info("TTS Interrupted!")
-                    break
-                if not text_chunk.strip():
-                    continue
-                    
-                # logger.debug(f"Streaming chunk: {text_chunk}")
-                # audio_stream = generate(text=text_chunk, stream=True, ...)
-                # stream(audio_stream) 
-                
-                # Simulation of playback time per chunk
-                await asyncio.sleep(len(text_chunk) * 0.05)
-                
+            await self._playback
+        except asyncio.CancelledError:
+            if not self._stopping:
+                raise
+            # Interrupted externally
+            logger.info("TTS Interrupted!")
         except Exception as e:
             logger.error(f"Error in TTS stream: {e}")
         finally:
+            self._playback = None
             self.is_speaking = False
-            
+
+    async def interrupt(self) -> float:
+        """Stop speaking and wait until playback, synthesis and the text stream are cancelled; returns ms taken"""
+        start = time.perf_counter()
+        playback = self._playback
+        self.stop()
+        if playback is not None:
+            await asyncio.wait({playback})
+        self.last_stop_ms = (time.perf_counter() - start) * 1000.0
+        return self.last_stop_ms
+
     def stop(self):
-        """Interrupts speech"""
+        """Interrupts speech: queued audio is dropped at once and playback is cancelled"""
         if self.is_speaking:
             logger.info("Stopping speech output.")
             self.is_speaking = False
-            
+            self._stopping = True
+            self.output.flush()
+            if self._playback is not None:
+                self._playback.cancel()
+
     async def set_voice(self, voice_id: str):
         """Set the voice ID to use"""
         self.voice_id = voice_id
+        synthesizer = getattr(self.engine.synthesizer, "inner", self.engine.synthesizer)
+        if isinstance(synthesizer, ElevenLabsSynthesizer):
+            synthesizer.voice_id = voice_id
         logger.info(f"Voice set to: {voice_id}")
+
+    async def close(self):
+        self.stop()
+        await self.engine.synthesizer.close()
+        self.output.close()
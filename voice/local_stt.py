@@ -0,0 +1,173 @@
+import asyncio
+import json
+import logging
+import multiprocessing as mp
+import os
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "assets", "models", "vosk-model-small-en-us-0.15")
+
+
+def _worker(model_path: str, sample_rate: int, inbox, outbox):
+    """Recognizer process: audio in, partial and final transcripts out (tagged with the utterance number)"""
+    try:
+        from vosk import KaldiRecognizer, Model, SetLogLevel
+        SetLogLevel(-1)
+        recognizer = KaldiRecognizer(Model(model_path), sample_rate)
+    except Exception as e:
+        outbox.put(("error", 0, str(e)))
+        return
+    outbox.put(("ready", 0, None))
+
+    utterance = None
+    segments = []  # Text of segments Vosk already finalized inside this utterance
+    last_partial = ""
+    while True:
+        kind, seq, data = inbox.get()
+        if kind == "stop":
+            break
+        if seq != utterance:
+            # First message of a new utterance: drop what's left of an abandoned one
+            recognizer.Reset()
+            utterance = seq
+            segments = []
+            last_partial = ""
+        if kind == "audio":
+            if recognizer.AcceptWaveform(data):
+                text = json.loads(recognizer.Result()).get("text", "")
+                if text:
+                    segments.append(text)
+                partial = ""
+            else:
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+            current = " ".join(segments + [partial]).strip()
+            if current and current != last_partial:
+                last_partial = current
+                outbox.put(("partial", seq, current))
+        elif kind == "end":
+            text = json.loads(recognizer.FinalResult()).get("text", "")
+            outbox.put(("final", seq, " ".join(segments + [text]).strip()))
+            segments = []
+            last_partial = ""
+
+
+class LocalRecognizer:
+    """
+    Offline streaming speech recognition (Vosk, CPU only) in a worker process.
+
+    Recognition runs in its own process so decoding never competes with
+    the event loop for the GIL. Audio is fed while the patient is still
+    talking; partial transcripts arrive through `on_partial` and finish()
+    returns the final text as soon as the last audio has been decoded.
+    """
+    def __init__(self, model_path: Optional[str] = None, sample_rate: int = 16000):
+        """
+        Args:
+            model_path: Unpacked Vosk model directory (STELLA_VOSK_MODEL, or a
+                        small English model under assets/models)
+            sample_rate: Rate of the audio fed in (16-bit mono)
+        """
+        self.model_path = model_path or os.getenv("STELLA_VOSK_MODEL", DEFAULT_MODEL_PATH)
+        self.sample_rate = sample_rate
+        self.ready = False
+        self.on_partial: Optional[Callable[[str], None]] = None
+
+        self._process = None
+        self._inbox = None
+        self._outbox = None
+        self._listener = None
+        self._loop = None
+        self._ready: Optional[asyncio.Future] = None
+        self._final: Optional[asyncio.Future] = None
+        self._utterance = 0  # Replies for other utterances (e.g. one that timed out) are dropped
+
+    async def start(self) -> bool:
+        """Launch the worker and wait for the model to load; False if it can't"""
+        if self.ready:
+            return True
+        if not os.path.isdir(self.model_path):
+            logger.warning(f"Vosk model not found at {self.model_path}")
+            return False
+        ctx = mp.get_context("spawn")
+        self._inbox = ctx.Queue()
+        self._outbox = ctx.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._ready = self._loop.create_future()
+        self._process = ctx.Process(target=_worker, name="stt-worker", daemon=True,
+                                    args=(self.model_path, self.sample_rate, self._inbox, self._outbox))
+        self._process.start()
+        self._listener = threading.Thread(target=self._listen, name="stt-results", daemon=True)
+        self._listener.start()
+        try:
+            while not self._ready.done():
+                # The worker can die before reporting (e.g. out of memory loading the model)
+                if not self._process.is_alive():
+                    raise RuntimeError(f"worker exited with code {self._process.exitcode}")
+                await asyncio.wait({self._ready}, timeout=0.5)
+            self._ready.result()
+        except RuntimeError as e:
+            logger.warning(f"Local recognizer unavailable: {e}")
+            self.stop()
+            return False
+        self.ready = True
+        logger.info(f"Local recognizer ready ({os.path.basename(self.model_path)})")
+        return True
+
+    def _listen(self):
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                break
+            self._loop.call_soon_threadsafe(self._dispatch, *message)
+
+    def _dispatch(self, kind: str, seq: int, data):
+        if kind in ("partial", "final") and seq != self._utterance:
+            return
+        if kind == "ready":
+            self._ready.set_result(None)
+        elif kind == "error":
+            if not self._ready.done():
+                self._ready.set_exception(RuntimeError(data))
+        elif kind == "partial":
+            if self._final is not None and self.on_partial:
+                self.on_partial(data)
+        elif kind == "final":
+            if self._final is not None and not self._final.done():
+                self._final.set_result(data)
+
+    def begin(self, on_partial: Optional[Callable[[str], None]] = None):
+        """Start a new utterance"""
+        self.on_partial = on_partial
+        self._utterance += 1
+        self._final = self._loop.create_future()
+
+    def feed(self, samples: np.ndarray):
+        """Queue 16-bit samples for recognition (never blocks)"""
+        self._inbox.put(("audio", self._utterance, samples.tobytes()))
+
+    async def finish(self, timeout: float = 5.0) -> str:
+        """Final transcript of the utterance"""
+        self._inbox.put(("end", self._utterance, None))
+        try:
+            return await asyncio.wait_for(self._final, timeout)
+        finally:
+            self._final = None
+
+    def stop(self):
+        self.ready = False
+        if self._process is not None:
+            self._inbox.put(("stop", 0, None))
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._listener is not None:
+            self._outbox.put(None)
+            self._listener.join(timeout=1.0)
+            self._listener = None
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import AsyncIterator, Optional
+
+import numpy as np
+
+try:
+    from voice.vad import frame_db
+except ImportError:
+    from vad import frame_db
+
+logger = logging.getLogger(__name__)
+
+
+class MicReader:
+    """
+    One consumer's cursor into a MicCapture buffer.
+
+    Readers never block the capture thread or each other; a reader that
+    falls more than the buffer length behind skips ahead (counted in
+    `overruns`).
+    """
+    def __init__(self, capture: "MicCapture", position: int):
+        self.capture = capture
+        self.position = position
+        self.overruns = 0
+
+    def available(self) -> int:
+        return self.capture.position - self.position
+
+    def seek_back(self, seconds: float):
+        """Move the cursor to `seconds` before the newest sample (e.g. pre-roll)"""
+        self.position = max(self.capture.position - int(seconds * self.capture.sample_rate),
+                            self.capture.oldest)
+
+    def skip_to_now(self):
+        self.position = self.capture.position
+
+    def read(self, count: Optional[int] = None) -> np.ndarray:
+        """Up to `count` new samples (all available by default) as a view into the buffer"""
+        oldest = self.capture.oldest
+        if self.position < oldest:
+            self.overruns += 1
+            self.position = oldest
+        end = self.capture.position
+        if count is not None:
+            end = min(end, self.position + count)
+        view = self.capture.view(self.position, end)
+        self.position = end
+        return view
+
+    async def frames(self) -> AsyncIterator[tuple[float, np.ndarray]]:
+        """(capture time, frame view) for every new frame, waiting for the capture thread"""
+        frame = self.capture.frame
+        while True:
+            while self.available() < frame:
+                await self.capture.wait()
+            if self.position < self.capture.oldest:
+                self.overruns += 1
+                self.position = self.capture.oldest
+            start = self.position
+            self.position += frame
+            yield self.capture.time_of(start + frame), self.capture.view(start, start + frame)
+
+
+class MicCapture:
+    """
+    Always-on microphone capture shared by wake word, VAD, STT and barge-in.
+
+    One thread reads fixed frames from the input device into a mirrored
+    ring buffer: every sample is written at i and i + capacity, so any
+    window up to `capacity` samples is contiguous and readers get NumPy
+    views instead of copies. Sample positions are absolute and only grow;
+    the writer publishes the new position after the frame is in place, so
+    readers need no lock. Each reader keeps its own cursor (see MicReader).
+
+    The ambient noise floor (dBFS) is tracked on every frame, so no
+    per-turn calibration is needed.
+    """
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, buffer_seconds: float = 30.0):
+        """
+        Args:
+            sample_rate: Capture rate (16-bit mono)
+            frame_ms: Frame length read from the device and handed to readers
+            buffer_seconds: History kept for readers that fall behind
+        """
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * frame_ms // 1000
+        self.capacity = int(sample_rate * buffer_seconds) // self.frame * self.frame
+        self._buf = np.zeros(2 * self.capacity, dtype=np.int16)
+        self.position = 0
+        self.noise_floor = -60.0
+        self.level = -90.0  # Level of the newest frame
+
+        self._last_time = time.perf_counter()
+        self._pa = None
+        self._stream = None
+        self._thread = None
+        self._running = False
+        self._loop = None
+        self._waiter = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def oldest(self) -> int:
+        """Oldest sample position still in the buffer"""
+        return max(self.position - self.capacity, 0)
+
+    def start(self) -> bool:
+        """Open the input device and start capturing; False if there is no microphone"""
+        if self._running:
+            return True
+        try:
+            import pyaudio
+            self._pa = pyaudio.PyAudio()
+            self._stream = self._pa.open(format=pyaudio.paInt16, channels=1, rate=self.sample_rate,
+                                         input=True, frames_per_buffer=self.frame)
+        except Exception as e:
+            logger.warning(f"Microphone capture unavailable: {e}")
+            if self._pa is not None:
+                self._pa.terminate()
+                self._pa = None
+            return False
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._running = True
+        self._thread = threading.Thread(target=self._capture, name="mic-capture", daemon=True)
+        self._thread.start()
+        logger.info(f"Microphone capture started ({self.sample_rate} Hz, "
+                    f"{self.capacity / self.sample_rate:.0f} s buffer)")
+        return True
+
+    def _capture(self):
+        while self._running:
+            try:
+                data = self._stream.read(self.frame, exception_on_overflow=False)
+            except Exception as e:
+                logger.error(f"Microphone read failed: {e}")
+                time.sleep(0.1)
+                continue
+            self.write(np.frombuffer(data, dtype=np.int16))
+
+    def write(self, frame: np.ndarray):
+        """
+        Append samples (capture thread; also used to feed recorded audio).
+        Chunks of any length are accepted: a chunk that crosses the end of
+        the buffer is split there, and only the last `capacity` samples of
+        an oversized chunk are kept.
+        """
+        kept = frame[-self.capacity:]
+        start = (self.position + len(frame) - len(kept)) % self.capacity
+        first = min(len(kept), self.capacity - start)
+        for offset in (0, self.capacity):
+            self._buf[offset + start:offset + start + first] = kept[:first]
+            self._buf[offset:offset + len(kept) - first] = kept[first:]
+        self._last_time = time.perf_counter()
+        self.position += len(frame)  # Publish after the data is in place
+
+        self.level = frame_db(frame)
+        # Minimum tracking: falls quickly to quiet frames, rises slowly through speech
+        rate = 0.01 if self.level > self.noise_floor else 0.3
+        self.noise_floor += rate * (self.level - self.noise_floor)
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait(self):
+        """Resolve when the next frame has been captured"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        if self._waiter is None:
+            self._waiter = self._loop.create_future()
+        await asyncio.shield(self._waiter)
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Samples [start, end) without copying (valid until overwritten, buffer_seconds later)"""
+        offset = start % self.capacity
+        return self._buf[offset:offset + (end - start)]
+
+    def time_of(self, position: int) -> float:
+        """perf_counter() time at which a sample position was captured"""
+        return self._last_time - (self.position - position) / self.sample_rate
+
+    def reader(self, preroll: float = 0.0) -> MicReader:
+        """A new consumer cursor starting `preroll` seconds in the past"""
+        reader = MicReader(self, self.position)
+        if preroll:
+            reader.seek_back(preroll)
+        return reader
+
+    def frames(self) -> AsyncIterator[tuple[float, np.ndarray]]:
+        """Frames from now on, for a consumer that only needs live audio"""
+        return self.reader().frames()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._pa.terminate()
+            self._stream = None
+            self._pa = None
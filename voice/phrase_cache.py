@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Stella Nurse - Phrase TTS Cache
+Content-addressed cache of synthesized phrases on disk, so recurring
+utterances (greetings, reminders, fallbacks, emergency confirmations) play
+without a synthesis request.
+
+Warm up the cache with the fixed phrases (and optionally a phrase file):
+
+    python3 -m voice.phrase_cache
+    python3 -m voice.phrase_cache --phrases my_phrases.txt
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tts_cache")
+EXT = ".pcm.z"
+
+
+def normalize(text: str) -> str:
+    """Whitespace and case differences don't change the audio"""
+    return " ".join(text.split()).lower()
+
+
+class PhraseCache:
+    """
+    zlib-compressed 16-bit PCM per phrase under `root`, named by
+    sha256(voice_id, model, normalized text). An in-memory LRU index (file
+    sizes, rebuilt from modification times on start) enforces `max_bytes`;
+    hits refresh a file's mtime so recency survives restarts.
+    """
+    def __init__(self, root: str = DEFAULT_PATH, max_bytes: int = 64 * 1024 * 1024, level: int = 6):
+        """
+        Args:
+            root: Cache directory
+            max_bytes: Disk budget; least recently used phrases are evicted beyond it
+            level: zlib compression level
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.level = level
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    @staticmethod
+    def key(voice_id: str, model: str, text: str) -> str:
+        return hashlib.sha256(f"{voice_id}\0{model}\0{normalize(text)}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + EXT)
+
+    def _load(self):
+        if not os.path.isdir(self.root):
+            return
+        found = []
+        for sub in os.listdir(self.root):
+            folder = os.path.join(self.root, sub)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(EXT):
+                    st = os.stat(os.path.join(folder, name))
+                    found.append((st.st_mtime, name[:-len(EXT)], st.st_size))
+        for _, key, size in sorted(found):
+            self._index[key] = size
+            self.bytes += size
+        logger.info(f"TTS phrase cache: {len(self._index)} phrases, {self.bytes / 1e6:.1f} MB")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Decompressed PCM, or None"""
+        if key not in self._index:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pcm = zlib.decompress(f.read())
+            os.utime(path)
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable cached phrase {key[:12]}: {e}")
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._index.move_to_end(key)
+        self.hits += 1
+        return pcm
+
+    def put(self, key: str, pcm: bytes):
+        data = zlib.compress(pcm, self.level)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        if key in self._index:
+            self.bytes -= self._index.pop(key)
+        self._index[key] = len(data)
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes and len(self._index) > 1:
+            self._drop(next(iter(self._index)))
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        self.bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "phrases": len(self._index),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class CachingSynthesizer:
+    """
+    Serves phrases from a PhraseCache and synthesizes the rest with `inner`.
+
+    A phrase is written to disk the second time it is synthesized (one-off
+    sentences never touch the SD card); warm() stores phrases right away.
+    Phrases longer than `max_chars` are never cached. Keys always come from
+    `inner`'s voice and model; when `fallback` is set (inner unreachable),
+    cached phrases still play and the rest is synthesized by the fallback.
+    Output of synthesizers with cacheable = False (the simulated one) is
+    never written to the cache.
+    """
+    def __init__(self, inner, cache: PhraseCache, max_chars: int = 200, piece_bytes: int = 3200):
+        self.inner = inner
+        self.cache = cache
+        self.max_chars = max_chars
+        self.piece_bytes = piece_bytes
+        self.fallback = None
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+    @property
+    def sample_rate(self):
+        return self.inner.sample_rate
+
+    def _key(self, text: str) -> str:
+        return PhraseCache.key(getattr(self.inner, "voice_id", ""), getattr(self.inner, "model_id", ""), text)
+
+    def _admit(self, key: str) -> bool:
+        if key in self._seen:
+            return True
+        self._seen[key] = None
+        if len(self._seen) > 1024:
+            self._seen.popitem(last=False)
+        return False
+
+    async def open(self):
+        await self.inner.open()
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        synthesizer = self.fallback or self.inner
+        key = self._key(text) if len(text) <= self.max_chars else None
+        if key is not None:
+            pcm = self.cache.get(key)
+            if pcm is not None:
+                for start in range(0, len(pcm), self.piece_bytes):
+                    yield pcm[start:start + self.piece_bytes]
+                return
+
+        parts = []
+        async for data in synthesizer.stream(text):
+            parts.append(data)
+            yield data
+        if key is not None and parts and getattr(synthesizer, "cacheable", True) and self._admit(key):
+            self.cache.put(key, b"".join(parts))
+
+    async def warm(self, phrases: list[str]) -> int:
+        """Synthesize and store every phrase not cached yet; returns how many were added"""
+        added = 0
+        for text in phrases:
+            key = self._key(text)
+            if key in self.cache:
+                continue
+            start = time.perf_counter()
+            pcm = b"".join([data async for data in self.inner.stream(text)])
+            self.cache.put(key, pcm)
+            added += 1
+            logger.info(f"Cached '{text[:50]}' ({len(pcm) / 32000:.1f} s audio, "
+                        f"{(time.perf_counter() - start) * 1000:.0f} ms)")
+        return added
+
+    async def close(self):
+        await self.inner.close()
+
+
+def fixed_phrases() -> list[str]:
+    """Utterances Stella speaks word for word"""
+    from ai.fallback import RESPONSES, DEFAULT_REPLY
+    from ai.intent_router import TEMPLATES
+    from ai.langchain_agent import APOLOGY
+    phrases = [reply for _, reply in RESPONSES if reply]
+    phrases += [DEFAULT_REPLY, APOLOGY]
+    phrases += [t for t in TEMPLATES.values() if "{" not in t]
+    return phrases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render Stella's fixed phrases into the TTS cache")
+    parser.add_argument("--phrases", help="Text file with one extra phrase per line")
+    parser.add_argument("--no-defaults", action="store_true", help="Only render --phrases")
+    parser.add_argument("--cache-dir", default=os.getenv("STELLA_TTS_CACHE", DEFAULT_PATH))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from dotenv import load_dotenv
+    load_dotenv()
+    from voice.elevenlabs import VoiceSystem
+
+    phrases = [] if args.no_defaults else fixed_phrases()
+    if args.phrases:
+        with open(args.phrases, "r", encoding="utf-8") as f:
+            phrases += [line.strip() for line in f if line.strip()]
+
+    async def warm():
+        voice = VoiceSystem(api_key=os.getenv("ELEVENLABS_API_KEY"), cache_dir=args.cache_dir)
+        if voice.cache is None:
+            raise SystemExit("ELEVENLABS_API_KEY is required to render phrases")
+        try:
+            added = await voice.warm_cache(phrases)
+        finally:
+            await voice.close()
+        print(f"✅ {added} new phrases cached ({len(phrases) - added} already present), "
+              f"{voice.cache.bytes / 1e6:.1f} MB in {args.cache_dir}")
+
+    asyncio.run(warm())
+
+
+if __name__ == "__main__":
+    main()
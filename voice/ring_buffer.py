@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Single-producer / single-consumer ring buffer of audio samples.
+
+    Lock-free: the producer only advances `_write` and the consumer only
+    advances `_read` (monotonic sample counters; assigning an int is atomic
+    under the GIL), so an audio callback thread never waits on the asyncio
+    side. clear() may be called from any thread: it moves a discard mark to
+    the current write position and the consumer skips to it on its next read.
+    """
+    def __init__(self, capacity: int, dtype=np.int16):
+        self.capacity = capacity
+        self._buf = np.zeros(capacity, dtype=dtype)
+        self._write = 0
+        self._read = 0
+        self._discard = 0
+
+    def available(self) -> int:
+        """Samples ready to read"""
+        return max(self._write - max(self._read, self._discard), 0)
+
+    def free(self) -> int:
+        """Samples that can be written without overwriting unread data"""
+        return self.capacity - (self._write - self._read)
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append as many samples as fit; returns the number written (producer only)"""
+        n = min(len(samples), self.free())
+        if n <= 0:
+            return 0
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        self._buf[:n - first] = samples[first:n]
+        self._write += n
+        return n
+
+    def read(self, out: np.ndarray) -> int:
+        """Fill the start of `out` with up to len(out) samples; returns the number read (consumer only)"""
+        if self._discard > self._read:
+            self._read = self._discard
+        n = min(len(out), self._write - self._read)
+        if n <= 0:
+            return 0
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._buf[start:start + first]
+        out[first:n] = self._buf[:n - first]
+        self._read += n
+        return n
+
+    def clear(self):
+        """Drop everything written so far"""
+        self._discard = self._write
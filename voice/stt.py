@@ -1,25 +1,159 @@
 import asyncio
 import logging
+import os
 import speech_recognition as sr
 from functools import partial
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    from voice.vad import EnergyVAD
+    from voice.local_stt import LocalRecognizer
+except ImportError:
+    from vad import EnergyVAD
+    from local_stt import LocalRecognizer
 
 logger = logging.getLogger(__name__)
 
 class STTSystem:
-    def __init__(self, model: str = "google"):
-        self.model = model
+    def __init__(self, model: Optional[str] = None, capture=None, preroll: float = 0.3,
+                 timeout: float = 5.0, phrase_time_limit: float = 10.0):
+        """
+        Args:
+            model: Recognizer backend: "google" (cloud, after the utterance) or
+                   "vosk" (local streaming with partial transcripts, Google as
+                   fallback); defaults to STELLA_STT or "google"
+            capture: Shared MicCapture; utterances are cut from its buffer
+                     (falls back to opening sr.Microphone per turn without it)
+            preroll: Audio kept before the detected speech onset (seconds)
+            timeout: Give up when no speech starts within this many seconds
+            phrase_time_limit: Longest utterance (seconds)
+        """
+        self.model = model or os.getenv("STELLA_STT", "google")
+        self.local = LocalRecognizer() if self.model == "vosk" else None
+        self.on_partial: Optional[Callable[[str], None]] = None  # Called with each partial transcript
+        self.capture = capture
+        self.preroll = preroll
+        self.timeout = timeout
+        self.phrase_time_limit = phrase_time_limit
+        self._reader = None
+        if capture is not None:
+            # ~600 ms of quiet ends the utterance; the floor is tracked by the capture thread
+            self.vad = EnergyVAD(margin_db=12.0, onset_frames=3, hangover_frames=30,
+                                 floor=lambda: capture.noise_floor)
         self.recognizer = sr.Recognizer()
         self.microphone = None
         try:
              self.microphone = sr.Microphone()
         except Exception as e:
             logger.error(f"Could not initialize microphone: {e}")
-        logger.info(f"STT System initialized using {model} (via SpeechRecognition)")
-        
+        logger.info(f"STT System initialized using {self.model} (via SpeechRecognition)")
+
+    async def initialize(self):
+        """Load the local recognizer model in its worker process (if configured)"""
+        if self.local is not None and not await self.local.start():
+            logger.warning("Local recognizer unavailable, using Google")
+
+    @property
+    def streaming(self) -> bool:
+        return self.local is not None and self.local.ready
+
+    def skip_playback(self, onset: Optional[int] = None):
+        """
+        Drop what the mic heard while Stella was speaking (her own voice).
+
+        Args:
+            onset: Capture position where the patient barged in; their speech
+                   from there on (with pre-roll) is transcribed next turn
+        """
+        if self.capture is None:
+            return
+        if self._reader is None:
+            self._reader = self.capture.reader()
+        if onset is None:
+            self._reader.skip_to_now()
+        else:
+            self._reader.position = max(onset - int(self.preroll * self.capture.sample_rate), self.capture.oldest)
+
+    async def _capture_utterance(self, on_speech: Optional[Callable[[np.ndarray], None]] = None):
+        """
+        Next utterance from the capture buffer as sr.AudioData, or None on timeout.
+
+        `on_speech` receives the utterance audio while it is being spoken
+        (pre-roll and onset at once, then frame by frame).
+        """
+        capture = self.capture
+        if self._reader is None:
+            self._reader = capture.reader(preroll=self.preroll)
+        reader = self._reader
+        self.vad.reset()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        start = None
+        frames = reader.frames()
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if start is None and remaining <= 0:
+                    return None
+                try:
+                    _, frame = await asyncio.wait_for(frames.__anext__(), remaining if start is None else None)
+                except asyncio.TimeoutError:
+                    return None
+                if self.vad.process(frame):
+                    onset = reader.position - self.vad.onset_frames * capture.frame
+                    start = max(onset - int(self.preroll * capture.sample_rate), capture.oldest)
+                    if on_speech:
+                        on_speech(capture.view(start, reader.position))
+                elif start is not None and (not self.vad.speaking or
+                                            reader.position - start >= self.phrase_time_limit * capture.sample_rate):
+                    break
+                elif start is not None and on_speech:
+                    on_speech(frame)
+        finally:
+            await frames.aclose()
+        # One copy: the recognizer needs bytes
+        samples = capture.view(max(start, capture.oldest), reader.position)
+        return sr.AudioData(samples.tobytes(), capture.sample_rate, 2)
+
     async def listen_and_transcribe(self) -> str:
         """
         Listens to the microphone and returns text.
         """
+        if self.capture is not None and self.capture.running:
+            logger.info("Listening for speech...")
+            if self.streaming:
+                self.local.begin(self.on_partial)
+                audio = await self._capture_utterance(on_speech=self.local.feed)
+            else:
+                audio = await self._capture_utterance()
+            if audio is None:
+                if self.streaming:
+                    await self._finish_local()
+                logger.info("No speech detected (timeout).")
+                return ""
+            if self.streaming:
+                text = await self._finish_local()
+                if text is not None:
+                    logger.info(f"Transcribed: {text}")
+                    return text
+            logger.info("Processing audio...")
+            try:
+                text = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    partial(self.recognizer.recognize_google, audio)
+                )
+            except sr.UnknownValueError:
+                logger.info("Could not understand audio.")
+                return ""
+            except Exception as e:
+                logger.error(f"STT Error: {e}")
+                return ""
+            logger.info(f"Transcribed: {text}")
+            return text
+
         if not self.microphone:
             logger.warning("No microphone available. Returning mock text.")
             await asyncio.sleep(2)
@@ -39,14 +173,18 @@ class STTSystem:
                 )
             
             logger.info("Processing audio...")
-            # Transcribe
-            # For real Whisper, use recognize_whisper(audio) - requires openai-whisper installed
-            # For now, using Google (fast, free) to verify pipeline
-            text = await loop.run_in_executor(
-                None, 
-                partial(self.recognizer.recognize_google, audio)
-            )
-            # text = await loop.run_in_executor(None, partial(self.recognizer.recognize_whisper, audio))
+            text = None
+            if self.streaming:
+                # Whole utterance at once: no partials, but no network round trip
+                self.local.begin()
+                self.local.feed(np.frombuffer(audio.get_raw_data(convert_rate=self.local.sample_rate,
+                                                                 convert_width=2), dtype=np.int16))
+                text = await self._finish_local()
+            if text is None:
+                text = await loop.run_in_executor(
+                    None,
+                    partial(self.recognizer.recognize_google, audio)
+                )
             
             logger.info(f"Transcribed: {text}")
             return text
@@ -60,3 +198,15 @@ class STTSystem:
         except Exception as e:
             logger.error(f"STT Error: {e}")
             return ""
+
+    async def _finish_local(self) -> Optional[str]:
+        """Final local transcript, or None when the recognizer failed"""
+        try:
+            return await self.local.finish()
+        except asyncio.TimeoutError:
+            logger.warning("Local recognizer timed out, using Google")
+            return None
+
+    def close(self):
+        if self.local is not None:
+            self.local.stop()
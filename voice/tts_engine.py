@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterable, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+ELEVENLABS_STREAM_URL = "https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
+
+
+class ElevenLabsSynthesizer:
+    """
+    ElevenLabs streaming synthesis over one persistent HTTP/2 session.
+
+    Audio is requested as raw 16 kHz PCM (no decoding on the robot) and
+    yielded as it arrives. The client is kept open between requests, so
+    only the first request pays for DNS, TCP and TLS.
+    """
+    sample_rate = 16000
+
+    def __init__(self, api_key: str, voice_id: str, model_id: str = "eleven_flash_v2_5", read_bytes: int = 3200):
+        """
+        Args:
+            api_key: ElevenLabs API key
+            voice_id: Voice to synthesize with
+            model_id: ElevenLabs model (flash models have the lowest latency)
+            read_bytes: Network read size (3200 bytes = 100 ms of audio)
+        """
+        self.api_key = api_key
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.read_bytes = read_bytes
+        self._client = None
+
+    async def open(self):
+        if self._client is not None:
+            return
+        import httpx
+        try:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers={"xi-api-key": self.api_key},
+                timeout=httpx.Timeout(10.0, read=20.0),
+            )
+        except ImportError:
+            # HTTP/2 needs the h2 package; keep-alive over HTTP/1.1 still reuses the connection
+            self._client = httpx.AsyncClient(
+                headers={"xi-api-key": self.api_key},
+                timeout=httpx.Timeout(10.0, read=20.0),
+            )
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        await self.open()
+        async with self._client.stream(
+            "POST",
+            ELEVENLABS_STREAM_URL.format(voice_id=self.voice_id),
+            params={"output_format": f"pcm_{self.sample_rate}"},
+            json={"text": text, "model_id": self.model_id},
+        ) as response:
+            response.raise_for_status()
+            async for data in response.aiter_bytes(self.read_bytes):
+                yield data
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class SimulatedSynthesizer:
+    """Silence at speaking pace (0.05 s per character) after a fixed request latency"""
+    sample_rate = 16000
+    cacheable = False
+
+    def __init__(self, latency: float = 0.15, seconds_per_char: float = 0.05, realtime_factor: float = 4.0):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.realtime_factor = realtime_factor
+
+    async def open(self):
+        pass
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        await asyncio.sleep(self.latency)
+        samples = int(len(text) * self.seconds_per_char * self.sample_rate)
+        piece = self.sample_rate // 10
+        for start in range(0, samples, piece):
+            n = min(piece, samples - start)
+            await asyncio.sleep(n / self.sample_rate / self.realtime_factor)
+            yield bytes(2 * n)
+
+    async def close(self):
+        pass
+
+
+class StreamingTTS:
+    """
+    Text chunks in, continuous speech out.
+
+    Every incoming text chunk starts its synthesis right away, up to
+    `prefetch` chunks ahead of the one playing, and its audio is buffered
+    per chunk as it streams in. The player writes chunks to the
+    AudioOutput in order, starting on the first bytes of a chunk, so
+    synthesis of the next chunks overlaps playback of the current one and
+    the ring buffer bridges the joins.
+
+    After each utterance `last_metrics` holds the latency from the first
+    text chunk to the first audible sample, per-chunk time to first byte and
+    any playback gaps.
+    """
+    def __init__(self, synthesizer, output, prefetch: int = 2):
+        """
+        Args:
+            synthesizer: Object with async open(), stream(text) and close()
+            output: AudioOutput the audio is played on
+            prefetch: Chunks synthesized ahead of the one playing
+        """
+        self.synthesizer = synthesizer
+        self.output = output
+        self.prefetch = prefetch
+        self.last_metrics: Optional[dict] = None
+
+    async def _synthesize(self, text: str, audio: asyncio.Queue, timings: dict, index: int):
+        start = time.perf_counter()
+        try:
+            async for data in self.synthesizer.stream(text):
+                if index not in timings:
+                    timings[index] = time.perf_counter() - start
+                await audio.put(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"TTS synthesis failed for '{text[:40]}': {e}")
+        finally:
+            audio.put_nowait(None)
+
+    async def play(self, text_iterator: AsyncIterable[str]):
+        """Speak every chunk of text_iterator; returns when playback has finished"""
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+        tasks = []
+        ttfb = {}
+        first_text = None
+        chunks = 0
+
+        async def produce():
+            nonlocal first_text, chunks
+            async for text in text_iterator:
+                if not text.strip():
+                    continue
+                if first_text is None:
+                    first_text = time.perf_counter()
+                audio = asyncio.Queue()
+                tasks.append(asyncio.ensure_future(self._synthesize(text, audio, ttfb, chunks)))
+                chunks += 1
+                # Blocks while `prefetch` chunks are already waiting behind the one playing
+                await pending.put(audio)
+            await pending.put(None)
+
+        self.output.begin()
+        producer = asyncio.ensure_future(produce())
+        start = time.perf_counter()
+        try:
+            while True:
+                get = asyncio.ensure_future(pending.get())
+                await asyncio.wait({get, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    # Producer ended without its sentinel: the text stream failed
+                    get.cancel()
+                    producer.result()
+                    break
+                audio = get.result()
+                if audio is None:
+                    break
+                while (data := await audio.get()) is not None:
+                    await self.output.write(data)
+            self.output.finish()
+            await self.output.drain()
+        finally:
+            self.output.finish()
+            producer.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+            if hasattr(text_iterator, "aclose"):
+                await text_iterator.aclose()
+
+            first_audio = self.output.first_audio_at
+            gaps = list(self.output.gaps)
+            self.last_metrics = {
+                "first_audio_ms": (first_audio - first_text) * 1000.0 if first_audio and first_text else None,
+                "chunks": chunks,
+                "ttfb_ms": [ttfb[i] * 1000.0 for i in sorted(ttfb)],
+                "gaps": len(gaps),
+                "gap_ms": sum(gaps) * 1000.0,
+                "max_gap_ms": max(gaps) * 1000.0 if gaps else 0.0,
+                "total_ms": (time.perf_counter() - start) * 1000.0,
+            }
+            if chunks:
+                first_ms = self.last_metrics["first_audio_ms"]
+                first = f"{first_ms:.0f} ms" if first_ms is not None else "n/a"
+                logger.info(f"TTS: first audio {first} after first text, {chunks} chunks, "
+                            f"{len(gaps)} gaps ({self.last_metrics['gap_ms']:.0f} ms)")
@@ -0,0 +1,79 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+
+def frame_db(frame: np.ndarray) -> float:
+    """RMS level of 16-bit samples in dBFS"""
+    rms = np.sqrt(np.mean(np.square(frame, dtype=np.float64))) if len(frame) else 0.0
+    return 20.0 * np.log10(max(rms, 1.0) / 32768.0)
+
+
+class EnergyVAD:
+    """
+    Frame-energy voice activity detector.
+
+    A frame is loud when it is `margin_db` above the tracked noise floor and
+    above `min_db`; speech starts after `onset_frames` consecutive loud
+    frames and ends after `hangover_frames` quiet ones. The noise floor
+    follows quiet frames (slowly upwards, quickly downwards), unless a
+    shared floor (e.g. MicCapture's) is supplied.
+    """
+    def __init__(self, margin_db: float = 12.0, min_db: float = -45.0, onset_frames: int = 5,
+                 hangover_frames: int = 15, floor_db: float = -60.0, floor: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            margin_db: Level above the noise floor that counts as voice
+            min_db: Absolute minimum level for voice
+            onset_frames: Loud frames in a row before speech starts
+            hangover_frames: Quiet frames in a row before speech ends
+            floor_db: Initial noise floor
+            floor: Returns the current noise floor (replaces own tracking)
+        """
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.noise_floor = floor_db
+        self.floor = floor
+        self.speaking = False
+        self._loud = 0
+        self._quiet = 0
+
+    def reset(self):
+        self.speaking = False
+        self._loud = 0
+        self._quiet = 0
+
+    def update_floor(self, level: float):
+        if self.floor is not None:
+            return
+        rate = 0.05 if level > self.noise_floor else 0.3
+        self.noise_floor += rate * (level - self.noise_floor)
+
+    def process(self, frame: np.ndarray, gate_db: Optional[float] = None) -> bool:
+        """
+        Feed one frame; returns True on the frame where speech starts.
+
+        gate_db raises the threshold for this frame only (e.g. the expected
+        echo of Stella's own voice).
+        """
+        level = frame_db(frame)
+        if self.floor is not None:
+            self.noise_floor = self.floor()
+        threshold = max(self.noise_floor + self.margin_db, self.min_db)
+        loud = level > (threshold if gate_db is None else max(threshold, gate_db))
+        if loud:
+            self._loud += 1
+            self._quiet = 0
+        else:
+            self._quiet += 1
+            self._loud = 0
+            self.update_floor(level)
+
+        if not self.speaking and self._loud >= self.onset_frames:
+            self.speaking = True
+            return True
+        if self.speaking and self._quiet >= self.hangover_frames:
+            self.speaking = False
+        return False
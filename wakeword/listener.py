@@ -9,8 +9,14 @@ logger = logging.getLogger(__name__)
 
 
 class WakeWordListener:
-    def __init__(self, wake_word: str = "Stella"):
+    def __init__(self, wake_word: str = "Stella", capture=None):
+        """
+        Args:
+            wake_word: Phrase to listen for
+            capture: Shared MicCapture for the detector to read from
+        """
         self.wake_word = wake_word
+        self.capture = capture
         self.is_listening = False
         logger.info(f"Wake word listener initialized with wake word: '{wake_word}'")
     